@@ -0,0 +1,5 @@
+from .result_cache import (ResultCache, cached, disable_cache, enable_cache,
+                           get_cache, hash_key)
+
+__all__ = ['ResultCache', 'cached', 'disable_cache', 'enable_cache',
+           'get_cache', 'hash_key']
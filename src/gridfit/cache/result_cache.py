@@ -0,0 +1,340 @@
+from collections import OrderedDict
+import copy
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import tempfile
+from typing import Any, Callable, Dict, NamedTuple, Optional, TypeVar, cast
+
+import numpy as np
+
+from ..version import __version__
+
+
+F = TypeVar('F', bound=Callable[..., Any])
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class ResultCache:
+    """
+    Least recently used (LRU) cache for results of expensive computations
+    with optional persistent storage on disk.
+
+    Arguments:
+        maxsize (int, optional):
+            Maximum number of results kept in memory, 128 by default. The
+            least recently used result is evicted once the cache is full.
+
+        directory (str, optional):
+            Directory to store results in, None by default (memory only).
+            Results found on disk are loaded into memory on first access.
+            Results are written atomically, so the directory can be shared
+            between processes. Unreadable files are removed and treated as
+            missing results.
+
+    Note:
+        Only the results in memory are limited by maxsize, the directory is
+        unbounded and has to be emptied with ResultCache.clear.
+    """
+    def __init__(
+        self,
+        maxsize: int = 128,
+        directory: Optional[str] = None
+    ):
+        if not isinstance(maxsize, int) or isinstance(maxsize, bool):
+            raise ValueError('Invalid maxsize, must be an int.')
+
+        if maxsize <= 0:
+            raise ValueError('Invalid maxsize, must be greater than zero.')
+
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+        self._maxsize = maxsize
+        self._directory = directory
+        self._results: 'OrderedDict[str, Any]' = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def maxsize(self) -> int:
+        """Maximum number of results kept in memory (int)."""
+        return self._maxsize
+
+    @property
+    def directory(self) -> Optional[str]:
+        """Directory for persistent storage (str or None)."""
+        return self._directory
+
+    @property
+    def hits(self) -> int:
+        """Number of cache hits (int)."""
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """Number of cache misses (int)."""
+        return self._misses
+
+    def info(self) -> CacheInfo:
+        """
+        Cache statistics.
+
+        Returns:
+            CacheInfo:
+                Named tuple with hits, misses, maxsize and currsize.
+        """
+        return CacheInfo(self._hits, self._misses, self._maxsize,
+                         len(self._results))
+
+    def _path(
+        self,
+        key: str
+    ) -> str:
+        return os.path.join(cast(str, self._directory), key + '.pkl')
+
+    def get(
+        self,
+        key: str
+    ) -> Optional[Any]:
+        """
+        Look up a result.
+
+        Arguments:
+            key (str):
+                The key of the result, also see cache.hash_key.
+
+        Returns:
+            object or None:
+                A copy of the stored result or None if the key is unknown.
+        """
+        if key in self._results:
+            self._results.move_to_end(key)
+            self._hits += 1
+            return copy.deepcopy(self._results[key])
+
+        if self._directory is not None and os.path.exists(self._path(key)):
+            try:
+                with open(self._path(key), 'rb') as f:
+                    result = pickle.load(f)
+            except Exception:
+                # e.g. a truncated file or a result of an incompatible version
+                _remove(self._path(key))
+            else:
+                self._store(key, result)
+                self._hits += 1
+                return copy.deepcopy(result)
+
+        self._misses += 1
+        return None
+
+    def set(
+        self,
+        key: str,
+        result: Any
+    ) -> None:
+        """
+        Store a result.
+
+        Arguments:
+            key (str):
+                The key of the result, also see cache.hash_key.
+
+            result (object):
+                The result to store, must be picklable if a directory is
+                used.
+        """
+        result = copy.deepcopy(result)
+        self._store(key, result)
+
+        if self._directory is not None:
+            # readers in other processes never see a partially written file
+            fd, temp_path = tempfile.mkstemp(dir=self._directory,
+                                             suffix='.tmp')
+
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+                os.replace(temp_path, self._path(key))
+            except BaseException:
+                _remove(temp_path)
+                raise
+
+    def _store(
+        self,
+        key: str,
+        result: Any
+    ) -> None:
+        self._results[key] = result
+        self._results.move_to_end(key)
+
+        while len(self._results) > self._maxsize:
+            self._results.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all results from memory and disk and reset statistics."""
+        self._results.clear()
+        self._hits = 0
+        self._misses = 0
+
+        if self._directory is not None:
+            for name in os.listdir(self._directory):
+                if name.endswith(('.pkl', '.tmp')):
+                    _remove(os.path.join(self._directory, name))
+
+
+def _remove(
+    path: str
+) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _update_hash(
+    h: 'hashlib.blake2b',
+    value: Any
+) -> None:
+    if isinstance(value, np.ndarray):
+        h.update(b'ndarray')
+        h.update(str(value.shape).encode())
+        h.update(value.dtype.str.encode())
+        h.update(np.ascontiguousarray(value).data)
+    elif isinstance(value, dict):
+        for k in sorted(value):
+            h.update(repr(k).encode())
+            _update_hash(h, value[k])
+    else:
+        h.update(repr(value).encode())
+
+
+def hash_key(
+    name: str,
+    arguments: Dict[str, Any]
+) -> str:
+    """
+    Compute the cache key for a function call.
+
+    Note:
+        Arrays are hashed by their shape, dtype and content, all other
+        arguments by their representation. The key also depends on the
+        gridfit version, so results of other versions are not reused.
+
+    Arguments:
+        name (str):
+            The name of the function.
+
+        arguments (dict):
+            The arguments of the call.
+
+    Returns:
+        str:
+            The hexadecimal key.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    h.update(__version__.encode())
+    h.update(name.encode())
+    _update_hash(h, arguments)
+
+    return h.hexdigest()
+
+
+_cache: Optional[ResultCache] = None
+
+
+def enable_cache(
+    maxsize: int = 128,
+    directory: Optional[str] = None
+) -> ResultCache:
+    """
+    Enable caching of angle and grid fits, also see cache.ResultCache.
+
+    Arguments:
+        maxsize (int, optional):
+            Maximum number of results kept in memory, 128 by default.
+
+        directory (str, optional):
+            Directory to store results in, None by default (memory only).
+
+    Returns:
+        ResultCache:
+            The enabled cache.
+    """
+    global _cache
+    _cache = ResultCache(maxsize=maxsize, directory=directory)
+
+    return _cache
+
+
+def disable_cache() -> None:
+    """Disable caching of angle and grid fits."""
+    global _cache
+    _cache = None
+
+
+def get_cache() -> Optional[ResultCache]:
+    """
+    Return the enabled cache.
+
+    Returns:
+        ResultCache or None:
+            The enabled cache or None if caching is disabled.
+    """
+    return _cache
+
+
+def cached(
+    func: F
+) -> F:
+    """
+    Decorator to cache the results of a function in the enabled cache.
+
+    Note:
+        Calls with debug set to True are never cached.
+
+    Arguments:
+        func (callable):
+            The function to cache.
+
+    Returns:
+        callable:
+            The decorated function.
+    """
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(
+        *args: Any,
+        **kwargs: Any
+    ) -> Any:
+        cache = _cache
+
+        if cache is None:
+            return func(*args, **kwargs)
+
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+
+        if bound.arguments.get('debug', False):
+            return func(*args, **kwargs)
+
+        key = hash_key(func.__qualname__, dict(bound.arguments))
+        result = cache.get(key)
+
+        if result is None:
+            result = func(*args, **kwargs)
+            cache.set(key, result)
+
+        return result
+
+    return cast(F, wrapper)
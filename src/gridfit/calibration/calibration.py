@@ -0,0 +1,310 @@
+from typing import Any, Sequence, Tuple, Union, cast
+import warnings
+
+import numpy as np
+import numpy.typing as npt
+
+from ..rect import find_dominant_angle, fit_grid
+from ..roi import CircularROI, ROIArray, SquareROI
+from ..version import __version__
+
+
+ROIType = Union[CircularROI, SquareROI]
+
+
+class Calibration:
+    """
+    Grid calibration that can be stored to and loaded from disk to skip the
+    angle and grid discovery for subsequent data.
+
+    Arguments:
+        angle (float):
+            The angle of the grid in degrees, also see
+            rect.find_dominant_angle.
+
+        x (numpy.ndarray):
+            The x coordinates of the grid without the rotation applied, also
+            see rect.fit_grid.
+
+        y (numpy.ndarray):
+            The y coordinates of the grid without the rotation applied, also
+            see rect.fit_grid.
+
+        grid (numpy.ndarray):
+            The rotated grid with shape (n, m, 2), also see rect.fit_grid.
+
+        shape (tuple):
+            The shape of the calibrated image data.
+
+        rois (tuple or list, optional):
+            List of ROIs, also see roi.CircularROI and roi.SquareROI, empty by
+            default.
+
+        version (str, optional):
+            The gridfit version used to create the calibration, the installed
+            version by default.
+    """
+    def __init__(
+        self,
+        angle: float,
+        x: npt.NDArray[np.float_],
+        y: npt.NDArray[np.float_],
+        grid: npt.NDArray[np.float_],
+        shape: Tuple[int, ...],
+        rois: Sequence[ROIType] = (),
+        version: str = __version__
+    ):
+        if not isinstance(angle, (int, float)):
+            raise ValueError('Invalid angle, must be a number.')
+
+        x, y, grid = np.asarray(x), np.asarray(y), np.asarray(grid)
+
+        if x.ndim != 1 or y.ndim != 1:
+            raise ValueError('Invalid x or y, must be one-dimensional.')
+
+        if grid.shape != (x.shape[0], y.shape[0], 2):
+            raise ValueError('Invalid grid, must have shape (n, m, 2).')
+
+        if len(shape) != 2:
+            raise ValueError('Invalid shape, must have length of two.')
+
+        self._angle = float(angle)
+        self._x = x
+        self._y = y
+        self._grid = grid
+        self._shape = (int(shape[0]), int(shape[1]))
+        self._version = str(version)
+        self.rois = rois
+
+    @classmethod
+    def from_data(
+        cls,
+        data: npt.NDArray[np.float_],
+        angular_range: Tuple[
+            Union[float, int], Union[float, int]] = (-45., 45.),
+        **kwargs: Any
+    ) -> 'Calibration':
+        """
+        Create a calibration by finding the dominant angle and fitting the
+        grid of a two-dimensional array.
+
+        Arguments:
+            data (numpy.ndarray):
+                The image data.
+
+            angular_range (tuple, optional):
+                The angular range to consider for the dominant angle (in
+                degrees), (-45, 45) by default.
+
+            **kwargs:
+                Keyword arguments are passed to gridfit.rect.fit_grid.
+
+        Returns:
+            Calibration:
+                The calibration.
+        """
+        angle = cast(float, find_dominant_angle(data, angular_range))
+        x, y, grid = fit_grid(data, angle=angle, full_output=True, **kwargs)
+
+        return cls(angle, x, y, grid, data.shape)
+
+    @property
+    def angle(self) -> float:
+        """Angle in degrees (float)."""
+        return self._angle
+
+    @property
+    def x(self) -> npt.NDArray[np.float_]:
+        """Unrotated x coordinates of the grid (numpy.ndarray)."""
+        return self._x
+
+    @property
+    def y(self) -> npt.NDArray[np.float_]:
+        """Unrotated y coordinates of the grid (numpy.ndarray)."""
+        return self._y
+
+    @property
+    def grid(self) -> npt.NDArray[np.float_]:
+        """Rotated grid with shape (n, m, 2) (numpy.ndarray)."""
+        return self._grid
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        """Shape of the calibrated image data (tuple)."""
+        return self._shape
+
+    @property
+    def version(self) -> str:
+        """Version of gridfit used to create the calibration (str)."""
+        return self._version
+
+    @property
+    def origin(self) -> Tuple[float, float]:
+        """Unrotated coordinates of the first grid point (tuple)."""
+        return float(self._x[0]), float(self._y[0])
+
+    @property
+    def spacing(self) -> Tuple[float, float]:
+        """Mean lattice spacing along the first and second axis (tuple)."""
+        dx = np.diff(self._x).mean() if len(self._x) > 1 else np.nan
+        dy = np.diff(self._y).mean() if len(self._y) > 1 else np.nan
+
+        return float(dx), float(dy)
+
+    @property
+    def rois(self) -> Tuple[ROIType, ...]:
+        """ROIs (tuple)."""
+        return self._rois
+
+    @rois.setter
+    def rois(
+        self,
+        rois: Sequence[ROIType]
+    ) -> None:
+        if not isinstance(rois, (tuple, list)):
+            raise ValueError('Invalid rois, must be a tuple or list.')
+
+        for roi in rois:
+            if not isinstance(roi, (CircularROI, SquareROI)):
+                raise ValueError('Invalid ROI class {}, must be either '
+                                 'SquareROI or CircularROI.'.format(type(roi)))
+
+        self._rois = tuple(rois)
+
+    def contrast(
+        self,
+        data: npt.NDArray[np.float_]
+    ) -> float:
+        """
+        Contrast between the data at the grid points and the data halfway
+        between neighbouring grid points.
+
+        Arguments:
+            data (numpy.ndarray):
+                The image data.
+
+        Returns:
+            float:
+                The contrast (on - off) / (on + off), which is close to one
+                for data matching the calibration and close to zero for
+                unrelated data.
+        """
+        def sample(
+            points: npt.NDArray[np.float_]
+        ) -> float:
+            points = np.round(points.reshape(-1, 2)).astype(int)
+            inside = np.all((points >= 0) & (points < data.shape), axis=1)
+            points = points[inside]
+
+            return float(np.mean(data[points[:, 0], points[:, 1]]))
+
+        grid = self._grid
+        on = sample(grid)
+        off = sample((grid[:-1, :-1] + grid[1:, 1:]) / 2)
+
+        if on + off == 0:
+            return 0.
+
+        return (on - off) / (on + off)
+
+    def validate(
+        self,
+        data: npt.NDArray[np.float_],
+        min_contrast: float = 0.5
+    ) -> bool:
+        """
+        Check whether two-dimensional data is compatible with the
+        calibration.
+
+        Note:
+            This only samples the data at the grid points and halfway between
+            them, which is much cheaper than fitting the grid.
+
+        Arguments:
+            data (numpy.ndarray):
+                The image data.
+
+            min_contrast (float, optional):
+                The minimum contrast, also see Calibration.contrast, 0.5 by
+                default.
+
+        Returns:
+            bool:
+                True if data has the calibrated shape and sufficient contrast.
+        """
+        if not isinstance(data, np.ndarray):
+            raise ValueError('Data must be a numpy.ndarray.')
+
+        if data.shape != self._shape:
+            return False
+
+        if self._grid.shape[0] < 2 or self._grid.shape[1] < 2:
+            return True
+
+        return self.contrast(data) >= min_contrast
+
+    def save(
+        self,
+        path: str
+    ) -> None:
+        """
+        Save calibration to a compressed binary file (numpy .npz format).
+
+        Arguments:
+            path (str):
+                The file path.
+        """
+        if len(self._rois) > 0:
+            roi_array = ROIArray.from_rois(self._rois)
+            centers, sizes = roi_array.centers, roi_array.sizes
+            kinds, inner_radii = roi_array.kinds, roi_array.inner_radii
+        else:
+            centers = np.zeros((0, 2))
+            sizes, inner_radii = np.zeros(0), np.zeros(0)
+            kinds = np.zeros(0, dtype=np.uint8)
+
+        np.savez_compressed(
+            path, angle=self._angle, x=self._x, y=self._y, grid=self._grid,
+            shape=np.array(self._shape), version=np.array(self._version),
+            roi_centers=centers, roi_sizes=sizes, roi_kinds=kinds,
+            roi_inner_radii=inner_radii)
+
+    @classmethod
+    def load(
+        cls,
+        path: str
+    ) -> 'Calibration':
+        """
+        Load calibration from a file, also see Calibration.save.
+
+        Note:
+            A warning is shown if the calibration was created with a
+            different version of gridfit.
+
+        Arguments:
+            path (str):
+                The file path.
+
+        Returns:
+            Calibration:
+                The calibration.
+        """
+        with np.load(path, allow_pickle=False) as f:
+            version = str(f['version'])
+
+            if version != __version__:
+                warnings.warn('Calibration was created with gridfit {}, '
+                              'installed version is {}.'.format(
+                                  version, __version__))
+
+            rois = []
+
+            if len(f['roi_centers']) > 0:
+                # calibrations of older versions have no annular ROIs
+                inner_radii = f['roi_inner_radii'] \
+                    if 'roi_inner_radii' in f.files else 0
+                rois = list(ROIArray(f['roi_centers'], f['roi_sizes'],
+                                     f['roi_kinds'], inner_radii))
+
+            return cls(float(f['angle']), f['x'], f['y'], f['grid'],
+                       tuple(f['shape'].tolist()), rois=rois, version=version)
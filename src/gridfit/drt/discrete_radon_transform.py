@@ -10,7 +10,8 @@ def discrete_radon_transform(
     steps: int = 100,
     axis: int = 0,
     angular_range: Union[float, Tuple[float, float]] = (-45., 45.),
-    preprocess: bool = True
+    preprocess: bool = True,
+    dtype: npt.DTypeLike = float
 ) -> Tuple[npt.NDArray[np.float_], npt.NDArray[np.float_]]:
     """
     Compute the discrete radon transform for a two-dimensional array.
@@ -32,18 +33,30 @@ def discrete_radon_transform(
             Whether to pad the data to ensure rotation does not crop the image,
             True by default.
 
+        dtype (numpy.dtype, optional):
+            The floating point type used for the rotations, float by default.
+            Projections are always accumulated in double precision.
+
+    Raises:
+        ValueError:
+            If dtype is neither float32 nor float64.
+
     Returns:
         numpy.ndarray, numpy.ndarray:
             The angular steps and the radon transform.
     """
+    if np.dtype(dtype) not in (np.float32, np.float64):
+        raise ValueError('Dtype must be float32 or float64.')
+
     if preprocess is True:
-        data_padded = auto_pad(data).astype(float)
+        data_padded = auto_pad(data).astype(dtype)
     else:
-        data_padded = data
+        data_padded = data.astype(dtype, copy=False)
 
     if isinstance(angular_range, float) or isinstance(angular_range, int):
         data_rot = rotate(data_padded, angular_range)
-        return np.array([angular_range]), np.sum(data_rot, axis=axis)
+        return (np.array([angular_range]),
+                np.sum(data_rot, axis=axis, dtype=np.float64))
 
     angles = np.linspace(*angular_range, steps)
     n = data_padded.shape[0 if axis == 1 else 1]
@@ -52,6 +65,6 @@ def discrete_radon_transform(
     for i, angle in enumerate(angles):
         angle = angles[i]
         data_rot = rotate(data_padded, angle)
-        radon_data[i, :] = np.sum(data_rot, axis=axis)
+        radon_data[i, :] = np.sum(data_rot, axis=axis, dtype=np.float64)
 
     return angles, radon_data
@@ -1,19 +1,25 @@
-from typing import Tuple, Union
+from typing import Callable, Dict, Tuple, Union
 import warnings
 
 import numpy as np
 import numpy.typing as npt
 from scipy import optimize
 
-from ..utils import auto_pad
+from ..cache import cached
+from ..utils import auto_pad, find_bounding_box
 from ..drt import discrete_radon_transform
 
 
+@cached
 def find_dominant_angle(
     data: npt.NDArray[np.float_],
     angular_range: Tuple[Union[float, int], Union[float, int]] = (-45., 45.),
-    debug: bool = False
-) -> float:
+    debug: bool = False,
+    dtype: npt.DTypeLike = float,
+    crop: bool = False,
+    adaptive: bool = False,
+    full_output: bool = False
+) -> Union[float, Tuple[float, int]]:
     """
     Find the dominant angle of a two-dimensional array.
 
@@ -34,9 +40,30 @@ def find_dominant_angle(
             Show debug plots, False by default. Note that this requires
             matplotlib.
 
+        dtype (numpy.dtype, optional):
+            The floating point type used for the rotations, float by default.
+            Use numpy.float32 to halve the memory traffic of the rotations.
+
+        crop (bool, optional):
+            Whether to crop the data to the bounding box of the signal before
+            estimating the angle, False by default. Also see
+            utils.find_bounding_box.
+
+        adaptive (bool, optional):
+            Whether to start with a coarse angular sweep that is only refined
+            around the largest local maxima instead of a uniform sweep with a
+            step of 0.5 degrees, False by default.
+
+        full_output (bool, optional):
+            Whether to return the number of rotations in addition to the
+            dominant angle, False by default.
+
     Returns:
         float:
             The dominant angle.
+
+        float, int (full_output set to True):
+            The dominant angle and the number of rotations used to find it.
     """
     if not isinstance(data, np.ndarray):
         raise ValueError('Data must be a numpy.ndarray.')
@@ -44,7 +71,10 @@ def find_dominant_angle(
     if data.ndim != 2:
         raise ValueError('Data must be two-dimensional.')
 
-    if data.dtype != float:
+    if np.dtype(dtype) not in (np.float32, np.float64):
+        raise ValueError('Dtype must be float32 or float64.')
+
+    if not np.issubdtype(data.dtype, np.floating):
         warnings.warn('Data will be converted to floating point values.')
 
     if not isinstance(angular_range, tuple):
@@ -60,23 +90,42 @@ def find_dominant_angle(
     if angular_range[0] >= angular_range[1]:
         raise ValueError('Angular range must be ascending.')
 
-    data = auto_pad(data).astype(float)
-    steps = int(2 * (max(angular_range) - min(angular_range)))
+    if crop:
+        (y_0, x_0), (y_1, x_1) = find_bounding_box(data)
+        data = data[y_0:y_1, x_0:x_1]
+
+    data = auto_pad(data).astype(dtype)
+    rotations = 0
+
+    def std_at(
+        angle: float
+    ) -> float:
+        nonlocal rotations
+        rotations += 1
+
+        _, rt_data = discrete_radon_transform(
+            data, axis=0, angular_range=angle, preprocess=False, dtype=dtype)
 
-    angles, rt_data = discrete_radon_transform(
-            data, axis=0, steps=steps, angular_range=angular_range,
-            preprocess=False)
+        return float(np.std(rt_data))
 
-    std = np.std(rt_data, axis=-1)
-    idx_max = np.argmax(std)
-    guess = angles[idx_max]
+    if adaptive:
+        guess, std_max = _adaptive_sweep(std_at, angular_range)
+    else:
+        steps = int(2 * (max(angular_range) - min(angular_range)))
+
+        angles, rt_data = discrete_radon_transform(
+                data, axis=0, steps=steps, angular_range=angular_range,
+                preprocess=False, dtype=dtype)
+        rotations += steps
+
+        std = np.std(rt_data, axis=-1)
+        idx_max = np.argmax(std)
+        guess, std_max = angles[idx_max], std[idx_max]
 
     def opt_func(
         angle: float
     ) -> float:
-        _, rt_data = discrete_radon_transform(
-            data, axis=0, angular_range=angle, preprocess=False)
-        inv = float(np.std(rt_data))
+        inv = std_at(angle)
 
         if inv == 0:
             return np.inf
@@ -91,13 +140,14 @@ def find_dominant_angle(
 
         angles, rt_data = discrete_radon_transform(
             data, axis=0, steps=100, angular_range=(guess - 2, guess + 2),
-            preprocess=False)
+            preprocess=False, dtype=dtype)
 
         plt.plot(angles, rt_data.std(-1), c='0.8')
         y_opt = discrete_radon_transform(
-            data, axis=0, angular_range=x_opt, preprocess=False)[1].std()
+            data, axis=0, angular_range=x_opt, preprocess=False,
+            dtype=dtype)[1].std()
         plt.plot(x_opt, y_opt, 'ro')
-        plt.plot(guess, std[idx_max], 'kx')
+        plt.plot(guess, std_max, 'kx')
         plt.margins(x=0)
 
         plt.xlabel(r'Angle $\theta$ (deg)')
@@ -105,4 +155,65 @@ def find_dominant_angle(
 
         plt.tight_layout()
 
+    if full_output:
+        return float(x_opt), rotations
+
     return float(x_opt)
+
+
+def _adaptive_sweep(
+    func: Callable[[float], float],
+    angular_range: Tuple[Union[float, int], Union[float, int]],
+    coarse_step: float = 4.,
+    min_step: float = .5,
+    candidates: int = 3
+) -> Tuple[float, float]:
+    """
+    Find the maximum of a function of the angle on a coarse grid that is
+    successively refined around the largest local maxima only.
+
+    Arguments:
+        func (callable):
+            The function to maximize.
+
+        angular_range (tuple):
+            The angular range (in degrees).
+
+        coarse_step (float, optional):
+            The initial angular step (in degrees), 4 by default.
+
+        min_step (float, optional):
+            The final angular step (in degrees), 0.5 by default.
+
+        candidates (int, optional):
+            The number of local maxima to refine around, 3 by default.
+
+    Returns:
+        float, float:
+            The angle of the maximum and the maximum.
+    """
+    lo, hi = angular_range
+    n = max(int(np.ceil((hi - lo) / coarse_step)) + 1, 3)
+    step = (hi - lo) / (n - 1)
+    values: Dict[float, float] = {
+        float(angle): func(float(angle)) for angle in np.linspace(lo, hi, n)}
+
+    while step > min_step:
+        step /= 2
+
+        angles = np.array(sorted(values))
+        v = np.array([values[angle] for angle in angles])
+        v_padded = np.pad(v, 1, constant_values=-np.inf)
+        idx = np.flatnonzero((v >= v_padded[:-2]) & (v >= v_padded[2:]))
+        idx = idx[np.argsort(v[idx])[::-1][:candidates]]
+
+        for angle in angles[idx]:
+            for new_angle in (angle - step, angle + step):
+                new_angle = round(float(new_angle), 9)
+
+                if lo <= new_angle <= hi and new_angle not in values:
+                    values[new_angle] = func(new_angle)
+
+    angle_max = max(values, key=lambda angle: values[angle])
+
+    return angle_max, values[angle_max]
@@ -5,7 +5,9 @@ import numpy as np
 import numpy.typing as npt
 from scipy import optimize, signal
 
-from ..utils import cartesian_product, find_center, rotate, rotate_point
+from ..cache import cached
+from ..utils import (auto_pad, cartesian_product, find_bounding_box,
+                     find_center, rotate, rotate_point)
 from ..funcs import gaussians_n
 
 
@@ -37,7 +39,7 @@ def fit_peaks(
         numpy.ndarray:
             The coordinates of the fitted peaks.
     """
-    integrated = data.sum(axis=axis)
+    integrated = data.sum(axis=axis, dtype=np.float64)
     point_count = len(integrated)
 
     peaks, params = signal.find_peaks(
@@ -54,11 +56,14 @@ def fit_peaks(
     return x_0 + dx * np.arange(0, len(popt[4:]))
 
 
+@cached
 def fit_grid(
     data: npt.NDArray[np.float_],
     angle: Union[float, int] = 0,
     full_output: bool = False,
     debug: bool = False,
+    dtype: npt.DTypeLike = float,
+    crop: bool = False,
     **kwargs: Any
 ) -> Union[
     npt.NDArray[np.float_],
@@ -86,6 +91,16 @@ def fit_grid(
             Whether to show plot of data and the fitted grid, False by default.
             Note that this requires matplotlib.
 
+        dtype (numpy.dtype, optional):
+            The floating point type used for the rotation, float by default.
+            The integration along each axis is always performed in double
+            precision.
+
+        crop (bool, optional):
+            Whether to fit the grid to the data cropped to the bounding box of
+            the signal, False by default. The results are mapped back to the
+            coordinates of the full data. Also see utils.find_bounding_box.
+
         **kwargs:
             Keyword arguments are passed to gridfit.rect.fit_peaks.
 
@@ -105,17 +120,42 @@ def fit_grid(
     if data.ndim != 2:
         raise ValueError('Data must be two-dimensional.')
 
-    if data.dtype != float:
+    if np.dtype(dtype) not in (np.float32, np.float64):
+        raise ValueError('Dtype must be float32 or float64.')
+
+    if not np.issubdtype(data.dtype, np.floating):
         warnings.warn('Data will be converted to floating point values.')
 
     if not isinstance(angle, (float, int)):
         raise ValueError('Angle must be a float or an int.')
 
-    data_rotated = rotate(data.astype(float), angle)
+    if crop:
+        corners = find_bounding_box(data)
+        (y_0, x_0), (y_1, x_1) = corners
+        data_cropped = data[y_0:y_1, x_0:x_1]
+
+        if angle != 0:
+            data_cropped = auto_pad(data_cropped)
+
+        offset = corners[0] - (
+            np.array(data_cropped.shape) - (corners[1] - corners[0])) // 2
+    else:
+        data_cropped = data
+        offset = np.zeros(2)
+
+    data_rotated = rotate(data_cropped.astype(dtype), angle)
 
     x = fit_peaks(data_rotated, axis=1, **kwargs)
     y = fit_peaks(data_rotated, axis=0, **kwargs)
 
+    if crop:
+        # the rotation around the center of the cropped data differs from the
+        # rotation around the center of the full data by a translation only
+        shift = rotate_point(
+            rotate_point(np.zeros(2), -angle, find_center(data_cropped))
+            + offset, angle, find_center(data))
+        x, y = x + shift[0], y + shift[1]
+
     prod = cartesian_product(np.array(x), np.array(y))
 
     if angle != 0:
@@ -1,6 +1,20 @@
+from .annular_roi import AnnularROI
 from .circular_roi import CircularROI
 from .square_roi import SquareROI
+from .roi_accumulator import ROIAccumulator
+from .roi_array import (ROI_KIND_ANNULAR, ROI_KIND_CIRCULAR, ROI_KIND_SQUARE,
+                        ROIArray)
 from .roi_dataset import ROIDataset
+from .roi_geometry import ROIGeometry
+from .roi_group import ROIGroup
+from .roi_histogram import ROIHistogram
+from .roi_index import ROIIndex
+from .roi_integral_image import ROIIntegralImage
+from .roi_label_map import ROILabelMap
+from .roi_operator import ROIOperator
 
 
-__all__ = ['CircularROI', 'SquareROI', 'ROIDataset']
+__all__ = ['AnnularROI', 'CircularROI', 'SquareROI', 'ROIAccumulator',
+           'ROIArray', 'ROIDataset', 'ROIGeometry', 'ROIGroup', 'ROIHistogram',
+           'ROIIndex', 'ROIIntegralImage', 'ROILabelMap', 'ROIOperator',
+           'ROI_KIND_ANNULAR', 'ROI_KIND_CIRCULAR', 'ROI_KIND_SQUARE']
@@ -0,0 +1,175 @@
+from functools import lru_cache
+from typing import Optional, Tuple, Union
+import numpy as np
+import numpy.typing as npt
+from matplotlib import patches, axes
+
+from .circular_roi import CircularROI, circular_mask, circular_weights
+
+
+class AnnularROI(CircularROI):
+    """
+    Utility class for working with an annular region of interest (ROI), e.g.
+    for the background around a circular ROI.
+
+    Arguments:
+        center (list-like):
+            The center coordinates of the ROI.
+
+        inner_radius (int):
+            The inner radius of the ROI, pixels with a distance to the center
+            of at most inner_radius are excluded.
+
+        outer_radius (int):
+            The outer radius of the ROI.
+    """
+    def __init__(
+        self,
+        center: Tuple[Union[float, int], Union[float, int]],
+        inner_radius: int,
+        outer_radius: int
+    ):
+        if not isinstance(inner_radius, (int, float)):
+            raise ValueError('Invalid inner radius, must be a number.')
+
+        if inner_radius < 0 or inner_radius >= outer_radius:
+            raise ValueError('Invalid inner radius, must be positive and '
+                             'less than the outer radius.')
+
+        super().__init__(center, outer_radius)
+        self._inner_radius = np.round(inner_radius).astype(int)
+
+    @property
+    def inner_radius(self) -> int:
+        """Inner radius (int)."""
+        return int(self._inner_radius)
+
+    @property
+    def mask(self) -> npt.NDArray[np.bool_]:
+        """Annular mask, read-only and shared between ROIs (numpy.ndarray)."""
+        return annular_mask(self.size, self.inner_radius, self.radius)
+
+    @property
+    def weights(self) -> npt.NDArray[np.float_]:
+        """
+        Fractional weights of the pixels covered by the annulus around the
+        (sub-pixel) center of the ROI, read-only and shared between ROIs with
+        the same quantized offset (numpy.ndarray).
+        """
+        return annular_weights(self.size, self.inner_radius, self.radius,
+                               *self.offset)
+
+    def plot(
+        self,
+        ax: Optional[axes.Axes] = None,
+        color: str = 'r',
+        lw: int = 1,
+        show_center: bool = True
+    ) -> patches.Circle:
+        """
+        Plot the boundaries of the ROI as two circles.
+
+        Arguments:
+            ax (matplotlib.axes.Axes, optional):
+                The axes to plot on. If not given, the current axes are used.
+
+            color (str, optional):
+                The color of the circles, 'r' by default.
+
+            lw (int, optional):
+                The line width of the circles, 1 by default.
+
+            show_center (bool, optional):
+                If True, the center of the ROI is plotted as a dot, True by
+                default.
+
+        Returns:
+            matplotlib.patch.Circle:
+                The outer circle patch.
+        """
+        import matplotlib.pyplot as plt
+        from matplotlib import patches
+
+        if ax is None:
+            ax = plt.gca()
+
+        cy, cx = self.center
+        ax.add_patch(patches.Circle(
+            (cx, cy), self.inner_radius, fc='none', lw=lw, color=color))
+
+        return super().plot(ax=ax, color=color, lw=lw,
+                            show_center=show_center)
+
+
+@lru_cache(maxsize=64)
+def annular_mask(
+    size: Union[float, int],
+    inner_radius: int,
+    outer_radius: int
+) -> npt.NDArray[np.bool_]:
+    """
+    Create an annular mask.
+
+    Note:
+        Masks are cached and returned as read-only arrays.
+
+    Arguments:
+        size (float or int):
+            The size of the mask.
+
+        inner_radius (int):
+            The inner radius of the annulus (excluded).
+
+        outer_radius (int):
+            The outer radius of the annulus (included).
+
+    Returns:
+        numpy.ndarray:
+            The mask, True inside of the annulus.
+    """
+    mask = circular_mask(size, outer_radius) & \
+        ~circular_mask(size, inner_radius)
+    mask.flags.writeable = False
+
+    return mask
+
+
+@lru_cache(maxsize=1024)
+def annular_weights(
+    size: Union[float, int],
+    inner_radius: float,
+    outer_radius: float,
+    offset_y: float = 0,
+    offset_x: float = 0
+) -> npt.NDArray[np.float_]:
+    """
+    Create fractional weights of the pixels covered by an annulus, i.e. an
+    anti-aliased annular mask, also see roi.circular_roi.circular_weights.
+
+    Arguments:
+        size (float or int):
+            The size of the weights.
+
+        inner_radius (float):
+            The inner radius of the annulus.
+
+        outer_radius (float):
+            The outer radius of the annulus.
+
+        offset_y (float, optional):
+            Offset of the center of the annulus from the center of the
+            central pixel along the first axis, between -0.5 and 0.5, 0 by
+            default.
+
+        offset_x (float, optional):
+            Offset along the second axis, 0 by default.
+
+    Returns:
+        numpy.ndarray:
+            The weights, the fraction of each pixel inside of the annulus.
+    """
+    weights = circular_weights(size, outer_radius, offset_y, offset_x) - \
+        circular_weights(size, inner_radius, offset_y, offset_x)
+    weights.flags.writeable = False
+
+    return weights
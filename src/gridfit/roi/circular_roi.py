@@ -1,3 +1,4 @@
+from functools import lru_cache
 from typing import Optional, Tuple, Union
 import numpy as np
 import numpy.typing as npt
@@ -6,6 +7,10 @@ from matplotlib import patches, axes
 from .square_roi import SquareROI
 
 
+SUBPIXEL_PHASES = 16
+SUBSAMPLES = 16
+
+
 class CircularROI(SquareROI):
     """
     Utility class for working with a square region of interest (ROI).
@@ -23,7 +28,7 @@ class CircularROI(SquareROI):
         radius: int
     ):
         self._radius = np.round(radius).astype(int)
-        super().__init__(center, 2 * radius + 1)
+        super().__init__(center, 2 * int(self._radius) + 1)
 
     @property
     def radius(self) -> int:
@@ -32,12 +37,25 @@ class CircularROI(SquareROI):
 
     @property
     def mask(self) -> npt.NDArray[np.bool_]:
-        """Circular mask (numpy.ndarray)."""
-        xx = np.arange(self.size) - self.size // 2
-        yx = np.meshgrid(xx, xx)
-        r = np.sqrt(yx[0]**2 + yx[1]**2)
+        """Circular mask, read-only and shared between ROIs (numpy.ndarray)."""
+        return circular_mask(self.size, self.radius)
 
-        return r <= self.radius
+    @property
+    def offset(self) -> npt.NDArray[np.float_]:
+        """
+        Offset of the center from the rounded center, quantized to
+        1 / SUBPIXEL_PHASES pixels (numpy.ndarray).
+        """
+        return quantize_offset(self.center - self.center_rounded)
+
+    @property
+    def weights(self) -> npt.NDArray[np.float_]:
+        """
+        Fractional weights of the pixels covered by a disk with the radius of
+        the ROI around its (sub-pixel) center, read-only and shared between
+        ROIs with the same quantized offset (numpy.ndarray).
+        """
+        return circular_weights(self.size, self.radius, *self.offset)
 
     def apply(
         self,
@@ -64,6 +82,7 @@ class CircularROI(SquareROI):
                 The extracted data with a circular mask applied.
         """
         data_roi = super().apply(data)
+
         return np.ma.masked_array(
             data_roi, mask=~self.mask, fill_value=0, hard_mask=True)
 
@@ -113,3 +132,108 @@ class CircularROI(SquareROI):
             ax.plot(*center, '.', ms=1, color=color)
 
         return circle
+
+
+@lru_cache(maxsize=64)
+def circular_mask(
+    size: Union[float, int],
+    radius: int,
+    invert: bool = False
+) -> npt.NDArray[np.bool_]:
+    """
+    Create a circular mask.
+
+    Note:
+        Masks are cached and returned as read-only arrays.
+
+    Arguments:
+        size (float or int):
+            The size of the mask.
+
+        radius (int):
+            The radius of the circle.
+
+        invert (bool, optional):
+            Whether to invert the mask, False by default.
+
+    Returns:
+        numpy.ndarray:
+            The mask, True inside of the circle (outside if invert is True).
+    """
+    xx = np.arange(size) - size // 2
+    yx = np.meshgrid(xx, xx)
+    r = np.sqrt(yx[0]**2 + yx[1]**2)
+
+    mask = (r > radius) if invert else (r <= radius)
+    mask.flags.writeable = False
+
+    return mask
+
+
+def quantize_offset(
+    offset: npt.ArrayLike,
+    phases: int = SUBPIXEL_PHASES
+) -> npt.NDArray[np.float_]:
+    """
+    Quantize sub-pixel offsets, so fractional weights can be cached.
+
+    Arguments:
+        offset (numpy.ndarray):
+            Offsets of the centers from the rounded centers.
+
+        phases (int, optional):
+            Number of distinct offsets per pixel, SUBPIXEL_PHASES by default.
+
+    Returns:
+        numpy.ndarray:
+            The offsets rounded to multiples of 1 / phases.
+    """
+    return np.round(np.asarray(offset) * phases) / phases
+
+
+@lru_cache(maxsize=1024)
+def circular_weights(
+    size: Union[float, int],
+    radius: float,
+    offset_y: float = 0,
+    offset_x: float = 0
+) -> npt.NDArray[np.float_]:
+    """
+    Create fractional weights of the pixels covered by a disk, i.e. an
+    anti-aliased circular mask.
+
+    Note:
+        The area of each pixel covered by the disk is estimated with
+        SUBSAMPLES x SUBSAMPLES samples per pixel. Weights are cached and
+        returned as read-only arrays.
+
+    Arguments:
+        size (float or int):
+            The size of the weights.
+
+        radius (float):
+            The radius of the disk.
+
+        offset_y (float, optional):
+            Offset of the center of the disk from the center of the central
+            pixel along the first axis, between -0.5 and 0.5, 0 by default.
+
+        offset_x (float, optional):
+            Offset along the second axis, 0 by default.
+
+    Returns:
+        numpy.ndarray:
+            The weights, the fraction of each pixel inside of the disk.
+    """
+    size = int(np.round(size))
+    samples = (np.arange(size * SUBSAMPLES) + 0.5) / SUBSAMPLES - 0.5 \
+        - size // 2
+    yy, xx = np.meshgrid(samples - offset_y, samples - offset_x,
+                         indexing='ij')
+    inside = yy**2 + xx**2 <= radius**2
+
+    weights = inside.reshape(size, SUBSAMPLES, size, SUBSAMPLES).mean(
+        axis=(1, 3))
+    weights.flags.writeable = False
+
+    return weights
@@ -0,0 +1,260 @@
+from typing import Any, Dict, Optional, Sequence, Union
+import numpy as np
+import numpy.typing as npt
+
+from .circular_roi import CircularROI
+from .roi_array import ROIArray
+from .roi_dataset import ROIDataset
+from .square_roi import SquareROI
+
+
+ACCUMULATOR_STATISTICS = ('sum', 'mean', 'var', 'std', 'min', 'max')
+
+
+class _FrameStatistic:
+    """
+    Base class of ROIAccumulator and ROIHistogram, which collect a statistic
+    of each ROI across frames with a dataset of the ROIs that is created
+    from the first frame.
+    """
+    def __init__(
+        self,
+        rois: Union[Sequence[Union[SquareROI, CircularROI]], ROIArray],
+        statistic: str,
+        kwargs: Dict[str, Any]
+    ):
+        if statistic not in ACCUMULATOR_STATISTICS:
+            raise ValueError('Invalid statistic, must be one of {}.'.format(
+                ', '.join(ACCUMULATOR_STATISTICS)))
+
+        self._rois = rois
+        self._statistic = statistic
+        self._kwargs = kwargs
+        self._dataset: Optional[ROIDataset] = None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # the dataset holds a reference to the last frame and is recreated
+        state = self.__dict__.copy()
+        state['_dataset'] = None
+
+        return state
+
+    @property
+    def statistic(self) -> str:
+        """Statistic of each ROI in each frame that is collected (str)."""
+        return self._statistic
+
+    def _evaluate(
+        self,
+        data: npt.NDArray[np.float_]
+    ) -> npt.NDArray[np.float_]:
+        """
+        Statistic of each ROI in a frame or a stack of frames.
+        """
+        if self._dataset is None:
+            self._dataset = ROIDataset(data, self._rois, **self._kwargs)
+
+        return self._dataset.evaluate(data, [self._statistic])[
+            self._statistic]
+
+
+class ROIAccumulator(_FrameStatistic):
+    """
+    Streaming statistics of a statistic of each ROI across frames, e.g. the
+    mean and variance of the sum of each ROI over a long acquisition, in
+    constant memory.
+
+    Note:
+        The mean and variance are updated with Welford's algorithm (merging
+        the statistics of a batch of frames with the algorithm of Chan et
+        al.), vectorized across ROIs. Accumulators of the same ROIs, e.g.
+        from different workers, can be combined with ROIAccumulator.merge.
+
+    Arguments:
+        rois (tuple, list or roi.ROIArray):
+            List of ROIs, also see roi.CircularROI and roi.SquareROI, or an
+            array of ROIs, also see roi.ROIArray.
+
+        statistic (str, optional):
+            Statistic of each ROI in each frame that is accumulated, one of
+            'sum' (default), 'mean', 'var', 'std', 'min' and 'max'.
+
+        **kwargs:
+            Keyword arguments are passed to roi.ROIDataset, e.g. method or
+            dtype.
+
+    Raises:
+        ValueError:
+            If statistic is invalid.
+    """
+    def __init__(
+        self,
+        rois: Union[Sequence[Union[SquareROI, CircularROI]], ROIArray],
+        statistic: str = 'sum',
+        **kwargs: Any
+    ):
+        super().__init__(rois, statistic, kwargs)
+        self.reset()
+
+    @property
+    def count(self) -> int:
+        """Number of accumulated frames (int)."""
+        return self._count
+
+    def reset(self) -> None:
+        """
+        Reset the accumulated statistics.
+        """
+        n = len(self._rois)
+
+        self._count = 0
+        self._mean = np.zeros(n)
+        self._m2 = np.zeros(n)
+        self._min = np.full(n, np.inf)
+        self._max = np.full(n, -np.inf)
+
+    def update(
+        self,
+        data: npt.NDArray[np.float_]
+    ) -> None:
+        """
+        Add a frame or a stack of frames to the accumulated statistics.
+
+        Arguments:
+            data (numpy.ndarray):
+                Image data, either a two-dimensional array or a stack of
+                two-dimensional arrays (frames) with shape (frames, height,
+                width).
+        """
+        values = self._evaluate(data).reshape(-1, len(self._rois))
+
+        if len(values) == 0:
+            return
+
+        mean = values.mean(axis=0, dtype=np.float64)
+        m2 = np.square(values - mean).sum(axis=0)
+
+        self._combine(len(values), mean, m2, values.min(axis=0),
+                      values.max(axis=0))
+
+    def merge(
+        self,
+        other: 'ROIAccumulator'
+    ) -> None:
+        """
+        Merge the statistics accumulated by another accumulator.
+
+        Arguments:
+            other (roi.ROIAccumulator):
+                Accumulator of the same number of ROIs and statistic.
+
+        Raises:
+            ValueError:
+                If the number of ROIs or the statistic differ.
+        """
+        if not isinstance(other, ROIAccumulator):
+            raise ValueError('Invalid accumulator, must be a ROIAccumulator.')
+
+        if len(other._rois) != len(self._rois) or \
+           other._statistic != self._statistic:
+            raise ValueError('Invalid accumulator, must have the same number '
+                             'of ROIs and statistic.')
+
+        if other._count > 0:
+            self._combine(other._count, other._mean, other._m2, other._min,
+                          other._max)
+
+    def _combine(
+        self,
+        count: int,
+        mean: npt.NDArray[np.float_],
+        m2: npt.NDArray[np.float_],
+        minimum: npt.NDArray[np.float_],
+        maximum: npt.NDArray[np.float_]
+    ) -> None:
+        total = self._count + count
+        delta = mean - self._mean
+
+        self._mean = self._mean + delta * (count / total)
+        self._m2 = self._m2 + m2 + delta**2 * (self._count * count / total)
+        self._min = np.minimum(self._min, minimum)
+        self._max = np.maximum(self._max, maximum)
+        self._count = total
+
+    def mean(self) -> npt.NDArray[np.float_]:
+        """
+        Mean of the statistic of each ROI across frames.
+
+        Returns:
+            numpy.ndarray:
+                Array of means of each ROI, NaN if no frames were added.
+        """
+        if self._count == 0:
+            return np.full(len(self._rois), np.nan)
+
+        return self._mean.copy()
+
+    def var(
+        self,
+        ddof: int = 0
+    ) -> npt.NDArray[np.float_]:
+        """
+        Variance of the statistic of each ROI across frames.
+
+        Arguments:
+            ddof (int, optional):
+                Delta degrees of freedom, 0 by default, also see numpy.var.
+
+        Returns:
+            numpy.ndarray:
+                Array of variances of each ROI, NaN if not enough frames
+                were added.
+        """
+        if self._count <= ddof:
+            return np.full(len(self._rois), np.nan)
+
+        return self._m2 / (self._count - ddof)
+
+    def std(
+        self,
+        ddof: int = 0
+    ) -> npt.NDArray[np.float_]:
+        """
+        Standard deviation of the statistic of each ROI across frames.
+
+        Arguments:
+            ddof (int, optional):
+                Delta degrees of freedom, 0 by default, also see numpy.std.
+
+        Returns:
+            numpy.ndarray:
+                Array of standard deviations of each ROI, NaN if not enough
+                frames were added.
+        """
+        return np.sqrt(self.var(ddof))
+
+    def min(self) -> npt.NDArray[np.float_]:
+        """
+        Minimum of the statistic of each ROI across frames.
+
+        Returns:
+            numpy.ndarray:
+                Array of minima of each ROI, NaN if no frames were added.
+        """
+        if self._count == 0:
+            return np.full(len(self._rois), np.nan)
+
+        return self._min.copy()
+
+    def max(self) -> npt.NDArray[np.float_]:
+        """
+        Maximum of the statistic of each ROI across frames.
+
+        Returns:
+            numpy.ndarray:
+                Array of maxima of each ROI, NaN if no frames were added.
+        """
+        if self._count == 0:
+            return np.full(len(self._rois), np.nan)
+
+        return self._max.copy()
@@ -0,0 +1,481 @@
+from typing import (Iterator, List, Optional, Sequence, Tuple, Union,
+                    overload)
+import numpy as np
+import numpy.typing as npt
+
+from .annular_roi import AnnularROI, annular_mask, annular_weights
+from .circular_roi import (SUBPIXEL_PHASES, CircularROI, circular_mask,
+                           circular_weights, quantize_offset)
+from .square_roi import SquareROI
+
+
+ROIType = Union[CircularROI, SquareROI]
+
+ROI_KIND_SQUARE = 0
+ROI_KIND_CIRCULAR = 1
+ROI_KIND_ANNULAR = 2
+ROI_KINDS = (ROI_KIND_SQUARE, ROI_KIND_CIRCULAR, ROI_KIND_ANNULAR)
+
+
+class ROIArray(Sequence[ROIType]):
+    """
+    Compact collection of square, circular and annular ROIs stored as
+    contiguous arrays of centers, sizes and kinds.
+
+    Note:
+        Indexing with an int returns a roi.SquareROI, roi.CircularROI or
+        roi.AnnularROI that is created on demand, indexing with a slice or an
+        index array returns a new ROIArray.
+
+    Arguments:
+        centers (numpy.ndarray):
+            The center coordinates of the ROIs with shape (n, 2).
+
+        sizes (float or numpy.ndarray):
+            The size of each square ROI and the (outer) radius of each
+            circular and annular ROI, either a single value or an array with
+            shape (n,).
+
+        kinds (int or numpy.ndarray, optional):
+            The kind of each ROI, ROI_KIND_SQUARE (default),
+            ROI_KIND_CIRCULAR or ROI_KIND_ANNULAR, either a single value or
+            an array with shape (n,).
+
+        inner_radii (float or numpy.ndarray, optional):
+            The inner radius of each annular ROI, ignored for other ROIs,
+            either a single value or an array with shape (n,), 0 by default.
+
+    Raises:
+        ValueError:
+            - If centers does not have shape (n, 2) with n > 0.
+            - If sizes, kinds or inner_radii cannot be broadcast to shape
+              (n,).
+            - If any size is not greater than zero.
+            - If any kind is invalid.
+            - If any inner radius of an annular ROI is negative or not less
+              than its outer radius.
+    """
+    def __init__(
+        self,
+        centers: npt.ArrayLike,
+        sizes: npt.ArrayLike,
+        kinds: npt.ArrayLike = ROI_KIND_SQUARE,
+        inner_radii: npt.ArrayLike = 0
+    ):
+        centers = np.array(centers, dtype=np.float64)
+
+        if centers.ndim != 2 or centers.shape[1] != 2:
+            raise ValueError('Invalid centers, must have shape (n, 2).')
+
+        if len(centers) == 0:
+            raise ValueError('Invalid centers, must contain at least one '
+                             'center.')
+
+        n = len(centers)
+
+        try:
+            sizes = np.broadcast_to(
+                np.asarray(sizes, dtype=np.float64), (n,)).copy()
+            kinds = np.broadcast_to(
+                np.asarray(kinds, dtype=np.uint8), (n,)).copy()
+            inner_radii = np.broadcast_to(
+                np.asarray(inner_radii, dtype=np.float64), (n,)).copy()
+        except ValueError:
+            raise ValueError('Invalid sizes, kinds or inner radii, must be a '
+                             'single value or have shape (n,).')
+
+        if np.any(sizes <= 0):
+            raise ValueError('Invalid size, must be greater than zero.')
+
+        if np.any(~np.isin(kinds, ROI_KINDS)):
+            raise ValueError('Invalid kind, must be ROI_KIND_SQUARE, '
+                             'ROI_KIND_CIRCULAR or ROI_KIND_ANNULAR.')
+
+        annular = kinds == ROI_KIND_ANNULAR
+        inner_radii[~annular] = 0
+
+        if np.any((inner_radii < 0) | (annular & (inner_radii >= sizes))):
+            raise ValueError('Invalid inner radius, must be positive and less '
+                             'than the outer radius.')
+
+        for array in (centers, sizes, kinds, inner_radii):
+            array.flags.writeable = False
+
+        self._centers = centers
+        self._sizes = sizes
+        self._kinds = kinds
+        self._inner_radii = inner_radii
+
+    @classmethod
+    def from_rois(
+        cls,
+        rois: Sequence[ROIType]
+    ) -> 'ROIArray':
+        """
+        Create ROI array from a list of ROIs.
+
+        Arguments:
+            rois (tuple or list):
+                List of ROIs, also see roi.CircularROI and roi.SquareROI.
+
+        Raises:
+            ValueError:
+                If rois is empty or contains objects that are not ROIs.
+
+        Returns:
+            roi.ROIArray:
+                The ROI array.
+        """
+        if len(rois) == 0:
+            raise ValueError('Invalid rois, must contain at least one ROI.')
+
+        for roi in rois:
+            if not isinstance(roi, (CircularROI, SquareROI)):
+                raise ValueError('Invalid ROI class {}, must be either '
+                                 'SquareROI or CircularROI.'.format(type(roi)))
+
+        centers = [roi.center for roi in rois]
+        sizes = [roi.radius if isinstance(roi, CircularROI) else roi.size
+                 for roi in rois]
+        kinds = [ROI_KIND_ANNULAR if isinstance(roi, AnnularROI)
+                 else ROI_KIND_CIRCULAR if isinstance(roi, CircularROI)
+                 else ROI_KIND_SQUARE for roi in rois]
+        inner_radii = [roi.inner_radius if isinstance(roi, AnnularROI) else 0
+                       for roi in rois]
+
+        return cls(centers, sizes, kinds, inner_radii)
+
+    @classmethod
+    def from_grid(
+        cls,
+        grid: npt.NDArray[np.float_],
+        size: Union[float, int],
+        kind: int = ROI_KIND_SQUARE,
+        inner_radius: Union[float, int] = 0
+    ) -> 'ROIArray':
+        """
+        Create ROI array with a ROI at each point of a grid.
+
+        Arguments:
+            grid (numpy.ndarray):
+                The grid points with shape (..., 2), e.g. the result of
+                rect.fit_grid. The ROIs are in row-major order of the grid.
+
+            size (float or int):
+                The size of the square ROIs or the (outer) radius of the
+                circular and annular ROIs.
+
+            kind (int, optional):
+                The kind of the ROIs, ROI_KIND_SQUARE (default),
+                ROI_KIND_CIRCULAR or ROI_KIND_ANNULAR.
+
+            inner_radius (float or int, optional):
+                The inner radius of annular ROIs, 0 by default.
+
+        Raises:
+            ValueError:
+                If the last axis of grid does not have length two.
+
+        Returns:
+            roi.ROIArray:
+                The ROI array.
+        """
+        grid = np.asarray(grid)
+
+        if grid.ndim < 1 or grid.shape[-1] != 2:
+            raise ValueError('Invalid grid, must have shape (..., 2).')
+
+        return cls(grid.reshape(-1, 2), size, kind, inner_radius)
+
+    def __len__(self) -> int:
+        return len(self._centers)
+
+    @overload
+    def __getitem__(self, index: int) -> ROIType: ...
+
+    @overload
+    def __getitem__(
+        self,
+        index: Union[slice, Sequence[int], npt.NDArray[np.int_]]
+    ) -> 'ROIArray': ...
+
+    def __getitem__(
+        self,
+        index: Union[int, slice, Sequence[int], npt.NDArray[np.int_]]
+    ) -> Union[ROIType, 'ROIArray']:
+        if isinstance(index, (int, np.integer)):
+            center = tuple(self._centers[index].tolist())
+
+            if self._kinds[index] == ROI_KIND_ANNULAR:
+                return AnnularROI(center, self._inner_radii[index].item(),
+                                  self._sizes[index].item())
+
+            if self._kinds[index] == ROI_KIND_CIRCULAR:
+                return CircularROI(center, self._sizes[index].item())
+
+            return SquareROI(center, self._sizes[index].item())
+
+        return ROIArray(self._centers[index], self._sizes[index],
+                        self._kinds[index], self._inner_radii[index])
+
+    def __iter__(self) -> Iterator[ROIType]:
+        for i in range(len(self)):
+            yield self[i]
+
+    @property
+    def centers(self) -> npt.NDArray[np.float_]:
+        """Center coordinates with shape (n, 2), read-only (numpy.ndarray)."""
+        return self._centers
+
+    @property
+    def sizes(self) -> npt.NDArray[np.float_]:
+        """Sizes of square and radii of circular ROIs (numpy.ndarray)."""
+        return self._sizes
+
+    @property
+    def kinds(self) -> npt.NDArray[np.uint8]:
+        """Kinds, e.g. ROI_KIND_SQUARE or ROI_KIND_CIRCULAR (numpy.ndarray)."""
+        return self._kinds
+
+    @property
+    def inner_radii(self) -> npt.NDArray[np.float_]:
+        """Inner radii of annular ROIs, zero otherwise (numpy.ndarray)."""
+        return self._inner_radii
+
+    @property
+    def circular(self) -> npt.NDArray[np.bool_]:
+        """
+        Whether each ROI is circular or annular, i.e. masked (numpy.ndarray).
+        """
+        return self._kinds != ROI_KIND_SQUARE
+
+    @property
+    def radii_rounded(self) -> npt.NDArray[np.int_]:
+        """Rounded radii, zero for square ROIs (numpy.ndarray)."""
+        return np.where(
+            self.circular, np.round(self._sizes), 0).astype(int)
+
+    @property
+    def centers_rounded(self) -> npt.NDArray[np.int_]:
+        """Rounded center coordinates (numpy.ndarray)."""
+        return np.round(self._centers).astype(int)
+
+    @property
+    def sizes_rounded(self) -> npt.NDArray[np.int_]:
+        """Rounded size of the bounding square of each ROI (numpy.ndarray)."""
+        sizes = np.where(self.circular, 2 * self.radii_rounded + 1,
+                         np.round(self._sizes))
+
+        return sizes.astype(int)
+
+    @property
+    def boundaries(self) -> npt.NDArray[np.int_]:
+        """
+        Boundaries, bottom left and top right corner of each ROI with shape
+        (n, 2, 2) (numpy.ndarray).
+        """
+        sizes_rounded = self.sizes_rounded
+        bottom_left = self.centers_rounded - (sizes_rounded // 2)[:, None]
+        top_right = bottom_left + sizes_rounded[:, None]
+
+        return np.stack((bottom_left, top_right), axis=1)
+
+    @property
+    def shapes(self) -> npt.NDArray[np.int_]:
+        """Shape of each ROI with shape (n, 2) (numpy.ndarray)."""
+        return np.repeat(self.sizes_rounded[:, None], 2, axis=1)
+
+    def inside(
+        self,
+        shape: Tuple[int, ...]
+    ) -> npt.NDArray[np.bool_]:
+        """
+        Check which ROIs are inside of the boundaries of two-dimensional data.
+
+        Arguments:
+            shape (tuple):
+                The shape of the data.
+
+        Returns:
+            numpy.ndarray:
+                Whether each ROI is inside of the data boundaries.
+        """
+        boundaries = self.boundaries
+
+        return np.all(boundaries[:, 0] >= 0, axis=1) & \
+            np.all(boundaries[:, 1] <= np.array(shape[-2:]), axis=1)
+
+    def validate(
+        self,
+        shape: Tuple[int, ...]
+    ) -> None:
+        """
+        Check that all ROIs are inside of the boundaries of two-dimensional
+        data.
+
+        Arguments:
+            shape (tuple):
+                The shape of the data.
+
+        Raises:
+            ValueError:
+                If any ROI is outside of the data boundaries.
+        """
+        boundaries = self.boundaries
+
+        if np.any(boundaries[:, 0] < 0):
+            raise ValueError('ROI is outside of data boundaries (negative'
+                             ' bottom left coordinates).')
+
+        if np.any(boundaries[:, 1] > np.array(shape[-2:])):
+            raise ValueError(
+                'ROI is outside of data boundaries [top right coordinate {} '
+                'is too large for data shape {}].'.format(
+                    tuple(boundaries[:, 1].max(axis=0).tolist()),
+                    tuple(shape[-2:])))
+
+    def masks(self) -> Optional[npt.NDArray[np.bool_]]:
+        """
+        Stacked masks of ROIs of the same shape, True for pixels inside of
+        each ROI.
+
+        Returns:
+            numpy.ndarray or None:
+                The masks with shape (n, size, size) or None if there are no
+                circular ROIs.
+
+        Raises:
+            ValueError:
+                If the ROIs differ in shape.
+        """
+        sizes_rounded = self.sizes_rounded
+
+        if np.any(sizes_rounded != sizes_rounded[0]):
+            raise ValueError('Invalid ROIs, must have the same shape.')
+
+        circular = self.circular
+        if not np.any(circular):
+            return None
+
+        size = int(sizes_rounded[0])
+        masks = np.ones((len(self), size, size), dtype=bool)
+        index = np.flatnonzero(circular)
+
+        # masks are shared between ROIs with the same kind, size and radii
+        keys = np.stack((self._kinds, sizes_rounded, self.radii_rounded,
+                         np.round(self._inner_radii)), axis=1)[circular]
+        unique, inverse = np.unique(keys, axis=0, return_inverse=True)
+
+        for i, key in enumerate(unique):
+            masks[index[inverse.reshape(-1) == i]] = _mask(*key)
+
+        return masks
+
+    def weights(
+        self,
+        phases: int = SUBPIXEL_PHASES
+    ) -> Optional[npt.NDArray[np.float_]]:
+        """
+        Stacked fractional weights of ROIs of the same shape, the fraction of
+        each pixel inside of the disk or annulus around the (sub-pixel)
+        center of each circular or annular ROI, also see
+        CircularROI.weights. Square ROIs have unit weights.
+
+        Note:
+            The offsets of the centers from the rounded centers are quantized
+            to 1 / phases pixels and the weights are computed once for each
+            distinct kind, size, radii and quantized offset.
+
+        Arguments:
+            phases (int, optional):
+                Number of distinct offsets per pixel, SUBPIXEL_PHASES by
+                default.
+
+        Returns:
+            numpy.ndarray or None:
+                The weights with shape (n, size, size) or None if there are
+                no circular ROIs.
+
+        Raises:
+            ValueError:
+                - If the ROIs differ in shape.
+                - If phases is not a positive int.
+        """
+        if not isinstance(phases, int) or phases <= 0:
+            raise ValueError('Invalid phases, must be a positive int.')
+
+        sizes_rounded = self.sizes_rounded
+
+        if np.any(sizes_rounded != sizes_rounded[0]):
+            raise ValueError('Invalid ROIs, must have the same shape.')
+
+        circular = self.circular
+        if not np.any(circular):
+            return None
+
+        size = int(sizes_rounded[0])
+        weights = np.ones((len(self), size, size))
+        offsets = quantize_offset(self._centers - self.centers_rounded,
+                                  phases)
+        index = np.flatnonzero(circular)
+
+        # weights are shared between ROIs with the same kind, size, radii
+        # and quantized offset
+        keys = np.column_stack((self._kinds, sizes_rounded,
+                                self.radii_rounded,
+                                np.round(self._inner_radii),
+                                offsets))[circular]
+        unique, inverse = np.unique(keys, axis=0, return_inverse=True)
+
+        for i, key in enumerate(unique):
+            weights[index[inverse.reshape(-1) == i]] = _weights(*key)
+
+        return weights
+
+    def roi_masks(self) -> List[Optional[npt.NDArray[np.bool_]]]:
+        """
+        Mask of each ROI, True for pixels inside of each circular or annular
+        ROI and None for square ROIs.
+
+        Returns:
+            list:
+                The mask of each ROI.
+        """
+        return [
+            _mask(*key) if key[0] != ROI_KIND_SQUARE else None
+            for key in zip(self._kinds.tolist(), self.sizes_rounded.tolist(),
+                           self.radii_rounded.tolist(),
+                           np.round(self._inner_radii).tolist())]
+
+
+def _mask(
+    kind: float,
+    size: float,
+    radius: float,
+    inner_radius: float
+) -> npt.NDArray[np.bool_]:
+    """
+    Shared mask of a circular or annular ROI.
+    """
+    if kind == ROI_KIND_ANNULAR:
+        return annular_mask(int(size), int(inner_radius), int(radius))
+
+    return circular_mask(int(size), int(radius))
+
+
+def _weights(
+    kind: float,
+    size: float,
+    radius: float,
+    inner_radius: float,
+    offset_y: float,
+    offset_x: float
+) -> npt.NDArray[np.float_]:
+    """
+    Shared fractional weights of a circular or annular ROI.
+    """
+    if kind == ROI_KIND_ANNULAR:
+        return annular_weights(int(size), inner_radius, radius, offset_y,
+                               offset_x)
+
+    return circular_weights(int(size), radius, offset_y, offset_x)
@@ -1,16 +1,32 @@
-from typing import Any, Callable, Dict, Optional, Sequence, Tuple, Union
+from concurrent.futures import Executor
+from functools import partial
+import os
+from typing import (Any, Callable, Dict, Iterator, Optional, Sequence, Tuple,
+                    Union, cast)
 import numpy as np
 import numpy.typing as npt
+from numpy.lib.stride_tricks import sliding_window_view
 from matplotlib import axes
 
 from .circular_roi import CircularROI
+from .roi_array import ROIArray
+from .roi_geometry import ROIGeometry
+from .roi_index import ROIIndex
+from .roi_integral_image import ROIIntegralImage
+from .roi_label_map import ROILabelMap
+from .roi_operator import ROIOperator
 from .square_roi import SquareROI
-from ..utils.image_moments import centroid, rms_size
+from ..utils.image_moments import centroid, moments, rms_size
 
 
 ROIType = Union[CircularROI, SquareROI]
 GenericDataType = Union[npt.NDArray[np.float_], np.ma.MaskedArray]
 
+METHODS = ('apply', 'label', 'sparse', 'integral')
+MASKED_REDUCTIONS = ('sum', 'min', 'max', 'mean', 'var', 'std')
+STATISTICS = ('sum', 'mean', 'var', 'std', 'min', 'max', 'centroid',
+              'rms_size')
+
 
 class ROIDataset:
     """
@@ -18,29 +34,100 @@ class ROIDataset:
 
     Arguments:
         data (numpy.ndarray):
-            Image data.
+            Image data, either a two-dimensional array or a stack of
+            two-dimensional arrays (frames) with shape (frames, height,
+            width), e.g. a numpy.memmap. The results for a stack of frames
+            have an additional leading frame axis.
+
+        rois (tuple, list or roi.ROIArray):
+            List of ROIs, also see roi.CircularROI and roi.SquareROI, or an
+            array of ROIs, also see roi.ROIArray.
+
+        dtype (numpy.dtype, optional):
+            Data type the image data is converted to, e.g. numpy.float32 to
+            reduce memory traffic. The data is used as is if None (default).
+            Sums of floating point data are always accumulated in double
+            precision.
+
+        method (str, optional):
+            Method used to compute the statistics of the ROIs, 'apply'
+            (default) to apply the reduction to each ROI, 'label' to compute
+            sum, mean, var, std, min and max of all ROIs in a single pass over
+            the data using a label image (also see roi.ROILabelMap) or
+            'sparse' to compute sum, mean, var, std, centroid and rms_size
+            with a sparse matrix product (also see roi.ROIOperator) or
+            'integral' to compute sum, mean, var and std of square ROIs with
+            integral images (also see roi.ROIIntegralImage). Statistics not
+            supported by a method fall back to 'apply'.
+
+        memory_budget (int, optional):
+            Approximate number of bytes of a stack of frames (and the
+            extracted ROI data) processed at once, 256 MiB by default.
 
-        rois (tuple or list):
-            List of ROIs, also see roi.CircularROI and roi.SquareROI.
+        subpixel (bool, optional):
+            Whether the pixels of circular and annular ROIs are weighted with
+            the fraction of each pixel inside of the disk or annulus around
+            the exact (sub-pixel) center of the ROI instead of a mask around
+            the rounded center, False by default, also see ROIArray.weights.
+            Min and max include all pixels with a non-zero weight. This
+            requires ROIs of the same shape and the 'apply' method.
+
+        clip (bool, optional):
+            Whether ROIs crossing the data boundaries are clipped instead of
+            raising an error, False by default. Pixels outside of the data
+            are excluded from the statistics (and masked in the data
+            returned by to_array), also see ROIDataset.coverage. This
+            requires ROIs of the same shape and the 'apply' method.
     """
     def __init__(
         self,
         data: GenericDataType,
-        rois: Sequence[Union[SquareROI, CircularROI]],
+        rois: Union[Sequence[Union[SquareROI, CircularROI]], ROIArray],
+        dtype: Optional[npt.DTypeLike] = None,
+        method: str = 'apply',
+        memory_budget: int = 2**28,
+        subpixel: bool = False,
+        clip: bool = False
     ):
-        if not isinstance(rois, (tuple, list)):
-            raise ValueError('Invalid rois, must be a tuple or list.')
+        if isinstance(rois, ROIArray):
+            roi_array = rois
+        elif isinstance(rois, (tuple, list)):
+            roi_array = ROIArray.from_rois(rois)
+            rois = tuple(rois)
+        else:
+            raise ValueError('Invalid rois, must be a tuple, list or '
+                             'ROIArray.')
+
+        if method not in METHODS:
+            raise ValueError('Invalid method, must be one of {}.'.format(
+                ', '.join(METHODS)))
+
+        if method == 'integral' and np.any(roi_array.circular):
+            raise ValueError('Invalid method, integral images only support '
+                             'square ROIs.')
 
-        if len(rois) == 0:
-            raise ValueError('Invalid rois, must contain at least one ROI.')
+        if not isinstance(memory_budget, int) or memory_budget <= 0:
+            raise ValueError('Invalid memory budget, must be a positive int.')
 
-        for roi in rois:
-            if not isinstance(roi, (CircularROI, SquareROI)):
-                raise ValueError('Invalid ROI class {}, must be either '
-                                 'SquareROI or CircularROI.'.format(type(roi)))
+        if (subpixel or clip) and method != 'apply':
+            raise ValueError("Invalid method, sub-pixel and clipped ROIs "
+                             "require the 'apply' method.")
 
+        sizes = roi_array.sizes_rounded
+        if (subpixel or clip) and np.any(sizes != sizes[0]):
+            raise ValueError('Invalid ROIs, sub-pixel and clipped ROIs must '
+                             'have the same shape.')
+
+        self._dtype = dtype
+        self._method = method
+        self._memory_budget = memory_budget
+        self._subpixel = subpixel
+        self._clip = clip
+        self._rois = rois
+        self._roi_array = roi_array
+        self._geometry: Optional[ROIGeometry] = None
+        self._index: Optional[ROIIndex] = None
         self.data = data
-        self._rois = tuple(rois)
 
     @property
     def data(self) -> GenericDataType:
@@ -55,49 +142,348 @@ class ROIDataset:
         if not isinstance(data, np.ndarray):
             raise ValueError('Invalid data, must be a numpy array.')
 
-        if data.ndim != 2:
-            raise ValueError('Invalid data shape, must be two-dimensional.')
+        if data.ndim not in (2, 3):
+            raise ValueError('Invalid data shape, must be two- or '
+                             'three-dimensional.')
+
+        # stacks of frames are converted chunk by chunk, also see _chunks
+        if self._dtype is not None and data.ndim == 2:
+            data = data.astype(self._dtype, copy=False)
 
         self._data = data
         self._roi_data_cached = False
 
+    @property
+    def frame_shape(self) -> Tuple[int, ...]:
+        """Shape of a single two-dimensional frame of the data (tuple)."""
+        return self._data.shape[-2:]
+
     @property
     def rois(self) -> Sequence[ROIType]:
-        """ROIs (list)."""
+        """ROIs (tuple or roi.ROIArray)."""
         return self._rois
 
-    def to_array(self) -> GenericDataType:
+    @property
+    def method(self) -> str:
+        """Method used to compute the statistics of the ROIs (str)."""
+        return self._method
+
+    @property
+    def subpixel(self) -> bool:
+        """Whether the ROIs have fractional pixel weights (bool)."""
+        return self._subpixel
+
+    @property
+    def clip(self) -> bool:
+        """Whether ROIs are clipped at the data boundaries (bool)."""
+        return self._clip
+
+    @property
+    def coverage(self) -> npt.NDArray[np.float_]:
+        """
+        Fraction of each ROI inside of the data, one for ROIs that are not
+        clipped, also see ROIGeometry.coverage (numpy.ndarray).
+        """
+        return self.geometry.coverage
+
+    @property
+    def geometry(self) -> ROIGeometry:
+        """
+        Geometry of the ROIs for the current data shape, only recomputed if
+        the shape of the frames changes (ROIGeometry).
+        """
+        if self._geometry is None or \
+           self._geometry.shape != self.frame_shape:
+            self._geometry = ROIGeometry(self._rois, self.frame_shape,
+                                         self._subpixel, self._clip)
+
+        return self._geometry
+
+    @property
+    def index(self) -> ROIIndex:
+        """
+        Spatial index of the ROIs for point and box queries, built on first
+        use (ROIIndex).
+        """
+        if self._index is None:
+            self._index = ROIIndex(self._roi_array)
+
+        return self._index
+
+    @property
+    def label_map(self) -> ROILabelMap:
+        """Label image of the ROIs for the current data (ROILabelMap)."""
+        return self.geometry.label_map
+
+    @property
+    def operator(self) -> ROIOperator:
+        """Sparse operator of the ROIs for the current data (ROIOperator)."""
+        return self.geometry.operator
+
+    @property
+    def integral_image(self) -> ROIIntegralImage:
+        """Integral images of the ROIs for the current data (ROIIntegralImage).
+        """
+        return self.geometry.integral_image
+
+    def _backend(self) -> Optional[
+            Union[ROIIntegralImage, ROILabelMap, ROIOperator]]:
+        """
+        Label map, sparse operator or integral image of the selected method.
+        """
+        if self._method == 'label':
+            return self.label_map
+
+        if self._method == 'sparse':
+            return self.operator
+
+        if self._method == 'integral':
+            return self.integral_image
+
+        return None
+
+    def _supports(
+        self,
+        name: str
+    ) -> bool:
+        """
+        Whether the selected method supports a statistic.
+        """
+        return self._method != 'apply' and hasattr(self._backend(), name)
+
+    def _reduce(
+        self,
+        name: str,
+        func: Callable[[GenericDataType], Any],
+        compress: bool = True
+    ) -> npt.NDArray[Any]:
+        """
+        Compute statistic with the selected method or apply function to each
+        ROI if the method does not support the statistic.
+        """
+        backend = self._backend()
+
+        # weighted reductions are derived from the weighted moments
+        if self._subpixel and name in MASKED_REDUCTIONS and \
+           name not in ('min', 'max'):
+            return self.stats([name])[name]
+
+        if (backend is None or not hasattr(backend, name)) and \
+           name in MASKED_REDUCTIONS and self._gather() is not None:
+            masks = cast(Tuple[Any, Any], self._gather())[1]
+            result = np.concatenate([
+                _masked_reduce(name, self._extract(c), masks,
+                               self._accumulator_dtype)
+                for c in self._chunks()])
+
+            return result[0] if self._data.ndim == 2 else result
+
+        if backend is None or not hasattr(backend, name):
+            return self.apply(func, compress=compress)
+
+        reduce_func = getattr(backend, name)
+
+        if self._data.ndim == 2:
+            return reduce_func(self._data)
+
+        if isinstance(backend, (ROIIntegralImage, ROIOperator)):
+            return np.concatenate([reduce_func(c) for c in self._chunks()])
+
+        return np.concatenate([
+            np.array([reduce_func(frame) for frame in chunk])
+            for chunk in self._chunks()])
+
+    @property
+    def _accumulator_dtype(self) -> Optional[npt.DTypeLike]:
+        dtype = self._data.dtype if self._dtype is None else self._dtype
+
+        if np.issubdtype(dtype, np.floating):
+            return np.float64
+
+        return None
+
+    def _chunks(self) -> Iterator[GenericDataType]:
+        """
+        Yield the data as stacks of frames with shape (frames, height, width)
+        limited by the memory budget.
+        """
+        if self._data.ndim == 2:
+            yield self._data[None]
+            return
+
+        dtype = self._data.dtype if self._dtype is None else self._dtype
+        gather = self._gather()
+        pixels = int(np.prod(self.frame_shape))
+
+        if gather is not None:
+            pixels = max(pixels, gather[0].size)
+
+        n_frames = max(
+            self._memory_budget // (pixels * np.dtype(dtype).itemsize), 1)
+
+        for i in range(0, self._data.shape[0], n_frames):
+            chunk = self._data[i:i + n_frames]
+
+            if self._dtype is not None:
+                chunk = chunk.astype(self._dtype, copy=False)
+
+            yield chunk
+
+    def _extract(
+        self,
+        frames: GenericDataType
+    ) -> GenericDataType:
+        """
+        Extract data in each ROI from a stack of frames as plain array, the
+        masks of the ROIs are applied separately, also see _masks.
+        """
+        gather = self._gather()
+
+        if gather is not None:
+            index, _ = gather
+            # take keeps the frame axis outermost, fancy indexing would
+            # return the data in frame-major memory order
+            return np.take(frames.reshape(frames.shape[0], -1), index, axis=1)
+
+        # ROIs of different shape, an object array of the data in each ROI
+        slices = self.geometry.slices
+        roi_data = np.empty((len(frames), len(slices)), dtype=object)
+
+        for i, frame in enumerate(frames):
+            for j, roi_slice in enumerate(slices):
+                roi_data[i, j] = frame[roi_slice]
+
+        return roi_data
+
+    def _masks(self) -> Optional[npt.NDArray[Any]]:
+        """
+        Masks of the ROIs, True inside of each ROI, either stacked with shape
+        (n, size, size) or as object array of masks (None for square ROIs) if
+        the ROIs differ in shape. Returns None if there are no circular ROIs.
+        """
+        gather = self._gather()
+
+        if gather is not None:
+            return gather[1]
+
+        if not np.any(self._roi_array.circular):
+            return None
+
+        masks = np.empty(len(self._roi_array), dtype=object)
+        masks[:] = self.geometry.masks
+
+        return masks
+
+    def _gather(self) -> Optional[Tuple[
+            npt.NDArray[np.intp], Optional[npt.NDArray[np.bool_]]]]:
+        """
+        Flat pixel indices and masks of all ROIs, also see
+        ROIGeometry.gather.
+        """
+        return self.geometry.gather
+
+    def _weights(self) -> Optional[npt.NDArray[Any]]:
+        """
+        Stacked pixel weights of ROIs of the same shape for the moments,
+        either the fractional weights of sub-pixel ROIs or the masks.
+        """
+        weights = self.geometry.weights
+
+        if weights is not None:
+            return weights
+
+        return cast(Tuple[Any, Any], self._gather())[1]
+
+    def _view(
+        self,
+        frames: GenericDataType
+    ) -> Optional[GenericDataType]:
+        """
+        Read-only strided view with shape (frames, rows, columns, height,
+        width) of the data in each ROI or None if the ROIs do not form a
+        regular lattice.
+        """
+        lattice = self.geometry.lattice
+
+        if lattice is None:
+            return None
+
+        rows, cols, (y_0, x_0), (dy, dx) = lattice
+        windows = sliding_window_view(
+            np.asarray(frames), (1,) + self._roi_array[0].shape)
+
+        return windows[:, y_0::dy, x_0::dx, 0][:, :rows, :cols]
+
+    def to_array(
+        self,
+        copy: bool = True,
+        masked: bool = True
+    ) -> GenericDataType:
         """
         Convert data in each ROI to single array.
 
+        Note:
+            If all ROIs have the same shape, the data is extracted with a
+            single indexing operation using precomputed pixel indices.
+
+        Arguments:
+            copy (bool, optional):
+                Whether to copy the data in each ROI, True by default. If
+                False, a read-only strided view of the data (without masks
+                and dtype conversion) with shape (rows, columns, height,
+                width) is returned. This requires ROIs of the same shape on
+                a regular lattice in row-major order, e.g. created from a grid
+                with integer spacing.
+
+            masked (bool, optional):
+                Whether to return the data of circular ROIs as masked array
+                (masking the pixels outside of the circle), True by default.
+                If False, the plain data of the bounding square of each ROI is
+                returned.
+
+        Raises:
+            ValueError:
+                If copy is False and the ROIs do not form a regular lattice.
+
         Returns:
             numpy.ndarray:
-                Array of data in each ROI.
+                Array of data in each ROI, with an additional leading frame
+                axis for a stack of frames. If the ROIs differ in shape, an
+                object array of the data in each ROI is returned.
         """
-        if not self._roi_data_cached:
-            needs_mask = False
-            rois_data = []
+        if not copy:
+            frames = self._data[None] if self._data.ndim == 2 else self._data
+            view = self._view(frames)
 
-            for roi in self.rois:
-                roi_data = roi.apply(self.data)
-                rois_data.append(roi_data)
+            if view is None:
+                raise ValueError('ROIs must have the same shape and form a '
+                                 'regular lattice to return a view.')
 
-                if not needs_mask and isinstance(roi_data, np.ma.MaskedArray):
-                    needs_mask = True
+            return view[0] if self._data.ndim == 2 else view
 
-            if needs_mask:
-                self._roi_data = np.ma.array(rois_data)
-            else:
-                self._roi_data = np.array(rois_data)
+        if not self._roi_data_cached:
+            self._roi_data = np.concatenate(
+                [self._extract(c) for c in self._chunks()])
+
+            if self._data.ndim == 2:
+                self._roi_data = self._roi_data[0]
 
             self._roi_data_cached = True
 
-        return self._roi_data
+        masks = self._masks()
+
+        if not masked or masks is None:
+            return self._roi_data
+
+        return _mask(self._roi_data, masks)
 
     def apply(
         self,
-        func: Callable[[GenericDataType], Any],
-        compress: bool = True
+        func: Callable[..., Any],
+        compress: bool = True,
+        vectorized: bool = False,
+        executor: Optional[Executor] = None,
+        chunksize: Optional[int] = None
     ) -> npt.NDArray[Any]:
         """
         Apply function to each ROI.
@@ -110,19 +496,65 @@ class ROIDataset:
                 Whether to compress the individual ROI data (remove masked
                 values) before applying function, True by default.
 
+            vectorized (bool, optional):
+                Whether to call the function once on the data of all ROIs
+                with shape (n, height, width) and axis=(-2, -1) instead of
+                calling it for each ROI, e.g. for numpy reductions, False by
+                default. The data of circular ROIs is passed as masked array
+                (compress is ignored). This requires ROIs of the same shape.
+
+            executor (concurrent.futures.Executor, optional):
+                Executor used to apply the function to batches of ROIs in
+                parallel, e.g. a ThreadPoolExecutor for functions that release
+                the GIL or a ProcessPoolExecutor (the function needs to be
+                picklable). The function is applied serially if None
+                (default).
+
+            chunksize (int, optional):
+                Number of ROIs per batch submitted to the executor, by default
+                the ROIs are split into about four batches per CPU.
+
+        Raises:
+            ValueError:
+                - If vectorized is True and the ROIs differ in shape.
+                - If chunksize is not a positive int.
+
         Returns:
             numpy.ndarray:
-                Array of results from applying function to each ROI.
+                Array of results from applying function to each ROI, with an
+                additional leading frame axis for a stack of frames.
         """
-        def apply_func(
-            data: GenericDataType
-        ) -> npt.NDArray[np.float_]:
-            if compress is True and isinstance(data, np.ma.MaskedArray):
-                return func(data.compressed())
+        if chunksize is not None and \
+           (not isinstance(chunksize, int) or chunksize <= 0):
+            raise ValueError('Invalid chunksize, must be a positive int.')
+
+        if vectorized and self._gather() is None:
+            raise ValueError('Invalid ROIs, vectorized functions require ROIs '
+                             'of the same shape.')
+
+        batch_func = partial(
+            _apply_vectorized if vectorized else _apply_each, func,
+            compress=compress)
+        masks = self._masks()
+
+        def apply_frames(
+            roi_data: GenericDataType
+        ) -> npt.NDArray[Any]:
+            f, n = roi_data.shape[:2]
+            roi_data = roi_data.reshape((-1,) + roi_data.shape[2:])
+            frame_masks = None if masks is None else \
+                np.broadcast_to(masks, (f,) + masks.shape).reshape(
+                    (-1,) + masks.shape[1:])
+            results = _map_batches(
+                batch_func, roi_data, frame_masks, executor, chunksize)
 
-            return func(data)
+            return results.reshape((-1, n) + results.shape[1:])
 
-        return np.array([apply_func(d) for d in self.to_array()])
+        if self._data.ndim == 2:
+            return apply_frames(self.to_array(masked=False)[None])[0]
+
+        return np.concatenate([
+            apply_frames(self._extract(chunk)) for chunk in self._chunks()])
 
     def sum(self) -> npt.NDArray[np.float_]:
         """
@@ -132,7 +564,8 @@ class ROIDataset:
             numpy.ndarray:
                 Array of sums of data in each ROI.
         """
-        return self.apply(np.sum)
+        return self._reduce(
+            'sum', partial(np.sum, dtype=self._accumulator_dtype))
 
     def min(self) -> npt.NDArray[np.float_]:
         """
@@ -142,7 +575,7 @@ class ROIDataset:
             numpy.ndarray:
                 Array of minimum values in each ROI.
         """
-        return self.apply(np.min)
+        return self._reduce('min', np.min)
 
     def max(self) -> npt.NDArray[np.float_]:
         """
@@ -152,7 +585,7 @@ class ROIDataset:
             numpy.ndarray:
                 Array of maximum values in each ROI.
         """
-        return self.apply(np.max)
+        return self._reduce('max', np.max)
 
     def mean(self) -> npt.NDArray[np.float_]:
         """
@@ -162,7 +595,8 @@ class ROIDataset:
             numpy.ndarray:
                 Array of mean values in each ROI.
         """
-        return self.apply(np.mean)
+        return self._reduce(
+            'mean', partial(np.mean, dtype=self._accumulator_dtype))
 
     def var(self) -> npt.NDArray[np.float_]:
         """
@@ -172,7 +606,8 @@ class ROIDataset:
             numpy.ndarray:
                 Array of variances in each ROI.
         """
-        return self.apply(np.var)
+        return self._reduce(
+            'var', partial(np.var, dtype=self._accumulator_dtype))
 
     def std(self) -> npt.NDArray[np.float_]:
         """
@@ -182,7 +617,8 @@ class ROIDataset:
             numpy.ndarray:
                 Array of standard deviations in each ROI.
         """
-        return self.apply(np.std)
+        return self._reduce(
+            'std', partial(np.std, dtype=self._accumulator_dtype))
 
     def centroid(
         self,
@@ -200,6 +636,9 @@ class ROIDataset:
             numpy.ndarray:
                 Array of centroids of each ROI.
         """
+        if not self._supports('centroid') and self._gather() is not None:
+            return self.stats(['centroid'], absolute=absolute)['centroid']
+
         def apply_centroid(
             data: GenericDataType
         ) -> Tuple[float, float]:
@@ -208,11 +647,10 @@ class ROIDataset:
 
             return centroid(np.array(data))
 
-        c = self.apply(apply_centroid, compress=False)
+        c = self._reduce('centroid', apply_centroid, compress=False)
 
         if absolute:
-            for i, roi in enumerate(self.rois):
-                c[i] += roi.boundaries[0]
+            c = c + self._roi_array.boundaries[:, 0]
 
         return c
 
@@ -224,6 +662,9 @@ class ROIDataset:
             numpy.ndarray:
                 Array of root-mean-squared sizes of each ROI.
         """
+        if not self._supports('rms_size') and self._gather() is not None:
+            return self.stats(['rms_size'])['rms_size']
+
         def apply_rms_size(
             data: GenericDataType
         ) -> Tuple[float, float]:
@@ -232,7 +673,300 @@ class ROIDataset:
 
             return rms_size(np.array(data))
 
-        return self.apply(apply_rms_size, compress=False)
+        return self._reduce('rms_size', apply_rms_size, compress=False)
+
+    def radial_profile(
+        self,
+        bin_width: float = 1.0
+    ) -> npt.NDArray[np.float_]:
+        """
+        Azimuthally averaged radial profile of each ROI, i.e. the mean of the
+        pixels in bins of the distance to the (sub-pixel) center of the ROI.
+
+        Note:
+            The radius bin of each pixel is computed once per data shape and
+            bin width, also see ROIGeometry.radial_bins, and the profiles of
+            all ROIs are computed with a single bincount per chunk of frames.
+
+        Arguments:
+            bin_width (float, optional):
+                Width of the radius bins in pixels, 1 by default. Bin i
+                contains the pixels with a distance in [i * bin_width,
+                (i + 1) * bin_width) to the center.
+
+        Raises:
+            ValueError:
+                If bin_width is not positive.
+
+        Returns:
+            numpy.ndarray:
+                Array of profiles of each ROI with shape (n, bins), with an
+                additional leading frame axis for a stack of frames. Bins
+                without pixels, e.g. outside of smaller ROIs, are NaN.
+        """
+        if not bin_width > 0:
+            raise ValueError('Invalid bin width, must be positive.')
+
+        index, bins, counts = self.geometry.radial_bins(bin_width)
+        size = counts.size
+        profiles = []
+
+        for chunk in self._chunks():
+            frames = len(chunk)
+            values = chunk.reshape(frames, -1)[:, index]
+            frame_bins = np.arange(frames)[:, None] * size + bins[None]
+            sums = np.bincount(frame_bins.reshape(-1),
+                               weights=values.reshape(-1),
+                               minlength=frames * size)
+            profiles.append(sums.reshape((frames,) + counts.shape))
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            profile = np.concatenate(profiles) / counts
+
+        if self._data.ndim == 2:
+            return profile[0]
+
+        return profile
+
+    def stats(
+        self,
+        names: Sequence[str] = ('sum', 'mean', 'std', 'centroid', 'rms_size'),
+        absolute: bool = False
+    ) -> Dict[str, npt.NDArray[np.float_]]:
+        """
+        Compute several statistics of each ROI at once.
+
+        Note:
+            The raw moments needed for all requested statistics are computed
+            in a single pass over the ROI data (or a single sparse matrix
+            product for the sparse method) and each statistic is derived from
+            them. If the selected method supports all requested statistics,
+            each statistic is computed separately with that method.
+
+        Arguments:
+            names (tuple or list, optional):
+                Names of the statistics, any of 'sum', 'mean', 'var', 'std',
+                'min', 'max', 'centroid' and 'rms_size', ('sum', 'mean',
+                'std', 'centroid', 'rms_size') by default.
+
+            absolute (bool, optional):
+                Whether to return the absolute centroid position (in the
+                original data coordinates), False by default.
+
+        Returns:
+            dict:
+                Arrays of each statistic in each ROI, also see the methods of
+                the same name.
+        """
+        for name in names:
+            if name not in STATISTICS:
+                raise ValueError('Invalid statistic {}, must be one of '
+                                 '{}.'.format(name, ', '.join(STATISTICS)))
+
+        names = tuple(names)
+        needs_extrema = 'min' in names or 'max' in names
+        supported = all(self._supports(name) for name in names)
+
+        if self._method == 'sparse' and supported:
+            raw = self._concatenate([
+                _operator_moments(self.operator, c) for c in self._chunks()])
+        elif not supported and self._gather() is not None:
+            raw = self.moments(extrema=needs_extrema)
+        else:
+            result = {name: getattr(self, name)() for name in names
+                      if name != 'centroid'}
+
+            if 'centroid' in names:
+                result['centroid'] = self.centroid(absolute=absolute)
+
+            return {name: result[name] for name in names}
+
+        result = self.derive_statistics(raw, names)
+
+        if absolute and 'centroid' in names:
+            result['centroid'] += self._roi_array.boundaries[:, 0]
+
+        return result
+
+    def moments(
+        self,
+        weights: Optional[npt.ArrayLike] = None,
+        extrema: bool = False
+    ) -> Dict[str, npt.NDArray[np.float_]]:
+        """
+        Compute the raw moments of each ROI in a single pass over the data,
+        also see ROIDataset.derive_statistics.
+
+        Note:
+            The data in each ROI is read with a strided view if the ROIs
+            form a regular lattice (and extrema is False), otherwise it is
+            extracted with precomputed pixel indices. Several sets of
+            weights can be stacked along leading axes, the moments of all
+            sets are computed from the same ROI data. Weights shared by all
+            ROIs (with a ROI axis of length one) are applied with a single
+            matrix product of the ROI data and the weighted coordinates.
+
+        Arguments:
+            weights (numpy.ndarray, optional):
+                Pixel weights with shape (..., n, size, size) or (..., 1,
+                size, size) for weights shared by all ROIs, used instead of
+                the masks (or sub-pixel weights) of the ROIs and restricted
+                to the pixels of the ROIs. By default the masks (or sub-pixel
+                weights) of the ROIs are used.
+
+            extrema (bool, optional):
+                Whether to compute the minimum and maximum of each ROI as
+                well, False by default.
+
+        Raises:
+            ValueError:
+                - If the ROIs differ in shape.
+                - If weights does not have shape (..., n, size, size).
+
+        Returns:
+            dict:
+                Arrays of the raw moments 'm00', 'm10', 'm01', 'm20', 'm02',
+                the number of pixels (or sum of weights) 'count' and the sum
+                of squares 'sum_sq' of each ROI with shape (..., n), with an
+                additional leading frame axis for a stack of frames, and
+                'min' and 'max' if extrema is True.
+        """
+        gather = self._gather()
+
+        if gather is None:
+            raise ValueError('ROIs must have the same shape to compute the '
+                             'moments.')
+
+        index, masks = gather
+
+        if weights is None:
+            roi_weights = self._weights()
+        else:
+            roi_weights = np.asarray(weights)
+
+            if roi_weights.ndim < 3 or \
+               roi_weights.shape[-2:] != index.shape[1:] or \
+               roi_weights.shape[-3] not in (1, len(index)):
+                raise ValueError('Invalid weights, must have shape (..., '
+                                 '{}, {}, {}).'.format(*index.shape))
+
+            if masks is not None:
+                roi_weights = roi_weights * masks
+
+        sets = () if roi_weights is None else roi_weights.shape[:-3]
+
+        if roi_weights is not None and roi_weights.shape[-3] == 1 and \
+           not extrema:
+            return self._concatenate([
+                _shared_moments(self._extract(c), roi_weights)
+                for c in self._chunks()])
+
+        if roi_weights is not None:
+            roi_weights = np.broadcast_to(
+                roi_weights, sets + index.shape)
+
+        lattice = self.geometry.lattice if not extrema else None
+
+        if lattice is not None and roi_weights is not None:
+            roi_weights = roi_weights.reshape(
+                sets + lattice[:2] + roi_weights.shape[-2:])
+
+        raw_chunks = []
+
+        for chunk in self._chunks():
+            if lattice is not None:
+                roi_data = cast(GenericDataType, self._view(chunk))
+            else:
+                roi_data = self._extract(chunk)
+
+            # ROI axes with shape (n,) or (rows, columns)
+            roi_shape = roi_data.shape[1:-2]
+            roi_data = roi_data.reshape(
+                roi_data.shape[:1] + (1,) * len(sets) + roi_data.shape[1:])
+            raw = _stack_moments(roi_data, roi_weights, extrema)
+
+            raw_chunks.append({
+                key: np.broadcast_to(
+                    value, roi_data.shape[:1] + sets + roi_shape).reshape(
+                        roi_data.shape[:1] + sets + (len(index),))
+                for key, value in raw.items()})
+
+        return self._concatenate(raw_chunks)
+
+    @staticmethod
+    def derive_statistics(
+        raw: Dict[str, npt.NDArray[np.float_]],
+        names: Sequence[str]
+    ) -> Dict[str, npt.NDArray[np.float_]]:
+        """
+        Derive statistics from the raw moments of each ROI, also see
+        ROIDataset.moments.
+
+        Arguments:
+            raw (dict):
+                Arrays of raw moments, also see ROIDataset.moments.
+
+            names (tuple or list):
+                Names of the statistics, also see ROIDataset.stats.
+
+        Returns:
+            dict:
+                Arrays of each statistic in each ROI, centroids are relative
+                to the bottom left corner of each ROI.
+        """
+        return _derive_statistics(raw, names)
+
+    def _concatenate(
+        self,
+        raw_chunks: Sequence[Dict[str, npt.NDArray[np.float_]]]
+    ) -> Dict[str, npt.NDArray[np.float_]]:
+        """
+        Concatenate the raw moments of each chunk of frames, without frame
+        axis for two-dimensional data.
+        """
+        raw = {key: np.concatenate([r[key] for r in raw_chunks])
+               for key in raw_chunks[0]}
+
+        if self._data.ndim == 2:
+            raw = {key: value[0] for key, value in raw.items()}
+
+        return raw
+
+    def evaluate(
+        self,
+        data: GenericDataType,
+        names: Sequence[str] = ('sum', 'mean', 'std', 'centroid', 'rms_size'),
+        absolute: bool = False
+    ) -> Dict[str, npt.NDArray[np.float_]]:
+        """
+        Replace the data and compute several statistics of each ROI at once.
+
+        Note:
+            The geometry of the ROIs (bounds validation, pixel indices, masks
+            and the backend of the selected method) is reused if the data
+            has the same shape as before, so only the reductions are
+            computed. This is meant for processing a sequence of frames, e.g.
+            in an acquisition loop.
+
+        Arguments:
+            data (numpy.ndarray):
+                Image data, also see ROIDataset.
+
+            names (tuple or list, optional):
+                Names of the statistics, also see ROIDataset.stats.
+
+            absolute (bool, optional):
+                Whether to return the absolute centroid position (in the
+                original data coordinates), False by default.
+
+        Returns:
+            dict:
+                Arrays of each statistic in each ROI, also see
+                ROIDataset.stats.
+        """
+        self.data = data
+
+        return self.stats(names, absolute=absolute)
 
     def plot(
         self,
@@ -261,7 +995,276 @@ class ROIDataset:
         if ax is None:
             ax = plt.gca()
 
-        ax.imshow(self._data, **imshow_kwargs)
+        ax.imshow(self._data if self._data.ndim == 2 else self._data[0],
+                  **imshow_kwargs)
 
         for roi in self.rois:
             roi.plot(**kwargs)
+
+
+def _operator_moments(
+    operator: ROIOperator,
+    frames: npt.NDArray[np.float_]
+) -> Dict[str, npt.NDArray[np.float_]]:
+    """
+    Raw moments of each ROI in a stack of frames from a sparse operator.
+    """
+    m = operator.moments(frames)
+    counts = np.broadcast_to(operator.counts, m[:, 0].shape)
+
+    return dict(m00=m[:, 0], m10=m[:, 1], m01=m[:, 2], m20=m[:, 3],
+                m02=m[:, 4], count=counts,
+                sum_sq=operator.sum(np.square(frames, dtype=np.float64)))
+
+
+def _mask(
+    roi_data: npt.NDArray[Any],
+    masks: npt.NDArray[Any]
+) -> GenericDataType:
+    """
+    Convert data of ROIs to masked arrays, masking pixels outside of the
+    masks, also see ROIDataset._masks.
+    """
+    if roi_data.dtype != object:
+        return np.ma.masked_array(
+            roi_data, mask=np.broadcast_to(~masks, roi_data.shape))
+
+    result = np.empty(roi_data.shape, dtype=object)
+
+    for index, mask in np.ndenumerate(
+            np.broadcast_to(masks, roi_data.shape)):
+        result[index] = roi_data[index] if mask is None else \
+            np.ma.masked_array(roi_data[index], mask=~mask, fill_value=0,
+                               hard_mask=True)
+
+    return result
+
+
+def _apply_each(
+    func: Callable[[GenericDataType], Any],
+    roi_data: GenericDataType,
+    masks: Optional[npt.NDArray[Any]] = None,
+    compress: bool = True
+) -> npt.NDArray[Any]:
+    """
+    Apply function to the data of each ROI in a batch, either to the data
+    inside of the mask (compress) or to a masked array.
+    """
+    if masks is None:
+        return np.array([func(d) for d in roi_data])
+
+    if not compress:
+        return np.array([func(d) for d in _mask(roi_data, masks)])
+
+    return np.array([
+        func(d) if m is None else func(d[m]) for d, m in zip(roi_data, masks)])
+
+
+def _apply_vectorized(
+    func: Callable[..., Any],
+    roi_data: GenericDataType,
+    masks: Optional[npt.NDArray[np.bool_]] = None,
+    compress: bool = True
+) -> npt.NDArray[Any]:
+    """
+    Apply vectorized function to the data of a batch of ROIs at once.
+    """
+    if masks is not None:
+        roi_data = _mask(roi_data, masks)
+
+    return np.asarray(func(roi_data, axis=(-2, -1)))
+
+
+def _map_batches(
+    func: Callable[..., npt.NDArray[Any]],
+    roi_data: GenericDataType,
+    masks: Optional[npt.NDArray[Any]] = None,
+    executor: Optional[Executor] = None,
+    chunksize: Optional[int] = None
+) -> npt.NDArray[Any]:
+    """
+    Apply function to batches of ROI data (and masks), in parallel if an
+    executor is given, and concatenate the results.
+    """
+    if executor is None:
+        return func(roi_data, masks)
+
+    n = len(roi_data)
+
+    if chunksize is None:
+        chunksize = max(-(-n // (4 * (os.cpu_count() or 1))), 1)
+
+    futures = [
+        executor.submit(func, roi_data[i:i + chunksize],
+                        None if masks is None else masks[i:i + chunksize])
+        for i in range(0, n, chunksize)]
+
+    return np.concatenate([future.result() for future in futures])
+
+
+def _masked_reduce(
+    name: str,
+    roi_data: npt.NDArray[Any],
+    masks: Optional[npt.NDArray[np.bool_]] = None,
+    dtype: Optional[npt.DTypeLike] = None
+) -> npt.NDArray[Any]:
+    """
+    Reduce the data of each ROI in a stack of ROI data with shape (frames, n,
+    height, width), where pixels outside of the masks are ignored.
+    """
+    if name in ('min', 'max'):
+        if masks is not None:
+            # replace values outside of the masks (e.g. NaN) by the identity
+            # of the reduction, a plain reduction is much faster than a
+            # reduction with where for ROI data in C order
+            roi_data = np.where(masks, roi_data, np.asarray(
+                _extreme(roi_data.dtype, name == 'min'),
+                dtype=roi_data.dtype))
+
+        return getattr(np, name)(roi_data, axis=(-2, -1))
+
+    kwargs: Dict[str, Any] = dict(axis=(-2, -1))
+
+    if masks is not None:
+        kwargs['where'] = masks
+
+    return getattr(np, name)(roi_data, dtype=dtype, **kwargs)
+
+
+def _extreme(
+    dtype: npt.DTypeLike,
+    upper: bool
+) -> Any:
+    """
+    Upper or lower bound of the values of a data type, infinity for floating
+    point data.
+    """
+    dtype = np.dtype(dtype)
+
+    if np.issubdtype(dtype, np.integer):
+        info = np.iinfo(dtype)
+        return info.max if upper else info.min
+
+    if dtype == np.bool_:
+        return upper
+
+    return np.inf if upper else -np.inf
+
+
+def _shared_moments(
+    roi_data: npt.NDArray[Any],
+    weights: npt.NDArray[Any]
+) -> Dict[str, npt.NDArray[np.float_]]:
+    """
+    Raw moments of each ROI in a stack of ROI data with shape (frames, n,
+    height, width) for stacked weights with shape (..., 1, height, width)
+    shared by all ROIs, computed with a single matrix product, also see
+    _stack_moments.
+    """
+    f, n = roi_data.shape[:2]
+    sets = weights.shape[:-3]
+    pixels = int(np.prod(weights.shape[-2:]))
+
+    w = weights.reshape(-1, pixels).astype(np.float64)
+    y, x = np.indices(weights.shape[-2:]).reshape(2, pixels)
+    coordinates = np.concatenate((w, w * y, w * x, w * y**2, w * x**2))
+
+    data = roi_data.reshape(f * n, pixels)
+    products = np.empty((f * n, len(coordinates) + len(w)))
+
+    # blocks of ROIs that fit into the cache are converted to double
+    # precision for the products
+    block = max(2**15 // pixels, 1)
+
+    for i in range(0, f * n, block):
+        data_block = data[i:i + block].astype(np.float64)
+        products[i:i + block, :len(coordinates)] = data_block @ coordinates.T
+        np.square(data_block, out=data_block)
+        products[i:i + block, len(coordinates):] = data_block @ w.T
+
+    m = products[:, :len(coordinates)].reshape(f, n, 5, -1)
+    sum_sq = products[:, len(coordinates):].reshape(f, n, -1)
+
+    def unstack(
+        value: npt.NDArray[np.float_]
+    ) -> npt.NDArray[np.float_]:
+        # (frames, n, sets) to (frames, ..., n)
+        return np.moveaxis(value, 1, -1).reshape((f,) + sets + (n,))
+
+    raw = dict(m00=m[:, :, 0], m10=m[:, :, 1], m01=m[:, :, 2],
+               m20=m[:, :, 3], m02=m[:, :, 4], sum_sq=sum_sq)
+    raw = {key: unstack(value) for key, value in raw.items()}
+    raw['count'] = np.broadcast_to(
+        w.sum(axis=1).reshape(sets + (1,)), (f,) + sets + (n,))
+
+    return raw
+
+
+def _stack_moments(
+    roi_data: GenericDataType,
+    masks: Optional[npt.NDArray[Any]] = None,
+    extrema: bool = False
+) -> Dict[str, npt.NDArray[np.float_]]:
+    """
+    Raw moments of each ROI in a stack of ROI data with shape (frames, ...,
+    height, width), where pixels outside of the masks are ignored. The masks
+    can also be fractional pixel weights, then the count is the sum of the
+    weights and the extrema include all pixels with non-zero weight.
+    """
+    if masks is None:
+        weights = None
+        count = np.full(roi_data.shape[:-2], np.prod(roi_data.shape[-2:]))
+        sum_sq = np.einsum('...ij,...ij->...', roi_data, roi_data,
+                           dtype=np.float64)
+    else:
+        weights = masks.astype(np.float64)
+        count = np.broadcast_to(
+            masks.sum(axis=(-2, -1)),
+            np.broadcast_shapes(roi_data.shape[:-2], masks.shape[:-2]))
+        sum_sq = np.einsum('...ij,...ij,...ij->...', roi_data, roi_data,
+                           weights, dtype=np.float64)
+
+    m = moments(roi_data, weights)
+
+    raw = dict(
+        m00=m[..., 0], m10=m[..., 1], m01=m[..., 2], m20=m[..., 3],
+        m02=m[..., 4], count=count, sum_sq=sum_sq)
+
+    if extrema:
+        if masks is not None and masks.dtype != bool:
+            masks = masks > 0
+
+        raw['min'] = _masked_reduce('min', roi_data, masks)
+        raw['max'] = _masked_reduce('max', roi_data, masks)
+
+    return raw
+
+
+def _derive_statistics(
+    raw: Dict[str, npt.NDArray[np.float_]],
+    names: Sequence[str]
+) -> Dict[str, npt.NDArray[np.float_]]:
+    """
+    Derive statistics from raw moments, also see _stack_moments.
+    """
+    m00, count = raw['m00'], raw['count']
+    mean = m00 / count
+    var = np.maximum(raw['sum_sq'] / count - mean**2, 0)
+
+    result = dict(sum=m00, mean=mean, var=var)
+
+    for name in names:
+        if name == 'std':
+            result['std'] = np.sqrt(var)
+        elif name in ('min', 'max'):
+            result[name] = raw[name]
+        elif name == 'centroid':
+            result['centroid'] = np.stack(
+                (raw['m10'] / m00, raw['m01'] / m00), axis=-1)
+        elif name == 'rms_size':
+            mu20 = raw['m20'] - raw['m10']**2 / m00
+            mu02 = raw['m02'] - raw['m01']**2 / m00
+            result['rms_size'] = np.sqrt(
+                np.stack((mu20, mu02), axis=-1) / m00[..., None])
+
+    return {name: result[name] for name in names}
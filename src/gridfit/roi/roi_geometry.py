@@ -0,0 +1,393 @@
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+import numpy as np
+import numpy.typing as npt
+
+from .circular_roi import CircularROI
+from .roi_array import ROIArray
+from .roi_integral_image import ROIIntegralImage
+from .roi_label_map import ROILabelMap
+from .roi_operator import ROIOperator
+from .square_roi import SquareROI
+
+
+LatticeType = Tuple[int, int, Tuple[int, int], Tuple[int, int]]
+SliceType = Tuple[slice, slice]
+RadialBinsType = Tuple[
+    npt.NDArray[np.intp], npt.NDArray[np.intp], npt.NDArray[np.int_]]
+
+
+class ROIGeometry:
+    """
+    Geometry of a set of ROIs on data with a fixed shape, i.e. everything
+    needed to extract and reduce the data in each ROI that does not depend on
+    the data itself.
+
+    Note:
+        The ROIs are validated against the shape once on initialization.
+        Pixel indices, masks and the label map, sparse operator and integral
+        images are computed on first use and reused for all data with the
+        same shape, also see roi.ROIDataset.
+
+    Arguments:
+        rois (tuple, list or roi.ROIArray):
+            List of ROIs, also see roi.CircularROI and roi.SquareROI, or an
+            array of ROIs, also see roi.ROIArray.
+
+        shape (tuple):
+            The shape of the two-dimensional data.
+
+        subpixel (bool, optional):
+            Whether circular and annular ROIs are weighted with fractional
+            pixel weights around their sub-pixel centers, also see
+            ROIArray.weights, False by default. This requires ROIs of the
+            same shape.
+
+        clip (bool, optional):
+            Whether ROIs crossing the data boundaries are clipped, i.e. the
+            pixels outside of the data are excluded from the masks and
+            weights of the ROIs, instead of raising an error, False by
+            default. This requires ROIs of the same shape, also see
+            ROIGeometry.coverage.
+
+    Raises:
+        ValueError:
+            - If any ROI is outside of the data boundaries (entirely outside
+              if clip is True).
+            - If subpixel or clip is True and the ROIs differ in shape.
+    """
+    def __init__(
+        self,
+        rois: Union[Sequence[Union[SquareROI, CircularROI]], ROIArray],
+        shape: Tuple[int, ...],
+        subpixel: bool = False,
+        clip: bool = False
+    ):
+        roi_array = rois if isinstance(rois, ROIArray) \
+            else ROIArray.from_rois(rois)
+        inside = roi_array.inside(shape)
+
+        if not clip:
+            roi_array.validate(shape)
+        elif not np.all(_overlaps(roi_array.boundaries, shape)):
+            raise ValueError('ROI is outside of data boundaries (no pixel '
+                             'inside of the data).')
+
+        sizes = roi_array.sizes_rounded
+        if subpixel and np.any(sizes != sizes[0]):
+            raise ValueError('Invalid ROIs, sub-pixel ROIs must have the '
+                             'same shape.')
+
+        if clip and np.any(sizes != sizes[0]):
+            raise ValueError('Invalid ROIs, clipped ROIs must have the same '
+                             'shape.')
+
+        self._rois = rois
+        self._roi_array = roi_array
+        self._shape = tuple(shape)
+        self._subpixel = subpixel
+        self._clipped = not np.all(inside)
+        self._weights: Optional[npt.NDArray[np.float_]] = None
+        self._coverage: Optional[npt.NDArray[np.float_]] = None
+        self._gather_computed = False
+        self._gather: Optional[Tuple[
+            npt.NDArray[np.intp], Optional[npt.NDArray[np.bool_]]]] = None
+        self._lattice: Optional[LatticeType] = None
+        self._slices: Optional[List[SliceType]] = None
+        self._masks: Optional[List[Optional[npt.NDArray[np.bool_]]]] = None
+        self._label_map: Optional[ROILabelMap] = None
+        self._operator: Optional[ROIOperator] = None
+        self._integral_image: Optional[ROIIntegralImage] = None
+        self._radial_bins: Dict[float, RadialBinsType] = {}
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        """Shape of the data (tuple)."""
+        return self._shape
+
+    @property
+    def rois(self) -> ROIArray:
+        """ROIs (roi.ROIArray)."""
+        return self._roi_array
+
+    @property
+    def gather(self) -> Optional[Tuple[
+            npt.NDArray[np.intp], Optional[npt.NDArray[np.bool_]]]]:
+        """
+        Flat pixel indices with shape (n, size, size) of all ROIs and their
+        stacked masks (None if there are no circular or clipped ROIs) or None
+        if the ROIs differ in shape (tuple). The indices of pixels outside of
+        the data are clamped to the nearest pixel inside of the data and
+        excluded by the masks.
+        """
+        if not self._gather_computed:
+            self._compute_gather()
+
+        return self._gather
+
+    @property
+    def subpixel(self) -> bool:
+        """Whether the ROIs have fractional pixel weights (bool)."""
+        return self._subpixel
+
+    @property
+    def weights(self) -> Optional[npt.NDArray[np.float_]]:
+        """
+        Fractional pixel weights with shape (n, size, size) of sub-pixel ROIs
+        or None if subpixel is False or there are no circular ROIs, also see
+        ROIArray.weights (numpy.ndarray).
+        """
+        if self._subpixel and self._weights is None:
+            self._weights = self._roi_array.weights()
+
+            if self._weights is not None and self._clipped:
+                self._weights = self._weights * self._in_data()
+
+        return self._weights
+
+    @property
+    def clipped(self) -> bool:
+        """Whether any ROI is clipped at the data boundaries (bool)."""
+        return self._clipped
+
+    @property
+    def coverage(self) -> npt.NDArray[np.float_]:
+        """
+        Fraction of each ROI inside of the data, i.e. the number of pixels
+        (or the sum of the weights of sub-pixel ROIs) inside of the data
+        relative to the whole ROI, one for ROIs that are not clipped
+        (numpy.ndarray).
+        """
+        if self._coverage is None and not self._clipped:
+            self._coverage = np.ones(len(self._roi_array))
+        elif self._coverage is None:
+            weights = self._roi_array.weights() if self._subpixel \
+                else self._roi_array.masks()
+            in_data = self._in_data()
+
+            if weights is None:
+                weights = np.ones(in_data.shape)
+
+            self._coverage = (weights * in_data).sum(axis=(1, 2)) / \
+                weights.sum(axis=(1, 2))
+
+        return self._coverage
+
+    def _compute_gather(self) -> None:
+        """
+        Compute the flat pixel indices and masks of the ROIs, also see gather,
+        and the lattice formed by the ROIs, also see lattice.
+        """
+        self._gather_computed = True
+        sizes = self._roi_array.sizes_rounded
+
+        if np.all(sizes == sizes[0]):
+            bottom_left = self._roi_array.boundaries[:, 0]
+            pixels = np.arange(sizes[0])
+            rows = np.clip(bottom_left[:, 0, None] + pixels, 0,
+                           self._shape[0] - 1)
+            cols = np.clip(bottom_left[:, 1, None] + pixels, 0,
+                           self._shape[1] - 1)
+            index = (rows[:, :, None] * self._shape[1]
+                     + cols[:, None, :]).astype(np.intp)
+
+            # sub-pixel ROIs include each pixel with a non-zero weight
+            masks = self._roi_array.masks() if not self._subpixel \
+                else _nonzero(self.weights)
+
+            if self._clipped:
+                in_data = self._in_data()
+                masks = in_data if masks is None else masks & in_data
+            else:
+                self._lattice = _find_lattice(bottom_left)
+
+            self._gather = (index, masks)
+
+    def _in_data(self) -> npt.NDArray[np.bool_]:
+        """
+        Masks of the pixels of each ROI inside of the data with shape (n,
+        size, size).
+        """
+        bottom_left = self._roi_array.boundaries[:, 0]
+        pixels = np.arange(self._roi_array.sizes_rounded[0])
+        rows = bottom_left[:, 0, None] + pixels
+        cols = bottom_left[:, 1, None] + pixels
+        in_rows = (rows >= 0) & (rows < self._shape[0])
+        in_cols = (cols >= 0) & (cols < self._shape[1])
+
+        return in_rows[:, :, None] & in_cols[:, None, :]
+
+    @property
+    def lattice(self) -> Optional[LatticeType]:
+        """
+        Number of rows and columns, origin and step of the lattice formed by
+        the ROIs or None if the ROIs do not form a regular lattice (tuple).
+        """
+        if not self._gather_computed:
+            self._compute_gather()
+
+        return self._lattice
+
+    @property
+    def slices(self) -> List[SliceType]:
+        """Slices of the data in each ROI (list)."""
+        if self._slices is None:
+            self._slices = [
+                (slice(y_0, y_1), slice(x_0, x_1)) for (y_0, x_0), (y_1, x_1)
+                in self._roi_array.boundaries.tolist()]
+
+        return self._slices
+
+    @property
+    def masks(self) -> List[Optional[npt.NDArray[np.bool_]]]:
+        """
+        Mask of each ROI, True inside of circular, annular and clipped ROIs
+        and None for square ROIs (list).
+        """
+        if self._masks is None and (self._subpixel or self._clipped):
+            gather = self.gather
+            masks = None if gather is None else gather[1]
+            self._masks = [None] * len(self._roi_array) if masks is None \
+                else list(masks)
+        elif self._masks is None:
+            self._masks = self._roi_array.roi_masks()
+
+        return self._masks
+
+    def radial_bins(
+        self,
+        bin_width: float
+    ) -> RadialBinsType:
+        """
+        Radius bin of each pixel inside of each ROI, relative to the
+        (sub-pixel) center of the ROI.
+
+        Arguments:
+            bin_width (float):
+                Width of the radius bins in pixels.
+
+        Returns:
+            tuple:
+                Flat pixel indices of all pixels inside of the ROIs, the
+                flat bin index (ROI index times number of bins plus radius
+                bin) of each of these pixels and the number of pixels in
+                each bin of each ROI with shape (n, bins).
+        """
+        bin_width = float(bin_width)
+
+        if bin_width not in self._radial_bins:
+            gather = self.gather
+
+            if gather is not None:
+                index, masks = gather
+                labels = np.broadcast_to(
+                    np.arange(len(index))[:, None, None], index.shape)
+
+                if masks is not None:
+                    index, labels = index[masks], labels[masks]
+            else:
+                index_list, label_list = [], []
+
+                for i, ((y_slice, x_slice), mask) in enumerate(
+                        zip(self.slices, self.masks)):
+                    yy, xx = np.mgrid[y_slice, x_slice]
+                    roi_index = yy * self._shape[1] + xx
+
+                    if mask is not None:
+                        roi_index = roi_index[mask]
+
+                    index_list.append(roi_index.reshape(-1))
+                    label_list.append(np.full(roi_index.size, i))
+
+                index = np.concatenate(index_list).astype(np.intp)
+                labels = np.concatenate(label_list)
+
+            index, labels = index.reshape(-1), labels.reshape(-1)
+            y, x = np.divmod(index, self._shape[1])
+            centers = self._roi_array.centers[labels]
+            radii = np.hypot(y - centers[:, 0], x - centers[:, 1])
+            radius_bins = (radii / bin_width).astype(np.intp)
+
+            n_bins = int(radius_bins.max()) + 1 if len(radius_bins) > 0 else 0
+            bins = labels * n_bins + radius_bins
+            counts = np.bincount(
+                bins, minlength=len(self._roi_array) * n_bins).reshape(
+                    len(self._roi_array), n_bins)
+
+            self._radial_bins[bin_width] = (index, bins, counts)
+
+        return self._radial_bins[bin_width]
+
+    @property
+    def label_map(self) -> ROILabelMap:
+        """Label image of the ROIs (roi.ROILabelMap)."""
+        if self._label_map is None:
+            self._label_map = ROILabelMap(self._rois, self._shape)
+
+        return self._label_map
+
+    @property
+    def operator(self) -> ROIOperator:
+        """Sparse operator of the ROIs (roi.ROIOperator)."""
+        if self._operator is None:
+            self._operator = ROIOperator(self._rois, self._shape)
+
+        return self._operator
+
+    @property
+    def integral_image(self) -> ROIIntegralImage:
+        """Integral images of the ROIs (roi.ROIIntegralImage)."""
+        if self._integral_image is None:
+            self._integral_image = ROIIntegralImage(self._rois, self._shape)
+
+        return self._integral_image
+
+
+def _find_lattice(
+    corners: npt.NDArray[np.int_]
+) -> Optional[LatticeType]:
+    """
+    Number of rows and columns, origin and step of a regular lattice of ROI
+    corners in row-major order or None if the corners do not form one.
+    """
+    n = len(corners)
+    different_row = np.flatnonzero(corners[:, 0] != corners[0, 0])
+    cols = int(different_row[0]) if len(different_row) > 0 else n
+
+    if n % cols != 0:
+        return None
+
+    rows = n // cols
+    dy = int(corners[cols, 0] - corners[0, 0]) if rows > 1 else 1
+    dx = int(corners[1, 1] - corners[0, 1]) if cols > 1 else 1
+
+    if dy <= 0 or dx <= 0:
+        return None
+
+    yy, xx = np.meshgrid(np.arange(rows) * dy, np.arange(cols) * dx,
+                         indexing='ij')
+    expected = corners[0] + np.stack((yy, xx), axis=-1).reshape(-1, 2)
+
+    if not np.array_equal(corners, expected):
+        return None
+
+    return rows, cols, (int(corners[0, 0]), int(corners[0, 1])), (dy, dx)
+
+
+def _nonzero(
+    weights: Optional[npt.NDArray[np.float_]]
+) -> Optional[npt.NDArray[np.bool_]]:
+    """
+    Masks of the pixels with non-zero weight or None if there are no weights.
+    """
+    return None if weights is None else weights > 0
+
+
+def _overlaps(
+    boundaries: npt.NDArray[np.int_],
+    shape: Tuple[int, ...]
+) -> npt.NDArray[np.bool_]:
+    """
+    Whether each ROI has at least one pixel inside of the data.
+    """
+    return np.all(boundaries[:, 0] < np.array(shape[-2:]), axis=1) & \
+        np.all(boundaries[:, 1] > 0, axis=1)
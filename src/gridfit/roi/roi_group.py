@@ -0,0 +1,248 @@
+from typing import Any, Dict, Mapping, Optional, Sequence, Union
+import numpy as np
+import numpy.typing as npt
+
+from .circular_roi import CircularROI
+from .roi_array import ROI_KIND_SQUARE, ROIArray
+from .roi_dataset import GenericDataType, ROIDataset
+from .square_roi import SquareROI
+
+
+GROUP_STATISTICS = ('sum', 'mean', 'var', 'std', 'centroid', 'rms_size')
+
+ROISetType = Union[Sequence[Union[SquareROI, CircularROI]], ROIArray]
+
+
+class ROIGroup:
+    """
+    Several sets of ROIs with the same centers evaluated in a single pass
+    over the data, e.g. a circular signal ROI and an annular background ROI
+    around each point of a grid.
+
+    Note:
+        The data in the bounding square of the largest ROI at each center is
+        extracted once and the statistics of each set are computed from it
+        with the masks of the set. If a background set is given, the
+        background-subtracted sum and mean of the other sets are computed as
+        well.
+
+    Arguments:
+        data (numpy.ndarray):
+            Image data, either a two-dimensional array or a stack of
+            two-dimensional arrays (frames) with shape (frames, height,
+            width), also see roi.ROIDataset.
+
+        sets (dict):
+            Sets of ROIs by name, each a list of ROIs of the same shape or a
+            roi.ROIArray, with the same (rounded) centers in the same order.
+
+        background (str, optional):
+            Name of the set used to estimate the background (mean value per
+            pixel) of the other sets, None by default.
+
+        **kwargs:
+            Keyword arguments are passed to roi.ROIDataset, e.g. dtype,
+            memory_budget or clip.
+
+    Raises:
+        ValueError:
+            - If sets is empty or not a dict.
+            - If the ROIs of a set differ in shape.
+            - If the sets differ in length or centers.
+            - If background is not the name of a set.
+    """
+    def __init__(
+        self,
+        data: GenericDataType,
+        sets: Mapping[str, ROISetType],
+        background: Optional[str] = None,
+        **kwargs: Any
+    ):
+        if not isinstance(sets, Mapping) or len(sets) == 0:
+            raise ValueError('Invalid sets, must be a non-empty dict.')
+
+        roi_arrays = {
+            name: rois if isinstance(rois, ROIArray)
+            else ROIArray.from_rois(rois) for name, rois in sets.items()}
+        centers = next(iter(roi_arrays.values())).centers_rounded
+
+        for name, roi_array in roi_arrays.items():
+            sizes = roi_array.sizes_rounded
+
+            if np.any(sizes != sizes[0]):
+                raise ValueError(
+                    'Invalid set {}, ROIs must have the same shape.'.format(
+                        name))
+
+            if roi_array.centers_rounded.shape != centers.shape or \
+               np.any(roi_array.centers_rounded != centers):
+                raise ValueError(
+                    'Invalid set {}, ROIs must have the same centers as the '
+                    'other sets.'.format(name))
+
+        if background is not None and background not in roi_arrays:
+            raise ValueError('Invalid background, must be the name of a set.')
+
+        size = max(int(r.sizes_rounded[0]) for r in roi_arrays.values())
+        bounding = ROIArray(centers, size, ROI_KIND_SQUARE)
+
+        self._sets = roi_arrays
+        self._background = background
+        self._weights = np.stack([
+            _embed(roi_array, size) for roi_array in roi_arrays.values()])
+
+        # masks shared by all ROIs of each set, e.g. of the same radii, allow
+        # a single matrix product for all ROIs, also see ROIDataset.moments
+        if np.all(self._weights == self._weights[:, :1]):
+            self._weights = self._weights[:, :1]
+
+        self._offsets = {
+            name: size // 2 - int(roi_array.sizes_rounded[0]) // 2
+            for name, roi_array in roi_arrays.items()}
+        self._dataset = ROIDataset(data, bounding, **kwargs)
+
+    @property
+    def data(self) -> GenericDataType:
+        """Data (numpy.ndarray)."""
+        return self._dataset.data
+
+    @data.setter
+    def data(
+        self,
+        data: GenericDataType
+    ) -> None:
+        self._dataset.data = data
+
+    @property
+    def sets(self) -> Dict[str, ROIArray]:
+        """Sets of ROIs by name (dict)."""
+        return dict(self._sets)
+
+    @property
+    def background(self) -> Optional[str]:
+        """Name of the background set (str)."""
+        return self._background
+
+    def stats(
+        self,
+        names: Sequence[str] = ('sum', 'mean'),
+        absolute: bool = False
+    ) -> Dict[str, Dict[str, npt.NDArray[np.float_]]]:
+        """
+        Compute several statistics of each ROI of each set at once.
+
+        Arguments:
+            names (tuple or list, optional):
+                Names of the statistics, any of 'sum', 'mean', 'var', 'std',
+                'centroid' and 'rms_size', ('sum', 'mean') by default.
+
+            absolute (bool, optional):
+                Whether to return the absolute centroid position (in the
+                original data coordinates), False by default.
+
+        Raises:
+            ValueError:
+                If any statistic is invalid.
+
+        Returns:
+            dict:
+                Statistics of each set by name, also see ROIDataset.stats. If
+                a background set is given, the results of the other sets
+                additionally contain the mean background per pixel
+                ('background'), the background-subtracted sum ('signal') and
+                the background-subtracted mean ('signal_mean').
+        """
+        for name in names:
+            if name not in GROUP_STATISTICS:
+                raise ValueError('Invalid statistic {}, must be one of '
+                                 '{}.'.format(name,
+                                              ', '.join(GROUP_STATISTICS)))
+
+        names = tuple(names)
+
+        # the data of each chunk of frames is read once for all sets, the
+        # moments of all sets are computed at once with the masks of the sets
+        # stacked along a leading axis
+        raw_all = self._dataset.moments(self._weights)
+
+        result = {}
+        raw_sets = {}
+
+        for i, name in enumerate(self._sets):
+            raw = {key: value[..., i, :] for key, value in raw_all.items()}
+            raw_sets[name] = raw
+            result[name] = self._dataset.derive_statistics(raw, names)
+
+            # centroids are relative to the bounding square of the group
+            if absolute and 'centroid' in names:
+                result[name]['centroid'] += \
+                    self._dataset.geometry.rois.boundaries[:, 0]
+            elif 'centroid' in names:
+                result[name]['centroid'] -= self._offsets[name]
+
+        if self._background is not None:
+            raw_background = raw_sets[self._background]
+            background = raw_background['m00'] / raw_background['count']
+
+            for name, raw in raw_sets.items():
+                if name == self._background:
+                    continue
+
+                result[name]['background'] = background
+                result[name]['signal'] = raw['m00'] - raw['count'] * background
+                result[name]['signal_mean'] = \
+                    raw['m00'] / raw['count'] - background
+
+        return result
+
+    def evaluate(
+        self,
+        data: GenericDataType,
+        names: Sequence[str] = ('sum', 'mean'),
+        absolute: bool = False
+    ) -> Dict[str, Dict[str, npt.NDArray[np.float_]]]:
+        """
+        Replace the data and compute several statistics of each ROI of each
+        set at once, reusing the geometry of the ROIs for data of the same
+        shape, also see ROIGroup.stats and ROIDataset.evaluate.
+
+        Arguments:
+            data (numpy.ndarray):
+                Image data, also see ROIDataset.
+
+            names (tuple or list, optional):
+                Names of the statistics, also see ROIGroup.stats.
+
+            absolute (bool, optional):
+                Whether to return the absolute centroid position (in the
+                original data coordinates), False by default.
+
+        Returns:
+            dict:
+                Statistics of each set by name, also see ROIGroup.stats.
+        """
+        self.data = data
+
+        return self.stats(names, absolute=absolute)
+
+
+def _embed(
+    roi_array: ROIArray,
+    size: int
+) -> npt.NDArray[np.bool_]:
+    """
+    Masks of ROIs of the same shape embedded in the bounding square with the
+    given size of the largest ROI at the same center.
+    """
+    roi_size = int(roi_array.sizes_rounded[0])
+    masks = roi_array.masks()
+
+    if masks is None:
+        masks = np.ones((len(roi_array), roi_size, roi_size), dtype=bool)
+
+    # the bottom left corners are the rounded center minus half the size
+    offset = size // 2 - roi_size // 2
+    weights = np.zeros((len(roi_array), size, size), dtype=bool)
+    weights[:, offset:offset + roi_size, offset:offset + roi_size] = masks
+
+    return weights
@@ -0,0 +1,235 @@
+from typing import Any, Optional, Sequence, Tuple, Union
+import numpy as np
+import numpy.typing as npt
+
+from .circular_roi import CircularROI
+from .roi_accumulator import _FrameStatistic
+from .roi_array import ROIArray
+from .square_roi import SquareROI
+
+
+class ROIHistogram(_FrameStatistic):
+    """
+    Histograms of a statistic of each ROI across frames with fixed bins, e.g.
+    of the sum of each ROI for occupancy detection.
+
+    Note:
+        The histograms of all ROIs are updated with a single bincount over
+        ROI and bin index. Values outside of the bins are ignored.
+
+    Arguments:
+        rois (tuple, list or roi.ROIArray):
+            List of ROIs, also see roi.CircularROI and roi.SquareROI, or an
+            array of ROIs, also see roi.ROIArray.
+
+        bins (int or numpy.ndarray):
+            Either the number of equal-width bins in value_range or the
+            monotonically increasing bin edges, also see numpy.histogram.
+
+        value_range (tuple, optional):
+            The lower and upper edge of the bins, required if bins is an
+            int.
+
+        statistic (str, optional):
+            Statistic of each ROI in each frame that is histogrammed, one of
+            'sum' (default), 'mean', 'var', 'std', 'min' and 'max'.
+
+        **kwargs:
+            Keyword arguments are passed to roi.ROIDataset, e.g. method or
+            dtype.
+
+    Raises:
+        ValueError:
+            - If bins is an int and value_range is not given.
+            - If the bin edges are not monotonically increasing.
+            - If statistic is invalid.
+    """
+    def __init__(
+        self,
+        rois: Union[Sequence[Union[SquareROI, CircularROI]], ROIArray],
+        bins: Union[int, npt.ArrayLike],
+        value_range: Optional[Tuple[float, float]] = None,
+        statistic: str = 'sum',
+        **kwargs: Any
+    ):
+        if isinstance(bins, int):
+            if value_range is None:
+                raise ValueError('Invalid value range, must be given if bins '
+                                 'is an int.')
+
+            edges = np.linspace(*value_range, bins + 1)
+        else:
+            edges = np.asarray(bins, dtype=np.float64)
+
+        if edges.ndim != 1 or len(edges) < 2 or np.any(np.diff(edges) <= 0):
+            raise ValueError('Invalid bins, must be at least two '
+                             'monotonically increasing bin edges.')
+
+        super().__init__(rois, statistic, kwargs)
+        self._edges = edges
+        self.reset()
+
+    @property
+    def edges(self) -> npt.NDArray[np.float_]:
+        """Bin edges (numpy.ndarray)."""
+        return self._edges
+
+    @property
+    def centers(self) -> npt.NDArray[np.float_]:
+        """Bin centers (numpy.ndarray)."""
+        return (self._edges[1:] + self._edges[:-1]) / 2
+
+    @property
+    def counts(self) -> npt.NDArray[np.int_]:
+        """Histogram of each ROI with shape (n, bins) (numpy.ndarray)."""
+        return self._counts
+
+    @property
+    def count(self) -> int:
+        """Number of accumulated frames (int)."""
+        return self._count
+
+    def reset(self) -> None:
+        """
+        Reset the histograms.
+        """
+        self._count = 0
+        self._counts = np.zeros((len(self._rois), len(self._edges) - 1),
+                                dtype=np.int64)
+
+    def values(
+        self,
+        data: npt.NDArray[np.float_]
+    ) -> npt.NDArray[np.float_]:
+        """
+        Compute the statistic of each ROI in each frame.
+
+        Arguments:
+            data (numpy.ndarray):
+                Image data, either a two-dimensional array or a stack of
+                two-dimensional arrays (frames) with shape (frames, height,
+                width).
+
+        Returns:
+            numpy.ndarray:
+                Array of the statistic of each ROI, with an additional
+                leading frame axis for a stack of frames.
+        """
+        return self._evaluate(data)
+
+    def update(
+        self,
+        data: npt.NDArray[np.float_]
+    ) -> None:
+        """
+        Add the statistic of each ROI in a frame or a stack of frames to the
+        histograms.
+
+        Arguments:
+            data (numpy.ndarray):
+                Image data, either a two-dimensional array or a stack of
+                two-dimensional arrays (frames) with shape (frames, height,
+                width).
+        """
+        n, n_bins = self._counts.shape
+        values = self.values(data).reshape(-1, n)
+
+        # the last bin includes its upper edge, as in numpy.histogram
+        bin_index = np.searchsorted(self._edges, values, side='right') - 1
+        bin_index[values == self._edges[-1]] = n_bins - 1
+        valid = (bin_index >= 0) & (bin_index < n_bins)
+
+        index = (np.arange(n) * n_bins + bin_index)[valid]
+        self._counts += np.bincount(
+            index, minlength=n * n_bins).reshape(n, n_bins)
+        self._count += len(values)
+
+    def merge(
+        self,
+        other: 'ROIHistogram'
+    ) -> None:
+        """
+        Merge the histograms accumulated by another ROI histogram.
+
+        Arguments:
+            other (roi.ROIHistogram):
+                Histogram of the same number of ROIs, bins and statistic.
+
+        Raises:
+            ValueError:
+                If the number of ROIs, the bins or the statistic differ.
+        """
+        if not isinstance(other, ROIHistogram):
+            raise ValueError('Invalid histogram, must be a ROIHistogram.')
+
+        if other._counts.shape != self._counts.shape or \
+           not np.array_equal(other._edges, self._edges) or \
+           other._statistic != self._statistic:
+            raise ValueError('Invalid histogram, must have the same number '
+                             'of ROIs, bins and statistic.')
+
+        self._counts += other._counts
+        self._count += other._count
+
+    def thresholds(self) -> npt.NDArray[np.float_]:
+        """
+        Threshold of each ROI separating its histogram into two classes with
+        Otsu's method, e.g. empty and occupied.
+
+        Returns:
+            numpy.ndarray:
+                Array of thresholds of each ROI, NaN for ROIs with less
+                than two occupied bins.
+        """
+        counts = self._counts.astype(np.float64)
+        weighted = counts * self.centers
+
+        w_0 = np.cumsum(counts, axis=1)[:, :-1]
+        w_1 = counts.sum(axis=1, keepdims=True) - w_0
+        s_0 = np.cumsum(weighted, axis=1)[:, :-1]
+        s_1 = weighted.sum(axis=1, keepdims=True) - s_0
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            between = w_0 * w_1 * (s_0 / w_0 - s_1 / w_1)**2
+
+        between[~np.isfinite(between)] = -1
+
+        # the center of the range of optimal thresholds, i.e. of the gap
+        # between well separated classes
+        optimal = between == between.max(axis=1, keepdims=True)
+        thresholds = (optimal * self._edges[1:-1]).sum(axis=1) / \
+            optimal.sum(axis=1)
+        thresholds[np.all(between < 0, axis=1)] = np.nan
+
+        return thresholds
+
+    def classify(
+        self,
+        data: npt.NDArray[np.float_],
+        thresholds: Optional[npt.ArrayLike] = None
+    ) -> npt.NDArray[np.bool_]:
+        """
+        Classify each ROI in a frame or a stack of frames by thresholding its
+        statistic, e.g. to detect occupancy.
+
+        Arguments:
+            data (numpy.ndarray):
+                Image data, either a two-dimensional array or a stack of
+                two-dimensional arrays (frames) with shape (frames, height,
+                width).
+
+            thresholds (float or numpy.ndarray, optional):
+                The threshold of all ROIs or of each ROI, by default the
+                thresholds of the accumulated histograms, also see
+                ROIHistogram.thresholds.
+
+        Returns:
+            numpy.ndarray:
+                Boolean array, True where the statistic of the ROI is above
+                its threshold, with an additional leading frame axis for a
+                stack of frames.
+        """
+        if thresholds is None:
+            thresholds = self.thresholds()
+
+        return np.greater(self.values(data), thresholds)
@@ -0,0 +1,189 @@
+from typing import List, Sequence, Tuple, Union
+import numpy as np
+import numpy.typing as npt
+from scipy import spatial
+
+from .circular_roi import CircularROI
+from .roi_array import ROI_KIND_ANNULAR, ROIArray
+from .square_roi import SquareROI
+
+
+class ROIIndex:
+    """
+    Spatial index of a set of ROIs for finding the ROI containing each of a
+    list of points, e.g. detected spots, and the ROIs overlapping regions.
+
+    Note:
+        The centers of the bounding squares of the ROIs are stored in a
+        k-d tree (scipy.spatial.cKDTree). Each query only checks the ROIs
+        within the largest bounding square of a point or box, so batches of
+        m queries on n ROIs take about O(m log n) instead of O(m n).
+
+    Arguments:
+        rois (tuple, list or roi.ROIArray):
+            List of ROIs, also see roi.CircularROI and roi.SquareROI, or an
+            array of ROIs, also see roi.ROIArray.
+    """
+    def __init__(
+        self,
+        rois: Union[Sequence[Union[SquareROI, CircularROI]], ROIArray]
+    ):
+        roi_array = rois if isinstance(rois, ROIArray) \
+            else ROIArray.from_rois(rois)
+        boundaries = roi_array.boundaries
+
+        self._rois = roi_array
+        self._boundaries = boundaries
+        self._half_size = roi_array.sizes_rounded.max() / 2
+        self._tree = spatial.cKDTree(boundaries.mean(axis=1))
+
+    @property
+    def rois(self) -> ROIArray:
+        """ROIs (roi.ROIArray)."""
+        return self._rois
+
+    @property
+    def tree(self) -> spatial.cKDTree:
+        """
+        k-d tree of the centers of the bounding squares of the ROIs
+        (scipy.spatial.cKDTree).
+        """
+        return self._tree
+
+    def _candidates(
+        self,
+        centers: npt.NDArray[np.float_],
+        radii: npt.NDArray[np.float_]
+    ) -> Tuple[npt.NDArray[np.intp], npt.NDArray[np.intp]]:
+        """
+        Pairs of query index and ROI index of all ROIs with a bounding square
+        center within the given (Chebyshev) distance of each query center.
+        """
+        candidates = self._tree.query_ball_point(centers, radii, p=np.inf)
+        lengths = np.fromiter((len(c) for c in candidates), dtype=np.intp,
+                              count=len(candidates))
+        query = np.repeat(np.arange(len(candidates)), lengths)
+
+        if len(query) == 0:
+            return query, np.zeros(0, dtype=np.intp)
+
+        return query, np.concatenate(candidates).astype(np.intp)
+
+    def query_points(
+        self,
+        points: npt.ArrayLike
+    ) -> Union[int, npt.NDArray[np.intp]]:
+        """
+        Find the ROI containing each point.
+
+        Note:
+            A point is contained in a ROI if the pixel containing the point
+            (its rounded coordinates) is part of the ROI, as for the data
+            extracted from the ROI. If several ROIs contain a point, the ROI
+            with the closest center is returned.
+
+        Arguments:
+            points (numpy.ndarray):
+                Coordinates of a point with shape (2,) or of several points
+                with shape (m, 2).
+
+        Raises:
+            ValueError:
+                If points does not have shape (2,) or (m, 2).
+
+        Returns:
+            int or numpy.ndarray:
+                Index of the ROI containing each point or -1 if no ROI
+                contains the point, an int for a single point.
+        """
+        points = np.asarray(points, dtype=np.float64)
+        single = points.ndim == 1
+
+        if points.shape[-1:] != (2,) or points.ndim > 2:
+            raise ValueError('Invalid points, must have shape (2,) or '
+                             '(m, 2).')
+
+        points = points.reshape(-1, 2)
+        pixels = np.round(points)
+        query, index = self._candidates(
+            pixels, np.full(len(points), self._half_size))
+
+        # only keep pixels inside of the bounding square and mask of the ROI
+        pixel, boundaries = pixels[query], self._boundaries[index]
+        inside = np.all((pixel >= boundaries[:, 0])
+                        & (pixel < boundaries[:, 1]), axis=1)
+
+        circular = self._rois.circular[index]
+        distance_sq = np.square(
+            pixel - self._rois.centers_rounded[index]).sum(axis=1)
+        radii = self._rois.radii_rounded[index]
+        inner_radii = np.round(self._rois.inner_radii[index])
+        annular = self._rois.kinds[index] == ROI_KIND_ANNULAR
+
+        inside &= ~circular | (distance_sq <= radii**2)
+        inside &= ~annular | (distance_sq > inner_radii**2)
+        query, index = query[inside], index[inside]
+
+        # the closest ROI for each point, the first one for equal distances
+        distance = np.square(
+            points[query] - self._rois.centers[index]).sum(axis=1)
+        order = np.lexsort((index, distance, query))
+        query, index = query[order], index[order]
+        is_first = np.ones(len(query), dtype=bool)
+        is_first[1:] = query[1:] != query[:-1]
+
+        result = np.full(len(points), -1, dtype=np.intp)
+        result[query[is_first]] = index[is_first]
+
+        return int(result[0]) if single else result
+
+    def query_box(
+        self,
+        boxes: npt.ArrayLike
+    ) -> Union[npt.NDArray[np.intp], List[npt.NDArray[np.intp]]]:
+        """
+        Find the ROIs overlapping each box.
+
+        Note:
+            A ROI overlaps a box if its bounding square contains at least one
+            pixel of the box.
+
+        Arguments:
+            boxes (numpy.ndarray):
+                Bottom left and top right corner of a box with shape (2, 2)
+                or of several boxes with shape (m, 2, 2), in the same pixel
+                coordinates as the boundaries of the ROIs, i.e. the top right
+                corner is excluded.
+
+        Raises:
+            ValueError:
+                If boxes does not have shape (2, 2) or (m, 2, 2).
+
+        Returns:
+            numpy.ndarray or list:
+                Sorted indices of the ROIs overlapping the box, a list of
+                indices for each box for several boxes.
+        """
+        boxes = np.asarray(boxes, dtype=np.float64)
+        single = boxes.ndim == 2
+
+        if boxes.shape[-2:] != (2, 2) or boxes.ndim > 3:
+            raise ValueError('Invalid boxes, must have shape (2, 2) or '
+                             '(m, 2, 2).')
+
+        boxes = boxes.reshape(-1, 2, 2)
+        half_sizes = (boxes[:, 1] - boxes[:, 0]).max(axis=1) / 2
+        query, index = self._candidates(boxes.mean(axis=1),
+                                        half_sizes + self._half_size)
+
+        box, boundaries = boxes[query], self._boundaries[index]
+        overlaps = np.all((boundaries[:, 0] < box[:, 1])
+                          & (boundaries[:, 1] > box[:, 0]), axis=1)
+        query, index = query[overlaps], index[overlaps]
+
+        order = np.lexsort((index, query))
+        query, index = query[order], index[order]
+        result = np.split(index, np.searchsorted(query,
+                                                 np.arange(1, len(boxes))))
+
+        return result[0] if single else result
@@ -0,0 +1,149 @@
+from typing import Sequence, Tuple
+import numpy as np
+import numpy.typing as npt
+
+from .circular_roi import CircularROI
+from .square_roi import SquareROI
+
+
+class ROIIntegralImage:
+    """
+    Integral images (summed-area tables) for computing sum, mean, variance
+    and standard deviation of square ROIs with four lookups per ROI,
+    independent of the ROI size.
+
+    Arguments:
+        rois (tuple or list):
+            List of square ROIs, also see roi.SquareROI.
+
+        shape (tuple):
+            The shape of the two-dimensional data.
+
+    Raises:
+        ValueError:
+            - If any ROI is a circular ROI.
+            - If any ROI is outside of the data boundaries.
+    """
+    def __init__(
+        self,
+        rois: Sequence[SquareROI],
+        shape: Tuple[int, ...]
+    ):
+        if any(isinstance(roi, CircularROI) for roi in rois):
+            raise ValueError('Integral images only support square ROIs.')
+
+        boundaries = np.array([roi.boundaries for roi in rois])
+
+        if np.any(boundaries[:, 0] < 0):
+            raise ValueError('ROI is outside of data boundaries (negative'
+                             ' bottom left coordinates).')
+
+        if np.any(boundaries[:, 1] > np.array(shape)):
+            raise ValueError(
+                'ROI is outside of data boundaries [top right coordinate {} '
+                'is too large for data shape {}].'.format(
+                    tuple(boundaries[:, 1].max(axis=0).tolist()), shape))
+
+        self._shape = tuple(shape)
+        self._boundaries = boundaries
+        self._counts = np.prod(boundaries[:, 1] - boundaries[:, 0], axis=-1)
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        """Shape of the data (tuple)."""
+        return self._shape
+
+    @property
+    def counts(self) -> npt.NDArray[np.int_]:
+        """Number of pixels in each ROI (numpy.ndarray)."""
+        return self._counts
+
+    def _sum(
+        self,
+        data: npt.NDArray[np.float_]
+    ) -> npt.NDArray[np.float_]:
+        if data.shape[-2:] != self._shape:
+            raise ValueError(
+                'Invalid data shape {}, must end with {}.'.format(
+                    data.shape, self._shape))
+
+        table = np.zeros(data.shape[:-2] + (self._shape[0] + 1,
+                                            self._shape[1] + 1))
+        np.cumsum(data, axis=-2, dtype=np.float64, out=table[..., 1:, 1:])
+        np.cumsum(table[..., 1:, 1:], axis=-1, out=table[..., 1:, 1:])
+
+        (y_0, x_0), (y_1, x_1) = self._boundaries.transpose(1, 2, 0)
+
+        return (table[..., y_1, x_1] - table[..., y_0, x_1]
+                - table[..., y_1, x_0] + table[..., y_0, x_0])
+
+    def sum(
+        self,
+        data: npt.NDArray[np.float_]
+    ) -> npt.NDArray[np.float_]:
+        """
+        Sum data in each ROI.
+
+        Arguments:
+            data (numpy.ndarray):
+                Two-dimensional array or stack of two-dimensional arrays.
+
+        Returns:
+            numpy.ndarray:
+                Array of sums with shape (..., n).
+        """
+        return self._sum(data)
+
+    def mean(
+        self,
+        data: npt.NDArray[np.float_]
+    ) -> npt.NDArray[np.float_]:
+        """
+        Mean value in each ROI.
+
+        Arguments:
+            data (numpy.ndarray):
+                Two-dimensional array or stack of two-dimensional arrays.
+
+        Returns:
+            numpy.ndarray:
+                Array of mean values with shape (..., n).
+        """
+        return self._sum(data) / self._counts
+
+    def var(
+        self,
+        data: npt.NDArray[np.float_]
+    ) -> npt.NDArray[np.float_]:
+        """
+        Variance in each ROI.
+
+        Arguments:
+            data (numpy.ndarray):
+                Two-dimensional array or stack of two-dimensional arrays.
+
+        Returns:
+            numpy.ndarray:
+                Array of variances with shape (..., n).
+        """
+        mean = self._sum(data) / self._counts
+        mean_sq = self._sum(np.square(data, dtype=np.float64)) / self._counts
+
+        return np.maximum(mean_sq - mean**2, 0)
+
+    def std(
+        self,
+        data: npt.NDArray[np.float_]
+    ) -> npt.NDArray[np.float_]:
+        """
+        Standard deviation in each ROI.
+
+        Arguments:
+            data (numpy.ndarray):
+                Two-dimensional array or stack of two-dimensional arrays.
+
+        Returns:
+            numpy.ndarray:
+                Array of standard deviations with shape (..., n).
+        """
+        return np.sqrt(self.var(data))
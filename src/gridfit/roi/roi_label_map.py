@@ -0,0 +1,246 @@
+from typing import Any, Callable, Sequence, Tuple, Union, cast
+import numpy as np
+import numpy.typing as npt
+from scipy import ndimage
+
+from .circular_roi import CircularROI
+from .square_roi import SquareROI
+
+
+class ROILabelMap:
+    """
+    Label image of a set of ROIs for computing statistics of all ROIs in a
+    single pass over the data.
+
+    Note:
+        Each pixel is labeled with the first ROI containing it. Pixels that
+        are contained in more than one ROI are additionally stored as pairs
+        of pixel index and ROI index.
+
+    Arguments:
+        rois (tuple or list):
+            List of ROIs, also see roi.CircularROI and roi.SquareROI.
+
+        shape (tuple):
+            The shape of the two-dimensional data.
+
+    Raises:
+        ValueError:
+            If any ROI is outside of the data boundaries.
+    """
+    def __init__(
+        self,
+        rois: Sequence[Union[SquareROI, CircularROI]],
+        shape: Tuple[int, ...]
+    ):
+        pixel_index = cast(npt.NDArray[np.float_],
+                           np.arange(np.prod(shape)).reshape(shape))
+        roi_pixels = []
+
+        for roi in rois:
+            pixels = SquareROI.apply(roi, pixel_index)
+
+            if isinstance(roi, CircularROI):
+                pixels = pixels[roi.mask]
+
+            roi_pixels.append(np.ravel(pixels))
+
+        pixels = np.concatenate(roi_pixels)
+        labels = np.repeat(np.arange(1, len(rois) + 1),
+                           [len(p) for p in roi_pixels])
+
+        order = np.argsort(pixels, kind='stable')
+        pixels, labels = pixels[order], labels[order]
+        is_first = np.ones(len(pixels), dtype=bool)
+        is_first[1:] = pixels[1:] != pixels[:-1]
+
+        self._shape = tuple(shape)
+        self._n = len(rois)
+        self._labels = np.zeros(pixel_index.size, dtype=np.intp)
+        self._labels[pixels[is_first]] = labels[is_first]
+        self._overlap_pixels = pixels[~is_first]
+        self._overlap_labels = labels[~is_first] - 1
+        self._counts = np.array([len(p) for p in roi_pixels])
+
+        # ROIs whose pixels are all contained in earlier ROIs, e.g. nested
+        # ROIs, are not in the label image
+        self._labeled = np.bincount(
+            labels[is_first] - 1, minlength=self._n) > 0
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        """Shape of the data (tuple)."""
+        return self._shape
+
+    @property
+    def labels(self) -> npt.NDArray[np.intp]:
+        """Label image, zero for pixels outside of all ROIs (numpy.ndarray)."""
+        return self._labels.reshape(self._shape)
+
+    @property
+    def counts(self) -> npt.NDArray[np.int_]:
+        """Number of pixels in each ROI (numpy.ndarray)."""
+        return self._counts
+
+    def _values(
+        self,
+        data: npt.NDArray[np.float_]
+    ) -> npt.NDArray[np.float_]:
+        if data.shape != self._shape:
+            raise ValueError(
+                'Invalid data shape {}, must be {}.'.format(
+                    data.shape, self._shape))
+
+        return np.asarray(data).reshape(-1)
+
+    def _bincount(
+        self,
+        values: npt.NDArray[np.float_]
+    ) -> npt.NDArray[np.float_]:
+        result = np.bincount(
+            self._labels, weights=values,
+            minlength=self._n + 1)[1:].astype(np.float64, copy=False)
+
+        if len(self._overlap_pixels) > 0:
+            result += np.bincount(
+                self._overlap_labels, weights=values[self._overlap_pixels],
+                minlength=self._n)
+
+        return result
+
+    def sum(
+        self,
+        data: npt.NDArray[np.float_]
+    ) -> npt.NDArray[np.float_]:
+        """
+        Sum data in each ROI.
+
+        Arguments:
+            data (numpy.ndarray):
+                Two-dimensional array.
+
+        Returns:
+            numpy.ndarray:
+                Array of sums of data in each ROI.
+        """
+        return self._bincount(self._values(data))
+
+    def mean(
+        self,
+        data: npt.NDArray[np.float_]
+    ) -> npt.NDArray[np.float_]:
+        """
+        Mean value in each ROI.
+
+        Arguments:
+            data (numpy.ndarray):
+                Two-dimensional array.
+
+        Returns:
+            numpy.ndarray:
+                Array of mean values in each ROI.
+        """
+        return self.sum(data) / self._counts
+
+    def var(
+        self,
+        data: npt.NDArray[np.float_]
+    ) -> npt.NDArray[np.float_]:
+        """
+        Variance in each ROI.
+
+        Arguments:
+            data (numpy.ndarray):
+                Two-dimensional array.
+
+        Returns:
+            numpy.ndarray:
+                Array of variances in each ROI.
+        """
+        values = self._values(data).astype(np.float64)
+        mean = self._bincount(values) / self._counts
+        mean_sq = self._bincount(values**2) / self._counts
+
+        return np.maximum(mean_sq - mean**2, 0)
+
+    def std(
+        self,
+        data: npt.NDArray[np.float_]
+    ) -> npt.NDArray[np.float_]:
+        """
+        Standard deviation in each ROI.
+
+        Arguments:
+            data (numpy.ndarray):
+                Two-dimensional array.
+
+        Returns:
+            numpy.ndarray:
+                Array of standard deviations in each ROI.
+        """
+        return np.sqrt(self.var(data))
+
+    def min(
+        self,
+        data: npt.NDArray[np.float_]
+    ) -> npt.NDArray[np.float_]:
+        """
+        Minimum value in each ROI.
+
+        Arguments:
+            data (numpy.ndarray):
+                Two-dimensional array.
+
+        Returns:
+            numpy.ndarray:
+                Array of minimum values in each ROI.
+        """
+        return self._extreme(data, ndimage.minimum, np.minimum)
+
+    def max(
+        self,
+        data: npt.NDArray[np.float_]
+    ) -> npt.NDArray[np.float_]:
+        """
+        Maximum value in each ROI.
+
+        Arguments:
+            data (numpy.ndarray):
+                Two-dimensional array.
+
+        Returns:
+            numpy.ndarray:
+                Array of maximum values in each ROI.
+        """
+        return self._extreme(data, ndimage.maximum, np.maximum)
+
+    def _extreme(
+        self,
+        data: npt.NDArray[np.float_],
+        label_func: Callable[..., Any],
+        ufunc: np.ufunc
+    ) -> npt.NDArray[np.float_]:
+        """
+        Minimum or maximum in each ROI from the labeled pixels and the
+        overlapping pixels of each ROI.
+        """
+        values = self._values(data)
+        result = np.asarray(label_func(
+            values, self._labels, np.arange(1, self._n + 1)))
+
+        # ROIs without labeled pixels start from the identity of the ufunc
+        if not np.all(self._labeled):
+            upper = ufunc is np.minimum
+            initial: Union[int, float]
+
+            if np.issubdtype(result.dtype, np.integer):
+                info = np.iinfo(result.dtype)
+                initial = info.max if upper else info.min
+            else:
+                initial = np.inf if upper else -np.inf
+
+            result[~self._labeled] = initial
+
+        ufunc.at(result, self._overlap_labels, values[self._overlap_pixels])
+
+        return result
@@ -0,0 +1,243 @@
+from typing import Sequence, Tuple, Union, cast
+import numpy as np
+import numpy.typing as npt
+from scipy import sparse
+
+from .circular_roi import CircularROI
+from .square_roi import SquareROI
+
+
+class ROIOperator:
+    """
+    Sparse linear operator of a set of ROIs that maps flattened image data
+    to the weighted sums and first and second moments of each ROI.
+
+    Note:
+        The operator is a scipy.sparse.csr_matrix with one row per ROI and
+        moment. Applying it to a stack of images is a single sparse matrix
+        product.
+
+    Arguments:
+        rois (tuple or list):
+            List of ROIs, also see roi.CircularROI and roi.SquareROI.
+
+        shape (tuple):
+            The shape of the two-dimensional data.
+
+    Raises:
+        ValueError:
+            If any ROI is outside of the data boundaries.
+    """
+    def __init__(
+        self,
+        rois: Sequence[Union[SquareROI, CircularROI]],
+        shape: Tuple[int, ...]
+    ):
+        pixel_index = cast(npt.NDArray[np.float_],
+                           np.arange(np.prod(shape)).reshape(shape))
+        n = len(rois)
+        rows, cols, values = [], [], []
+
+        for i, roi in enumerate(rois):
+            window = np.asarray(roi.apply(pixel_index))
+            weights = _roi_weights(roi)
+            y, x = np.nonzero(weights)
+            w = weights[y, x]
+
+            for j, moment in enumerate((w, w * y, w * x, w * y**2, w * x**2)):
+                rows.append(np.full(len(w), j * n + i))
+                cols.append(window[y, x])
+                values.append(moment)
+
+        self._shape = tuple(shape)
+        self._n = n
+        self._matrix = sparse.csr_matrix(
+            (np.concatenate(values),
+             (np.concatenate(rows), np.concatenate(cols))),
+            shape=(5 * n, int(np.prod(shape))))
+        self._weights = self._matrix[:n]
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        """Shape of the data (tuple)."""
+        return self._shape
+
+    @property
+    def matrix(self) -> sparse.csr_matrix:
+        """
+        Operator for the weighted sum (m00), the first (m10, m01) and the
+        second moments (m20, m02) of all ROIs stacked along the first axis
+        (scipy.sparse.csr_matrix).
+        """
+        return self._matrix
+
+    @property
+    def weights(self) -> sparse.csr_matrix:
+        """Operator for the weighted sum of each ROI (scipy.sparse.csr_matrix).
+        """
+        return self._weights
+
+    @property
+    def counts(self) -> npt.NDArray[np.float_]:
+        """Sum of weights of each ROI (numpy.ndarray)."""
+        return np.asarray(self._weights.sum(axis=1)).reshape(-1)
+
+    def _flatten(
+        self,
+        data: npt.NDArray[np.float_]
+    ) -> npt.NDArray[np.float_]:
+        if data.shape[-2:] != self._shape:
+            raise ValueError(
+                'Invalid data shape {}, must end with {}.'.format(
+                    data.shape, self._shape))
+
+        return np.asarray(data).reshape(-1, int(np.prod(self._shape))).T
+
+    def _apply(
+        self,
+        operator: sparse.csr_matrix,
+        data: npt.NDArray[np.float_]
+    ) -> npt.NDArray[np.float_]:
+        result = np.asarray(operator @ self._flatten(data), dtype=np.float64)
+        return result.T.reshape(data.shape[:-2] + (-1,))
+
+    def moments(
+        self,
+        data: npt.NDArray[np.float_]
+    ) -> npt.NDArray[np.float_]:
+        """
+        Raw moments m00, m10, m01, m20 and m02 of each ROI, where the first
+        index refers to the first axis.
+
+        Arguments:
+            data (numpy.ndarray):
+                Two-dimensional array or stack of two-dimensional arrays.
+
+        Returns:
+            numpy.ndarray:
+                Array of raw moments with shape (..., 5, n).
+        """
+        result = self._apply(self._matrix, data)
+        return result.reshape(result.shape[:-1] + (5, self._n))
+
+    def sum(
+        self,
+        data: npt.NDArray[np.float_]
+    ) -> npt.NDArray[np.float_]:
+        """
+        Weighted sum of data in each ROI.
+
+        Arguments:
+            data (numpy.ndarray):
+                Two-dimensional array or stack of two-dimensional arrays.
+
+        Returns:
+            numpy.ndarray:
+                Array of sums with shape (..., n).
+        """
+        return self._apply(self._weights, data)
+
+    def mean(
+        self,
+        data: npt.NDArray[np.float_]
+    ) -> npt.NDArray[np.float_]:
+        """
+        Weighted mean value in each ROI.
+
+        Arguments:
+            data (numpy.ndarray):
+                Two-dimensional array or stack of two-dimensional arrays.
+
+        Returns:
+            numpy.ndarray:
+                Array of mean values with shape (..., n).
+        """
+        return self.sum(data) / self.counts
+
+    def var(
+        self,
+        data: npt.NDArray[np.float_]
+    ) -> npt.NDArray[np.float_]:
+        """
+        Weighted variance in each ROI.
+
+        Arguments:
+            data (numpy.ndarray):
+                Two-dimensional array or stack of two-dimensional arrays.
+
+        Returns:
+            numpy.ndarray:
+                Array of variances with shape (..., n).
+        """
+        counts = self.counts
+        mean = self.sum(data) / counts
+        mean_sq = self.sum(np.square(data, dtype=np.float64)) / counts
+
+        return np.maximum(mean_sq - mean**2, 0)
+
+    def std(
+        self,
+        data: npt.NDArray[np.float_]
+    ) -> npt.NDArray[np.float_]:
+        """
+        Weighted standard deviation in each ROI.
+
+        Arguments:
+            data (numpy.ndarray):
+                Two-dimensional array or stack of two-dimensional arrays.
+
+        Returns:
+            numpy.ndarray:
+                Array of standard deviations with shape (..., n).
+        """
+        return np.sqrt(self.var(data))
+
+    def centroid(
+        self,
+        data: npt.NDArray[np.float_]
+    ) -> npt.NDArray[np.float_]:
+        """
+        Centroid of each ROI relative to its bottom left corner.
+
+        Arguments:
+            data (numpy.ndarray):
+                Two-dimensional array or stack of two-dimensional arrays.
+
+        Returns:
+            numpy.ndarray:
+                Array of centroids with shape (..., n, 2).
+        """
+        m = self.moments(data)
+        return np.stack((m[..., 1, :], m[..., 2, :]), axis=-1) \
+            / m[..., 0, :, None]
+
+    def rms_size(
+        self,
+        data: npt.NDArray[np.float_]
+    ) -> npt.NDArray[np.float_]:
+        """
+        Root-mean-squared size of each ROI.
+
+        Arguments:
+            data (numpy.ndarray):
+                Two-dimensional array or stack of two-dimensional arrays.
+
+        Returns:
+            numpy.ndarray:
+                Array of root-mean-squared sizes with shape (..., n, 2).
+        """
+        m = self.moments(data)
+        m00 = m[..., 0, :]
+        mu20 = m[..., 3, :] - m[..., 1, :]**2 / m00
+        mu02 = m[..., 4, :] - m[..., 2, :]**2 / m00
+
+        return np.sqrt(np.stack((mu20, mu02), axis=-1) / m00[..., None])
+
+
+def _roi_weights(
+    roi: Union[SquareROI, CircularROI]
+) -> npt.NDArray[np.float_]:
+    if isinstance(roi, CircularROI):
+        return roi.mask.astype(np.float64)
+
+    return np.ones(roi.shape)
@@ -124,7 +124,7 @@ class SquareROI:
         color: str = 'r',
         lw: int = 1,
         show_center: bool = True
-    ) -> patches.Rectangle:
+    ) -> patches.Patch:
         """
         Plot the boundaries of the ROI as a rectangle.
 
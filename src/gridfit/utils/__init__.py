@@ -1,10 +1,12 @@
 from .auto_pad import auto_pad
 from .cartesian_product import cartesian_product
+from .find_bounding_box import find_bounding_box
 from .find_center import find_center
-from .image_moments import centroid, rms_size
+from .image_moments import centroid, centroids, moments, rms_size, rms_sizes
 from .rotate_point import rotate_point
 from .rotate import rotate
 
 
-__all__ = ['auto_pad', 'cartesian_product', 'centroid', 'find_center',
-           'rotate', 'rotate_point', 'rms_size']
+__all__ = ['auto_pad', 'cartesian_product', 'centroid', 'centroids',
+           'find_bounding_box', 'find_center', 'moments', 'rotate',
+           'rotate_point', 'rms_size', 'rms_sizes']
@@ -0,0 +1,47 @@
+import numpy as np
+import numpy.typing as npt
+
+
+def find_bounding_box(
+    data: npt.NDArray[np.float_],
+    rel_threshold: float = 0.1,
+    margin: int = 10
+) -> npt.NDArray[np.int_]:
+    """
+    Find the bounding box of the signal in a two-dimensional array using
+    thresholded projections along both axes.
+
+    Arguments:
+        data (numpy.ndarray):
+            The data array.
+
+        rel_threshold (float, optional):
+            Threshold relative to the maximum of the background subtracted
+            projections, 0.1 by default.
+
+        margin (int, optional):
+            Margin added to each side of the bounding box in pixels, 10 by
+            default.
+
+    Returns:
+        numpy.ndarray:
+            Bottom left and top right corner of the bounding box, clipped to
+            the data boundaries. The top right corner is exclusive such that
+            data[y_0:y_1, x_0:x_1] is the cropped data.
+    """
+    corners = np.zeros((2, 2), dtype=int)
+
+    for axis in (0, 1):
+        projection = np.sum(data, axis=1 - axis, dtype=np.float64)
+        projection -= projection.min()
+        indices = np.flatnonzero(
+            projection > rel_threshold * projection.max())
+
+        if len(indices) == 0:
+            corners[:, axis] = 0, data.shape[axis]
+            continue
+
+        corners[0, axis] = max(indices[0] - margin, 0)
+        corners[1, axis] = min(indices[-1] + 1 + margin, data.shape[axis])
+
+    return corners
@@ -1,7 +1,7 @@
 import cv2
 import numpy as np
 import numpy.typing as npt
-from typing import Tuple
+from typing import Optional, Tuple
 
 
 def centroid(
@@ -40,3 +40,97 @@ def rms_size(
     mom = cv2.moments(data)
     m00 = mom['m00']
     return np.sqrt(mom['mu02'] / m00), np.sqrt(mom['mu20'] / m00)
+
+
+def moments(
+    data: npt.NDArray[np.float_],
+    weights: Optional[npt.NDArray[np.float_]] = None
+) -> npt.NDArray[np.float_]:
+    """
+    Calculate the raw moments of a stack of two-dimensional arrays.
+
+    Note:
+        The moments are computed from the projections of the data onto both
+        axes with precomputed coordinate vectors. Unlike cv2.moments, the
+        first index of a moment refers to the first axis, e.g. m10 is the
+        first moment along the first axis.
+
+    Arguments:
+        data (numpy.ndarray):
+            The image data with shape (..., height, width).
+
+        weights (numpy.ndarray, optional):
+            Weights that are multiplied with the data, e.g. a mask, with a
+            shape that broadcasts to the shape of the data, None by default.
+
+    Returns:
+        numpy.ndarray:
+            The raw moments m00, m10, m01, m20 and m02 with shape (..., 5).
+    """
+    y = np.arange(data.shape[-2], dtype=np.float64)
+    x = np.arange(data.shape[-1], dtype=np.float64)
+
+    # projections avoid temporary copies of the (possibly strided) data
+    if weights is None:
+        proj_y = data.sum(axis=-1, dtype=np.float64)
+        proj_x = data.sum(axis=-2, dtype=np.float64)
+    else:
+        proj_y = np.einsum('...ij,...ij->...i', data, weights,
+                           dtype=np.float64)
+        proj_x = np.einsum('...ij,...ij->...j', data, weights,
+                           dtype=np.float64)
+
+    return np.stack((proj_y.sum(axis=-1), proj_y @ y, proj_x @ x,
+                     proj_y @ y**2, proj_x @ x**2), axis=-1)
+
+
+def centroids(
+    data: npt.NDArray[np.float_],
+    weights: Optional[npt.NDArray[np.float_]] = None
+) -> npt.NDArray[np.float_]:
+    """
+    Calculate the centroids of a stack of two-dimensional arrays.
+
+    Arguments:
+        data (numpy.ndarray):
+            The image data with shape (..., height, width).
+
+        weights (numpy.ndarray, optional):
+            Weights that are multiplied with the data, also see
+            utils.moments, None by default.
+
+    Returns:
+        numpy.ndarray:
+            The centroids along the first and second axis with shape
+            (..., 2).
+    """
+    m = moments(data, weights)
+    return m[..., 1:3] / m[..., :1]
+
+
+def rms_sizes(
+    data: npt.NDArray[np.float_],
+    weights: Optional[npt.NDArray[np.float_]] = None
+) -> npt.NDArray[np.float_]:
+    """
+    Calculate the root mean square sizes of a stack of two-dimensional
+    arrays.
+
+    Arguments:
+        data (numpy.ndarray):
+            The image data with shape (..., height, width).
+
+        weights (numpy.ndarray, optional):
+            Weights that are multiplied with the data, also see
+            utils.moments, None by default.
+
+    Returns:
+        numpy.ndarray:
+            The root mean square sizes along the first and second axis with
+            shape (..., 2).
+    """
+    m = moments(data, weights)
+    m00 = m[..., :1]
+    mu = m[..., 3:5] - m[..., 1:3]**2 / m00
+
+    return np.sqrt(mu / m00)
@@ -0,0 +1,188 @@
+import pytest
+import numpy as np
+
+from gridfit.cache import (ResultCache, cached, disable_cache, enable_cache,
+                           get_cache, hash_key)
+from gridfit.rect import find_dominant_angle, fit_grid
+
+
+def test_initialize_raises_error_for_invalid_maxsize():
+    for invalid_value in (0, -1, 1.5, 'test'):
+        with pytest.raises(ValueError):
+            ResultCache(maxsize=invalid_value)
+
+
+def test_get_returns_none_for_unknown_key():
+    cache = ResultCache()
+    assert cache.get('unknown') is None
+
+
+def test_get_returns_stored_result():
+    cache = ResultCache()
+    cache.set('key', 1.5)
+
+    assert cache.get('key') == 1.5
+
+
+def test_get_returns_copy_of_stored_result():
+    cache = ResultCache()
+    cache.set('key', np.zeros(3))
+    cache.get('key')[:] = 1
+
+    assert np.all(cache.get('key') == 0)
+
+
+def test_set_evicts_least_recently_used_result():
+    cache = ResultCache(maxsize=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+    cache.set('c', 3)
+
+    assert cache.get('a') == 1
+    assert cache.get('b') is None
+    assert cache.info().currsize == 2
+
+
+def test_info_counts_hits_and_misses():
+    cache = ResultCache()
+    cache.set('key', 1)
+    cache.get('key')
+    cache.get('key')
+    cache.get('unknown')
+
+    assert cache.hits == 2
+    assert cache.misses == 1
+    assert cache.info() == (2, 1, 128, 1)
+
+
+def test_clear_removes_results_and_resets_statistics(tmp_path):
+    cache = ResultCache(directory=str(tmp_path))
+    cache.set('key', 1)
+    cache.get('key')
+    cache.clear()
+
+    assert cache.get('key') is None
+    assert cache.hits == 0
+
+
+def test_directory_persists_results(tmp_path):
+    ResultCache(directory=str(tmp_path)).set('key', np.arange(3))
+    cache = ResultCache(directory=str(tmp_path))
+
+    assert np.all(cache.get('key') == np.arange(3))
+    assert cache.hits == 1
+
+
+def test_hash_key_depends_on_array_content_shape_and_dtype():
+    data = np.zeros((4, 4))
+    key = hash_key('f', dict(data=data))
+
+    assert key == hash_key('f', dict(data=data.copy()))
+    assert key != hash_key('f', dict(data=data + 1))
+    assert key != hash_key('f', dict(data=data.reshape(2, 8)))
+    assert key != hash_key('f', dict(data=data.astype(np.float32)))
+    assert key != hash_key('g', dict(data=data))
+
+
+def test_hash_key_depends_on_arguments():
+    data = np.zeros((4, 4))
+
+    assert hash_key('f', dict(data=data, angle=1)) != \
+        hash_key('f', dict(data=data, angle=2))
+
+
+def test_enable_cache_returns_enabled_cache():
+    cache = enable_cache()
+    assert get_cache() is cache
+
+    disable_cache()
+    assert get_cache() is None
+
+
+def test_cached_calls_function_without_enabled_cache():
+    calls = []
+
+    @cached
+    def func(x):
+        calls.append(x)
+        return x
+
+    func(1)
+    func(1)
+
+    assert len(calls) == 2
+
+
+def test_cached_returns_stored_result(result_cache):
+    calls = []
+
+    @cached
+    def func(x, y=2):
+        calls.append(x)
+        return x * y
+
+    assert func(1) == 2
+    assert func(1, y=2) == 2
+    assert func(1, y=3) == 3
+    assert len(calls) == 2
+    assert result_cache.hits == 1
+
+
+def test_cached_ignores_calls_with_debug_flag(result_cache):
+    calls = []
+
+    @cached
+    def func(x, debug=False):
+        calls.append(x)
+        return x
+
+    func(1, debug=True)
+    func(1, debug=True)
+
+    assert len(calls) == 2
+
+
+def test_find_dominant_angle_returns_cached_result(load_fixture_data, result_cache):  # noqa: E501
+    data = load_fixture_data('grid_test_data.npy')
+    theta_1 = find_dominant_angle(data, (-90, 0))
+    theta_2 = find_dominant_angle(data, (-90, 0))
+
+    assert theta_1 == theta_2
+    assert result_cache.hits == 1
+
+
+def test_fit_grid_returns_cached_result(load_fixture_data, result_cache):
+    data = load_fixture_data('grid_test_data_minus_50deg.npy')
+    x_1, y_1, grid_1 = fit_grid(data, angle=-50, full_output=True)
+    x_2, y_2, grid_2 = fit_grid(data, angle=-50, full_output=True)
+
+    assert np.all(grid_1 == grid_2)
+    assert result_cache.hits == 1
+
+
+def test_get_removes_unreadable_file_and_returns_none(tmp_path):
+    cache = ResultCache(directory=str(tmp_path))
+    cache.set('key', np.arange(100))
+
+    path = tmp_path / 'key.pkl'
+    path.write_bytes(path.read_bytes()[:10])
+
+    assert ResultCache(directory=str(tmp_path)).get('key') is None
+    assert not path.exists()
+
+
+def test_set_replaces_file_without_leaving_temporary_files(tmp_path):
+    cache = ResultCache(directory=str(tmp_path))
+    cache.set('key', 1)
+    cache.set('key', 2)
+
+    assert [p.name for p in tmp_path.iterdir()] == ['key.pkl']
+    assert ResultCache(directory=str(tmp_path)).get('key') == 2
+
+
+def test_hash_key_depends_on_version(monkeypatch):
+    key = hash_key('func', dict(a=1))
+    monkeypatch.setattr('gridfit.cache.result_cache.__version__', '0.0.0')
+
+    assert hash_key('func', dict(a=1)) != key
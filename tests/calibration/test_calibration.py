@@ -0,0 +1,86 @@
+import pytest
+import numpy as np
+
+from gridfit.calibration import Calibration
+from gridfit.rect import fit_grid
+from gridfit.roi import AnnularROI, CircularROI, SquareROI
+
+
+@pytest.fixture
+def calibration(load_fixture_data):
+    data = load_fixture_data('grid_test_data_minus_50deg.npy')
+    return Calibration.from_data(data)
+
+
+def test_initialize_raises_error_for_invalid_grid():
+    with pytest.raises(ValueError):
+        Calibration(0, np.arange(3), np.arange(4), np.zeros((4, 3, 2)),
+                    (10, 10))
+
+
+def test_initialize_raises_error_for_invalid_rois():
+    with pytest.raises(ValueError):
+        Calibration(0, np.arange(3), np.arange(4), np.zeros((3, 4, 2)),
+                    (10, 10), rois=['test'])
+
+
+def test_from_data_fits_grid(load_fixture_data, calibration):
+    data = load_fixture_data('grid_test_data_minus_50deg.npy')
+    x, y, grid = fit_grid(data, angle=calibration.angle, full_output=True)
+
+    assert calibration.shape == data.shape
+    assert np.allclose(calibration.x, x)
+    assert np.allclose(calibration.y, y)
+    assert np.allclose(calibration.grid, grid)
+
+
+def test_spacing_returns_lattice_spacing():
+    calibration = Calibration(0, np.array([1., 3., 5.]), np.array([2., 5.]),
+                              np.zeros((3, 2, 2)), (10, 10))
+
+    assert calibration.origin == (1, 2)
+    assert calibration.spacing == (2, 3)
+
+
+def test_save_and_load_restore_calibration(tmp_path, calibration):
+    path = str(tmp_path / 'calibration.npz')
+    calibration.rois = [SquareROI((1, 2), 3), CircularROI((4.5, 5), 2),
+                        AnnularROI((3, 3), 1, 3)]
+    calibration.save(path)
+    loaded = Calibration.load(path)
+
+    assert loaded.angle == calibration.angle
+    assert loaded.shape == calibration.shape
+    assert loaded.version == calibration.version
+    assert np.all(loaded.grid == calibration.grid)
+    assert type(loaded.rois[0]) is SquareROI
+    assert loaded.rois[0].size == 3
+    assert isinstance(loaded.rois[1], CircularROI)
+    assert loaded.rois[1].radius == 2
+    assert np.all(loaded.rois[1].center == (4.5, 5))
+    assert isinstance(loaded.rois[2], AnnularROI)
+    assert loaded.rois[2].inner_radius == 1
+
+
+def test_load_warns_for_different_version(tmp_path, calibration):
+    path = str(tmp_path / 'calibration.npz')
+    Calibration(calibration.angle, calibration.x, calibration.y,
+                calibration.grid, calibration.shape,
+                version='0.0.0').save(path)
+
+    with pytest.warns(UserWarning):
+        Calibration.load(path)
+
+
+def test_validate_accepts_matching_data(load_fixture_data, calibration):
+    data = load_fixture_data('grid_test_data_minus_50deg.npy')
+    assert calibration.validate(data)
+
+
+def test_validate_rejects_data_with_different_shape(calibration):
+    assert not calibration.validate(np.zeros((10, 10)))
+
+
+def test_validate_rejects_unrelated_data(calibration):
+    data = np.random.rand(*calibration.shape)
+    assert not calibration.validate(data)
@@ -24,3 +24,12 @@ def matplotlib_figure():
     yield
 
     plt.close()
+
+
+@pytest.fixture
+def result_cache():
+    from gridfit.cache import enable_cache, disable_cache
+
+    yield enable_cache(maxsize=4)
+
+    disable_cache()
@@ -1,3 +1,4 @@
+import pytest
 import numpy as np
 
 from gridfit.drt import discrete_radon_transform
@@ -56,3 +57,17 @@ def test_discrete_radon_transform_returns_expected_result(load_fixture_data):  #
     expected_radon_data = load_fixture_data('grid_test_data_drt.npy')
 
     assert np.allclose(radon_data, expected_radon_data)
+
+
+def test_discrete_radon_transform_accepts_float32_dtype(load_fixture_data):  # noqa: E501
+    data = load_fixture_data('grid_test_data.npy')
+    _, radon_data = discrete_radon_transform(data, dtype=np.float32)
+    expected_radon_data = load_fixture_data('grid_test_data_drt.npy')
+
+    assert radon_data.dtype == np.float64
+    assert np.allclose(radon_data, expected_radon_data, rtol=1e-4)
+
+
+def test_discrete_radon_transform_raises_value_error_for_invalid_dtype():
+    with pytest.raises(ValueError):
+        discrete_radon_transform(np.zeros((10, 10)), dtype=int)
@@ -1,4 +1,5 @@
 from operator import inv
+import warnings
 import pytest
 import numpy as np
 
@@ -61,3 +62,51 @@ def test_find_dominant_angle__warns_if_passed_data_is_not_float(load_fixture_dat
     data = load_fixture_data('grid_test_data_minus_50deg.npy').astype(int)
     with pytest.warns(UserWarning):
         find_dominant_angle(data)
+
+
+def test_find_dominant_angle_does_not_warn_for_float_data_of_other_precision(
+        load_fixture_data):
+    data = load_fixture_data('grid_test_data.npy')
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        find_dominant_angle(data, (-90, 0), dtype=np.float32)
+
+
+def test_find_dominant_angle_accepts_float32_dtype(load_fixture_data):
+    data = load_fixture_data('grid_test_data.npy').astype(np.float32)
+    theta = find_dominant_angle(data, (-90, 0), dtype=np.float32)
+
+    assert theta == pytest.approx(-50.6, abs=1e-1)
+
+
+def test_find_dominant_angle_raises_value_error_for_invalid_dtype():
+    with pytest.raises(ValueError):
+        find_dominant_angle(np.zeros((10, 10)), dtype=int)
+
+
+def test_find_dominant_angle_accepts_crop_flag(load_fixture_data):
+    data = np.ones((300, 400))
+    data[100:188, 200:308] = load_fixture_data('grid_test_data.npy')
+    theta = find_dominant_angle(data, (-90, 0), crop=True)
+
+    assert theta == pytest.approx(-50.6, abs=1)
+
+
+def test_find_dominant_angle_returns_full_output(load_fixture_data):
+    data = load_fixture_data('grid_test_data.npy')
+    theta, rotations = find_dominant_angle(data, (-90, 0), full_output=True)
+
+    assert theta == pytest.approx(-50.6, abs=1e-1)
+    assert rotations > 180
+
+
+def test_find_dominant_angle_accepts_adaptive_flag(load_fixture_data):
+    data = load_fixture_data('grid_test_data.npy')
+    theta_1, rotations = find_dominant_angle(
+        data, (-90, 0), adaptive=True, full_output=True)
+    theta_2 = find_dominant_angle(data, (0, 90), adaptive=True)
+
+    assert theta_1 == pytest.approx(-50.6, abs=2e-1)
+    assert theta_2 == pytest.approx(41, abs=1e-1)
+    assert rotations < 180
@@ -1,3 +1,4 @@
+import warnings
 import pytest
 import numpy as np
 
@@ -52,4 +53,40 @@ def test_fit_grid_raises_value_error_for_invalid_angle_type():
 def test_fit_grid_warns_if_passed_data_is_not_float(load_fixture_data):
     data = load_fixture_data('grid_test_data_minus_50deg.npy').astype(int)
     with pytest.warns(UserWarning):
-        fit_grid(data)
\ No newline at end of file
+        fit_grid(data)
+
+
+def test_fit_grid_does_not_warn_for_float_data_of_other_precision(
+        load_fixture_data):
+    data = load_fixture_data('grid_test_data_minus_50deg.npy')
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        fit_grid(data.astype(np.float32), angle=-50)
+
+
+def test_fit_grid_accepts_float32_dtype(load_fixture_data):
+    data = load_fixture_data('grid_test_data_minus_50deg.npy')
+    grid = fit_grid(data, angle=-50)
+    grid_float32 = fit_grid(data.astype(np.float32), angle=-50,
+                            dtype=np.float32)
+
+    assert np.allclose(grid, grid_float32, atol=1e-2)
+
+
+def test_fit_grid_raises_value_error_for_invalid_dtype():
+    with pytest.raises(ValueError):
+        fit_grid(np.zeros((10, 10)), dtype=int)
+
+
+def test_fit_grid_accepts_crop_flag(load_fixture_data):
+    data = load_fixture_data('grid_test_data.npy')
+    data_large = np.ones((300, 400))
+    data_large[100:188, 200:308] = data
+
+    x, y, grid = fit_grid(data, angle=41, full_output=True)
+    x_large, y_large, grid_large = fit_grid(
+        data_large, angle=41, full_output=True, crop=True)
+
+    assert grid_large.shape == grid.shape
+    assert np.allclose(grid_large, grid + (100, 200), atol=0.1)
@@ -0,0 +1,69 @@
+import pytest
+import numpy as np
+
+from gridfit.roi import AnnularROI, CircularROI, ROIArray, ROI_KIND_ANNULAR
+from gridfit.roi.annular_roi import annular_mask, annular_weights
+
+
+def test_initialize_sets_radii():
+    roi = AnnularROI((10, 10), 2, 4)
+
+    assert roi.inner_radius == 2
+    assert roi.radius == 4
+    assert roi.shape == (9, 9)
+
+
+def test_initialize_raises_error_for_invalid_inner_radius():
+    with pytest.raises(ValueError):
+        AnnularROI((10, 10), 4, 4)
+
+    with pytest.raises(ValueError):
+        AnnularROI((10, 10), -1, 4)
+
+
+def test_mask_excludes_inner_circle():
+    roi = AnnularROI((10, 10), 2, 4)
+    expected_mask = CircularROI((10, 10), 4).mask & \
+        ~np.pad(CircularROI((10, 10), 2).mask, 2)
+
+    assert np.array_equal(roi.mask, expected_mask)
+    assert not roi.mask.flags.writeable
+
+
+def test_apply_returns_masked_array_with_annular_mask():
+    roi = AnnularROI((10, 10), 1, 3)
+    data = np.random.rand(20, 20)
+
+    assert np.array_equal(roi.apply(data).mask, ~roi.mask)
+
+
+def test_annular_mask_returns_cached_mask():
+    assert annular_mask(9, 2, 4) is annular_mask(9, 2, 4)
+
+
+def test_roi_array_supports_annular_rois():
+    rois = [AnnularROI((10, 10), 2, 4), CircularROI((5, 5), 4)]
+    roi_array = ROIArray.from_rois(rois)
+
+    assert roi_array.kinds[0] == ROI_KIND_ANNULAR
+    assert isinstance(roi_array[0], AnnularROI)
+    assert roi_array[0].inner_radius == 2
+    assert np.array_equal(roi_array.masks(), [roi.mask for roi in rois])
+
+
+def test_plot_returns_patch(matplotlib_figure):
+    from matplotlib import patches
+    import matplotlib.pyplot as plt
+
+    patch = AnnularROI((10, 10), 2, 4).plot()
+
+    assert isinstance(patch, patches.Circle)
+    assert len(plt.gca().patches) == 2
+
+
+def test_annular_weights_cover_area_of_annulus():
+    weights = annular_weights(11, 2, 5, 0.25, 0.125)
+
+    assert np.all((weights >= 0) & (weights <= 1))
+    assert np.isclose(weights.sum(), np.pi * (5**2 - 2**2), rtol=1e-2)
+    assert np.allclose(AnnularROI((4.25, 5.125), 2, 5).weights, weights)
@@ -1,6 +1,8 @@
+import pytest
 import numpy as np
 
 from gridfit.roi import CircularROI
+from gridfit.roi.circular_roi import circular_mask, circular_weights
 
 
 def test_initialize_sets_center():
@@ -21,6 +23,11 @@ def test_initialize_sets_rounded_radius():
     assert roi.radius == 4
 
 
+def test_initialize_sets_size_of_rounded_radius():
+    roi = CircularROI((1, 2), 2.4)
+    assert roi.size == 5
+
+
 def test_mask_returns_mask_of_correct_shape():
     roi = CircularROI((10, 20), 6)
 
@@ -78,3 +85,54 @@ def test_plot_accepts_ax(matplotlib_figure):
 def test_plot_accepts_show_center_flag(matplotlib_figure):
     roi = CircularROI((1, 1), 3)
     roi.plot(show_center=True)
+
+
+def test_mask_is_read_only():
+    roi = CircularROI((10, 20), 6)
+
+    with pytest.raises(ValueError):
+        roi.mask[0, 0] = True
+
+
+def test_mask_is_shared_between_rois_with_same_radius():
+    assert CircularROI((10, 20), 6).mask is CircularROI((5, 8), 6).mask
+    assert CircularROI((10, 20), 6).mask is not CircularROI((10, 20), 5).mask
+
+
+def test_apply_returns_writeable_masked_array():
+    roi = CircularROI((4, 4), 2)
+    data = np.arange(100.).reshape((10, 10))
+    data_roi = roi.apply(data)
+    data_roi[2, 2] = -1
+
+    assert data[4, 4] == -1
+    assert not roi.mask[0, 0]
+
+
+def test_circular_mask_returns_inverted_mask():
+    assert np.all(circular_mask(5, 2, invert=True) == ~circular_mask(5, 2))
+
+
+@pytest.mark.parametrize('offset', [(0, 0), (0.25, -0.5), (-0.375, 0.125)])
+def test_circular_weights_cover_area_of_disk(offset):
+    weights = circular_weights(11, 5, *offset)
+
+    assert weights.shape == (11, 11)
+    assert np.all((weights >= 0) & (weights <= 1))
+    assert np.isclose(weights.sum(), np.pi * 5**2, rtol=1e-2)
+
+
+def test_circular_weights_are_centered_on_offset():
+    weights = circular_weights(7, 3, 0.25, -0.5)
+    yy, xx = np.mgrid[-3:4, -3:4]
+
+    assert np.isclose((weights * yy).sum() / weights.sum(), 0.25, atol=0.01)
+    assert np.isclose((weights * xx).sum() / weights.sum(), -0.5, atol=0.01)
+
+
+def test_weights_are_shared_between_rois_with_same_offset():
+    roi = CircularROI((4.31, 5.5), 2)
+
+    assert np.allclose(roi.offset, (0.3125, -0.5))
+    assert roi.weights is CircularROI((2.32, 3.5), 2).weights
+    assert not roi.weights.flags.writeable
@@ -0,0 +1,80 @@
+import pickle
+
+import pytest
+import numpy as np
+
+from gridfit.roi import CircularROI, ROIAccumulator, ROIDataset, SquareROI
+
+
+@pytest.fixture
+def rois():
+    return [CircularROI((4, 4), 2), SquareROI((12, 12), 5)]
+
+
+@pytest.fixture
+def frames():
+    return np.random.rand(10, 20, 20) * 100
+
+
+def test_initialize_raises_error_for_invalid_statistic(rois):
+    with pytest.raises(ValueError):
+        ROIAccumulator(rois, 'centroid')
+
+
+def test_statistics_return_nan_without_frames(rois):
+    accumulator = ROIAccumulator(rois)
+
+    assert accumulator.count == 0
+
+    for name in ('mean', 'var', 'std', 'min', 'max'):
+        assert np.all(np.isnan(getattr(accumulator, name)()))
+
+
+@pytest.mark.parametrize('statistic', ['sum', 'mean', 'max'])
+def test_update_accumulates_statistic_of_each_frame(rois, frames, statistic):
+    accumulator = ROIAccumulator(rois, statistic)
+
+    for frame in frames[:3]:
+        accumulator.update(frame)
+
+    accumulator.update(frames[3:])
+    values = getattr(ROIDataset(frames, rois), statistic)()
+
+    assert accumulator.count == 10
+    assert np.allclose(accumulator.mean(), values.mean(axis=0))
+    assert np.allclose(accumulator.var(), values.var(axis=0))
+    assert np.allclose(accumulator.std(ddof=1), values.std(axis=0, ddof=1))
+    assert np.allclose(accumulator.min(), values.min(axis=0))
+    assert np.allclose(accumulator.max(), values.max(axis=0))
+
+
+def test_merge_combines_statistics_of_accumulators(rois, frames):
+    accumulator = ROIAccumulator(rois, method='label')
+    other = ROIAccumulator(rois)
+    accumulator.update(frames[:4])
+    other.update(frames[4:])
+
+    # e.g. an accumulator returned from a worker process
+    accumulator.merge(pickle.loads(pickle.dumps(other)))
+    expected_accumulator = ROIAccumulator(rois)
+    expected_accumulator.update(frames)
+
+    assert accumulator.count == 10
+
+    for name in ('mean', 'var', 'min', 'max'):
+        assert np.allclose(getattr(accumulator, name)(),
+                           getattr(expected_accumulator, name)())
+
+
+def test_merge_raises_error_for_different_statistic(rois):
+    with pytest.raises(ValueError):
+        ROIAccumulator(rois).merge(ROIAccumulator(rois, 'mean'))
+
+
+def test_reset_clears_statistics(rois, frames):
+    accumulator = ROIAccumulator(rois)
+    accumulator.update(frames)
+    accumulator.reset()
+
+    assert accumulator.count == 0
+    assert np.all(np.isnan(accumulator.mean()))
@@ -0,0 +1,186 @@
+import pytest
+import numpy as np
+
+from gridfit.roi import (ROI_KIND_CIRCULAR, ROI_KIND_SQUARE, CircularROI,
+                         ROIArray, ROIDataset, SquareROI)
+
+
+@pytest.fixture
+def rois():
+    return [CircularROI((3, 4), 2), CircularROI((5.6, 5.2), 1),
+            SquareROI((12, 12), 4), SquareROI((10.4, 14.7), 5)]
+
+
+def test_initialize_broadcasts_sizes_and_kinds():
+    roi_array = ROIArray(np.zeros((3, 2)), 2, ROI_KIND_CIRCULAR)
+
+    assert np.all(roi_array.sizes == 2)
+    assert np.all(roi_array.kinds == ROI_KIND_CIRCULAR)
+
+
+def test_initialize_raises_error_for_invalid_centers():
+    with pytest.raises(ValueError):
+        ROIArray(np.zeros((3, 3)), 2)
+
+    with pytest.raises(ValueError):
+        ROIArray(np.zeros((0, 2)), 2)
+
+
+def test_initialize_raises_error_for_invalid_sizes():
+    with pytest.raises(ValueError):
+        ROIArray(np.zeros((3, 2)), (1, 2))
+
+    with pytest.raises(ValueError):
+        ROIArray(np.zeros((3, 2)), 0)
+
+
+def test_initialize_raises_error_for_invalid_kinds():
+    with pytest.raises(ValueError):
+        ROIArray(np.zeros((3, 2)), 2, 3)
+
+
+def test_arrays_are_read_only():
+    roi_array = ROIArray(np.zeros((3, 2)), 2)
+
+    with pytest.raises(ValueError):
+        roi_array.centers[0] = 1
+
+
+def test_from_rois_returns_same_rois(rois):
+    roi_array = ROIArray.from_rois(rois)
+
+    assert len(roi_array) == len(rois)
+    assert np.all(roi_array.kinds == (ROI_KIND_CIRCULAR, ROI_KIND_CIRCULAR,
+                                      ROI_KIND_SQUARE, ROI_KIND_SQUARE))
+
+    for roi, expected_roi in zip(roi_array, rois):
+        assert type(roi) is type(expected_roi)
+        assert np.array_equal(roi.center, expected_roi.center)
+        assert roi.size == expected_roi.size
+
+
+@pytest.mark.parametrize('radius', [2.4, 2.6])
+def test_from_rois_uses_rounded_radius_of_circular_rois(radius):
+    rois = [CircularROI((10.2, 9.7), radius), CircularROI((20, 20), radius)]
+    roi_array = ROIArray.from_rois(rois)
+    data = np.random.rand(30, 30)
+
+    assert np.all(roi_array.sizes_rounded == rois[0].size)
+    assert np.all(ROIArray(roi_array.centers, radius,
+                           ROI_KIND_CIRCULAR).sizes_rounded == rois[0].size)
+    assert np.allclose(ROIDataset(data, roi_array).sum(),
+                       ROIDataset(data, rois).sum())
+
+
+@pytest.mark.parametrize('radius', [2.4, 5.3, 5.5])
+def test_circular_rois_with_fractional_radius_match_circular_roi(radius):
+    centers = [(20, 20), (40.3, 39.8)]
+    roi_array = ROIArray(centers, radius, ROI_KIND_CIRCULAR)
+    rois = [CircularROI(center, radius) for center in centers]
+    data = np.random.rand(60, 60)
+
+    masks = roi_array.masks()
+    assert masks.shape == (2,) + rois[0].shape
+    assert np.array_equal(masks[0], rois[0].mask)
+    assert np.array_equal(roi_array.roi_masks()[1], rois[1].mask)
+    assert np.array_equal(ROIDataset(data, roi_array).to_array(),
+                          ROIDataset(data, rois).to_array())
+    assert np.allclose(ROIDataset(data, roi_array).sum(),
+                       ROIDataset(data, rois).sum())
+
+
+def test_from_rois_raises_error_for_invalid_rois():
+    with pytest.raises(ValueError):
+        ROIArray.from_rois([])
+
+    with pytest.raises(ValueError):
+        ROIArray.from_rois(['test'])
+
+
+def test_from_grid_creates_roi_at_each_grid_point():
+    grid = np.random.rand(3, 4, 2) * 100
+    roi_array = ROIArray.from_grid(grid, 3, ROI_KIND_CIRCULAR)
+
+    assert len(roi_array) == 12
+    assert np.array_equal(roi_array.centers, grid.reshape(-1, 2))
+    assert isinstance(roi_array[5], CircularROI)
+
+
+def test_from_grid_raises_error_for_invalid_grid():
+    with pytest.raises(ValueError):
+        ROIArray.from_grid(np.zeros((3, 4, 3)), 3)
+
+
+def test_getitem_returns_roi_array_for_slice(rois):
+    roi_array = ROIArray.from_rois(rois)[1:3]
+
+    assert isinstance(roi_array, ROIArray)
+    assert np.array_equal(roi_array.centers, ((5.6, 5.2), (12, 12)))
+
+
+def test_boundaries_returns_boundaries_of_each_roi(rois):
+    roi_array = ROIArray.from_rois(rois)
+
+    assert np.array_equal(roi_array.boundaries,
+                          [roi.boundaries for roi in rois])
+    assert np.array_equal(roi_array.shapes, [roi.shape for roi in rois])
+
+
+def test_inside_returns_whether_rois_are_inside_of_data(rois):
+    roi_array = ROIArray.from_rois(rois)
+
+    assert np.array_equal(roi_array.inside((15, 17)),
+                          (True, True, True, False))
+
+
+def test_validate_raises_error_if_roi_outside_data(rois):
+    roi_array = ROIArray.from_rois(rois)
+    roi_array.validate((20, 20))
+
+    with pytest.raises(ValueError):
+        roi_array.validate((15, 17))
+
+
+def test_masks_returns_mask_of_each_roi():
+    rois = [CircularROI((3, 4), 2), SquareROI((5, 5), 5)]
+    masks = ROIArray.from_rois(rois).masks()
+
+    assert np.array_equal(masks[0], rois[0].mask)
+    assert np.all(masks[1])
+
+
+@pytest.mark.parametrize('method', ['apply', 'label', 'sparse'])
+def test_roi_dataset_accepts_roi_array(method):
+    data = np.random.rand(20, 20)
+    rois = [CircularROI((3, 4), 2), CircularROI((5.6, 5.2), 2),
+            SquareROI((12, 12), 5)]
+    roi_array = ROIArray.from_rois(rois)
+
+    for name in ('sum', 'mean', 'centroid'):
+        result = getattr(ROIDataset(data, roi_array, method=method), name)()
+        expected_result = getattr(ROIDataset(data, rois), name)()
+
+        assert np.allclose(result, expected_result)
+
+
+def test_weights_returns_weights_of_each_roi():
+    rois = [CircularROI((4.3, 5.5), 2), CircularROI((8, 9.1), 2),
+            SquareROI((12.2, 12), 5)]
+    weights = ROIArray.from_rois(rois).weights()
+
+    assert weights.shape == (3, 5, 5)
+    assert np.allclose(weights[0], rois[0].weights)
+    assert np.allclose(weights[1], rois[1].weights)
+    assert np.all(weights[2] == 1)
+
+
+def test_weights_returns_none_for_square_rois():
+    assert ROIArray.from_rois([SquareROI((4, 5), 3)]).weights() is None
+
+
+def test_weights_raises_error_for_invalid_rois_or_phases():
+    with pytest.raises(ValueError):
+        ROIArray([(4, 5), (8, 9)], (2, 3), ROI_KIND_CIRCULAR).weights()
+
+    with pytest.raises(ValueError):
+        ROIArray([(4, 5)], 2, ROI_KIND_CIRCULAR).weights(0)
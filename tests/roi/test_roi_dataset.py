@@ -1,7 +1,9 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import pytest
 import numpy as np
 
-from gridfit.roi import ROIDataset, CircularROI, SquareROI
+from gridfit.roi import (ROI_KIND_CIRCULAR, ROIArray, ROIDataset, CircularROI,
+                         SquareROI)
 from gridfit.utils.image_moments import centroid, rms_size
 
 
@@ -185,7 +187,7 @@ def test_centroid_returns_centroid_of_each_roi_data():
     expected_result = np.array(
         [centroid(r.apply(data).filled(0)) for r in rois])
 
-    assert np.all(roi_dataset.centroid() == expected_result)
+    assert np.allclose(roi_dataset.centroid(), expected_result)
 
 
 def test_centroid_returns_centroid_of_each_roi_data_with_absolute_coordinates():  # noqa: E501
@@ -196,7 +198,7 @@ def test_centroid_returns_centroid_of_each_roi_data_with_absolute_coordinates():
     expected_result = np.array(
         [centroid(r.apply(data).filled(0)) + r.boundaries[0] for r in rois])
 
-    assert np.all(roi_dataset.centroid(absolute=True) == expected_result)
+    assert np.allclose(roi_dataset.centroid(absolute=True), expected_result)
 
 
 def test_rms_size_returns_rms_size_of_each_roi_data():
@@ -207,7 +209,7 @@ def test_rms_size_returns_rms_size_of_each_roi_data():
     expected_result = np.array(
         [rms_size(r.apply(data).filled(0)) for r in rois])
 
-    assert np.all(roi_dataset.rms_size() == expected_result)
+    assert np.allclose(roi_dataset.rms_size(), expected_result)
 
 
 def test_plot_accepts_ax(matplotlib_figure):
@@ -235,3 +237,621 @@ def test_plot_accepts_kwargs(matplotlib_figure):
     roi_dataset = ROIDataset(data, rois)
 
     roi_dataset.plot(show_center=True)
+
+
+def test_initialize_converts_data_to_dtype():
+    data = np.arange(100, dtype=float).reshape(10, 10)
+    rois = [SquareROI((3, 4), 3)]
+    roi_dataset = ROIDataset(data, rois, dtype=np.float32)
+
+    assert roi_dataset.data.dtype == np.float32
+
+
+def test_sum_accumulates_float32_data_in_double_precision():
+    data = np.random.rand(100).reshape(10, 10).astype(np.float32)
+    rois = [CircularROI((3, 4), 2), CircularROI((5, 5), 2)]
+    roi_dataset = ROIDataset(data, rois, dtype=np.float32)
+
+    expected_result = np.array(
+        [r.apply(data).sum(dtype=np.float64) for r in rois])
+
+    assert roi_dataset.sum().dtype == np.float64
+    assert np.allclose(roi_dataset.sum(), expected_result)
+
+
+def test_to_array_returns_same_data_as_rois():
+    data = np.random.rand(20, 30)
+    rois = [CircularROI((3.4, 4), 2), SquareROI((15, 20.6), 5),
+            CircularROI((10, 25), 2)]
+    roi_dataset = ROIDataset(data, rois)
+
+    expected_array = np.ma.array([r.apply(data) for r in rois])
+
+    assert np.all(roi_dataset.to_array() == expected_array)
+    assert np.all(roi_dataset.to_array().mask == expected_array.mask)
+
+
+def test_to_array_returns_roi_data_of_new_data_with_same_shape():
+    data = np.random.rand(20, 30)
+    rois = [SquareROI((3, 4), 3), SquareROI((15, 20), 3)]
+    roi_dataset = ROIDataset(data, rois)
+    roi_dataset.to_array()
+
+    roi_dataset.data = data + 1
+
+    assert np.allclose(roi_dataset.to_array(),
+                       [r.apply(data + 1) for r in rois])
+
+
+def test_to_array_raises_error_if_roi_outside_data():
+    data = np.random.rand(20, 30)
+
+    with pytest.raises(ValueError):
+        ROIDataset(data, [SquareROI((1, 4), 5)]).to_array()
+
+    with pytest.raises(ValueError):
+        ROIDataset(data, [SquareROI((4, 29), 5)]).to_array()
+
+
+def test_initialize_raises_error_for_invalid_method():
+    with pytest.raises(ValueError):
+        ROIDataset(np.arange(9).reshape(3, 3), [SquareROI((1, 1), 3)],
+                   method='test')
+
+
+@pytest.mark.parametrize('name', ['sum', 'mean', 'var', 'std', 'min', 'max'])
+def test_label_method_returns_statistic_of_each_roi_data(name):
+    data = np.random.rand(100).reshape(10, 10)
+    rois = [CircularROI((3, 4), 2), CircularROI((5, 5), 2)]
+    roi_dataset = ROIDataset(data, rois, method='label')
+
+    expected_result = getattr(ROIDataset(data, rois), name)()
+
+    assert np.allclose(getattr(roi_dataset, name)(), expected_result)
+
+
+def test_label_map_is_reused_for_data_with_same_shape():
+    data = np.random.rand(100).reshape(10, 10)
+    rois = [CircularROI((3, 4), 2), CircularROI((5, 5), 2)]
+    roi_dataset = ROIDataset(data, rois, method='label')
+    label_map = roi_dataset.label_map
+
+    roi_dataset.data = data + 1
+
+    assert roi_dataset.label_map is label_map
+    assert np.allclose(roi_dataset.sum(),
+                       [r.apply(data + 1).sum() for r in rois])
+
+
+@pytest.mark.parametrize(
+    'name', ['sum', 'mean', 'var', 'std', 'min', 'max', 'centroid',
+             'rms_size'])
+def test_sparse_method_returns_statistic_of_each_roi_data(name):
+    data = np.random.rand(100).reshape(10, 10)
+    rois = [CircularROI((3, 4), 2), CircularROI((5, 5), 2)]
+    roi_dataset = ROIDataset(data, rois, method='sparse')
+
+    expected_result = getattr(ROIDataset(data, rois), name)()
+
+    assert np.allclose(getattr(roi_dataset, name)(), expected_result)
+
+
+def test_initialize_accepts_stack_of_frames():
+    data = np.random.rand(4, 10, 10)
+    rois = [SquareROI((3, 4), 3)]
+    roi_dataset = ROIDataset(data, rois)
+
+    assert roi_dataset.frame_shape == (10, 10)
+
+
+def test_to_array_returns_roi_data_of_each_frame():
+    data = np.random.rand(4, 10, 10)
+    rois = [CircularROI((3, 4), 2), CircularROI((5, 5), 2)]
+    roi_dataset = ROIDataset(data, rois, memory_budget=1)
+
+    expected_array = [ROIDataset(d, rois).to_array() for d in data]
+
+    assert roi_dataset.to_array().shape == (4, 2, 5, 5)
+    assert np.all(roi_dataset.to_array() == np.ma.array(expected_array))
+
+
+@pytest.mark.parametrize('method', ['apply', 'label', 'sparse'])
+@pytest.mark.parametrize(
+    'name', ['sum', 'mean', 'var', 'std', 'min', 'max', 'centroid',
+             'rms_size'])
+def test_statistics_return_statistic_of_each_frame(method, name):
+    data = np.random.rand(5, 10, 10)
+    rois = [CircularROI((3, 4), 2), CircularROI((5, 5), 2)]
+    roi_dataset = ROIDataset(data, rois, method=method, memory_budget=512)
+
+    expected_result = [getattr(ROIDataset(d, rois), name)() for d in data]
+
+    assert np.allclose(getattr(roi_dataset, name)(), expected_result)
+
+
+def test_centroid_returns_absolute_centroid_of_each_frame():
+    data = np.random.rand(3, 10, 10)
+    rois = [CircularROI((3, 4), 2), CircularROI((5, 5), 2)]
+    roi_dataset = ROIDataset(data, rois)
+
+    expected_result = [ROIDataset(d, rois).centroid(absolute=True)
+                       for d in data]
+
+    assert np.allclose(roi_dataset.centroid(absolute=True), expected_result)
+
+
+def test_statistics_accept_memmap(tmp_path):
+    data = np.random.rand(6, 10, 10)
+    path = str(tmp_path / 'data.npy')
+    np.save(path, data)
+
+    rois = [SquareROI((3, 4), 3), SquareROI((5, 5), 3)]
+    roi_dataset = ROIDataset(np.load(path, mmap_mode='r'), rois,
+                             dtype=np.float32, memory_budget=128)
+
+    assert np.allclose(roi_dataset.sum(), ROIDataset(data, rois).sum())
+
+
+def test_initialize_raises_error_for_invalid_memory_budget():
+    for invalid_value in (0, -1, 1.5):
+        with pytest.raises(ValueError):
+            ROIDataset(np.zeros((3, 3)), [SquareROI((1, 1), 3)],
+                       memory_budget=invalid_value)
+
+
+def test_initialize_raises_error_for_integral_method_with_circular_rois():
+    with pytest.raises(ValueError):
+        ROIDataset(np.zeros((10, 10)), [CircularROI((5, 5), 2)],
+                   method='integral')
+
+
+@pytest.mark.parametrize(
+    'name', ['sum', 'mean', 'var', 'std', 'min', 'max', 'centroid'])
+def test_integral_method_returns_statistic_of_each_roi_data(name):
+    data = np.random.rand(4, 20, 20)
+    rois = [SquareROI((3, 4), 5), SquareROI((12, 10), 5)]
+    roi_dataset = ROIDataset(data, rois, method='integral')
+
+    expected_result = getattr(ROIDataset(data, rois), name)()
+
+    assert np.allclose(getattr(roi_dataset, name)(), expected_result)
+
+
+@pytest.mark.parametrize('method', ['apply', 'label', 'sparse'])
+@pytest.mark.parametrize('shape', [(10, 10), (3, 10, 10)])
+def test_stats_returns_statistics_of_each_roi_data(method, shape):
+    data = np.random.rand(*shape)
+    rois = [CircularROI((3, 4), 2), SquareROI((5, 5), 5)]
+    roi_dataset = ROIDataset(data, rois, method=method)
+    names = ['sum', 'mean', 'var', 'std', 'min', 'max', 'centroid',
+             'rms_size']
+
+    for names in (names, ['sum', 'mean', 'std', 'centroid', 'rms_size']):
+        stats = roi_dataset.stats(names)
+
+        assert list(stats) == names
+
+        for name in names:
+            expected_result = getattr(ROIDataset(data, rois), name)()
+            assert np.allclose(stats[name], expected_result)
+
+
+def test_stats_returns_absolute_centroid():
+    data = np.random.rand(10, 10)
+    rois = [CircularROI((3, 4), 2), CircularROI((5, 5), 2)]
+    roi_dataset = ROIDataset(data, rois)
+
+    stats = roi_dataset.stats(['centroid'], absolute=True)
+
+    assert np.allclose(stats['centroid'], roi_dataset.centroid(absolute=True))
+
+
+def test_stats_raises_error_for_invalid_statistic():
+    roi_dataset = ROIDataset(np.zeros((10, 10)), [SquareROI((5, 5), 3)])
+
+    with pytest.raises(ValueError):
+        roi_dataset.stats(['test'])
+
+
+@pytest.mark.parametrize('shape', [(20, 20), (3, 20, 20)])
+def test_to_array_returns_view_of_roi_data_on_lattice(shape):
+    data = np.random.rand(*shape)
+    rois = [SquareROI((y, x), 3) for y in (4, 9, 14) for x in (3, 7)]
+    roi_dataset = ROIDataset(data, rois)
+    view = roi_dataset.to_array(copy=False)
+
+    assert view.shape == shape[:-2] + (3, 2, 3, 3)
+    assert np.shares_memory(view, data)
+    assert not view.flags.writeable
+    assert np.array_equal(
+        view.reshape(shape[:-2] + (6, 3, 3)),
+        ROIDataset(data, rois).to_array())
+
+
+def test_to_array_raises_error_for_view_if_rois_are_not_on_lattice():
+    rois = [SquareROI((4, 4), 3), SquareROI((9, 5), 3)]
+    roi_dataset = ROIDataset(np.zeros((20, 20)), rois)
+
+    with pytest.raises(ValueError):
+        roi_dataset.to_array(copy=False)
+
+
+@pytest.mark.parametrize('roi_class', [CircularROI, SquareROI])
+def test_stats_returns_statistics_of_each_roi_data_on_lattice(roi_class):
+    data = np.random.rand(2, 20, 20)
+    rois = [roi_class((y, x), 3) for y in (4, 9, 14) for x in (3, 9)]
+    names = ['sum', 'mean', 'std', 'centroid', 'rms_size']
+    stats = ROIDataset(data, rois).stats(names)
+
+    for name in names:
+        expected_result = getattr(ROIDataset(data, rois), name)()
+        assert np.allclose(stats[name], expected_result)
+
+
+def test_geometry_is_reused_for_data_with_same_shape():
+    rois = [CircularROI((3, 4), 2), SquareROI((5, 5), 3)]
+    roi_dataset = ROIDataset(np.random.rand(10, 10), rois)
+    geometry = roi_dataset.geometry
+    roi_dataset.data = np.random.rand(10, 10)
+
+    assert roi_dataset.geometry is geometry
+
+    roi_dataset.data = np.random.rand(12, 12)
+
+    assert roi_dataset.geometry is not geometry
+
+
+@pytest.mark.parametrize('method', ['apply', 'label', 'sparse'])
+@pytest.mark.parametrize('rois', [
+    [CircularROI((3, 4), 2), SquareROI((5, 5), 3)],
+    [CircularROI((3, 4), 2), SquareROI((5, 5), 5)]])
+def test_evaluate_returns_statistics_of_new_data(monkeypatch, method, rois):
+    roi_dataset = ROIDataset(np.random.rand(10, 10), rois, method=method)
+    roi_dataset.stats(['sum', 'mean', 'max'])
+    data = np.random.rand(10, 10)
+
+    # the geometry is reused, the ROIs are not validated again
+    def apply(*args):
+        raise AssertionError
+
+    monkeypatch.setattr(SquareROI, 'apply', apply)
+    monkeypatch.setattr(CircularROI, 'apply', apply)
+    stats = roi_dataset.evaluate(data, ['sum', 'mean', 'max'])
+    monkeypatch.undo()
+
+    assert np.array_equal(roi_dataset.data, data)
+
+    for name, result in stats.items():
+        expected_result = getattr(ROIDataset(data, rois), name)()
+        assert np.allclose(result, expected_result)
+
+
+@pytest.mark.parametrize('shape', [(20, 20), (3, 20, 20)])
+@pytest.mark.parametrize('executor_class', [ThreadPoolExecutor,
+                                            ProcessPoolExecutor])
+def test_apply_returns_same_result_with_executor(shape, executor_class):
+    data = np.random.rand(*shape)
+    rois = [CircularROI((y, x), 2) for y in (4, 9, 14) for x in (3, 7, 12)]
+    roi_dataset = ROIDataset(data, rois)
+    expected_result = roi_dataset.apply(np.median)
+
+    with executor_class(max_workers=2) as executor:
+        for chunksize in (None, 1, 4):
+            result = roi_dataset.apply(np.median, executor=executor,
+                                       chunksize=chunksize)
+            assert np.array_equal(result, expected_result)
+
+
+@pytest.mark.parametrize('shape', [(20, 20), (3, 20, 20)])
+def test_apply_calls_vectorized_function_once(shape):
+    data = np.random.rand(*shape)
+    rois = [CircularROI((4, 4), 2), SquareROI((12, 12), 5)]
+    roi_dataset = ROIDataset(data, rois)
+    calls = []
+
+    def func(roi_data, axis):
+        calls.append(roi_data.shape)
+        return np.sum(roi_data, axis=axis)
+
+    result = roi_dataset.apply(func, vectorized=True)
+
+    assert len(calls) == 1
+    assert np.allclose(result, roi_dataset.apply(np.sum))
+
+
+def test_apply_raises_error_for_vectorized_function_and_rois_of_different_shape():  # noqa: E501
+    rois = [CircularROI((4, 4), 2), SquareROI((12, 12), 3)]
+    roi_dataset = ROIDataset(np.random.rand(20, 20), rois)
+
+    with pytest.raises(ValueError):
+        roi_dataset.apply(np.sum, vectorized=True)
+
+
+def test_apply_raises_error_for_invalid_chunksize():
+    roi_dataset = ROIDataset(np.random.rand(20, 20), [SquareROI((5, 5), 3)])
+
+    with pytest.raises(ValueError):
+        roi_dataset.apply(np.sum, chunksize=0)
+
+
+def test_to_array_returns_plain_roi_data_if_not_masked():
+    data = np.arange(100).reshape(10, 10)
+    rois = [CircularROI((3, 4), 2), SquareROI((5, 5), 5)]
+    roi_array = ROIDataset(data, rois).to_array(masked=False)
+
+    assert not isinstance(roi_array, np.ma.MaskedArray)
+    assert np.array_equal(roi_array, [r.apply(data).data for r in rois])
+
+
+def test_to_array_returns_masked_roi_data_of_rois_with_different_shape():
+    data = np.arange(100).reshape(10, 10)
+    rois = [CircularROI((3, 4), 2), SquareROI((5, 5), 3)]
+    roi_array = ROIDataset(data, rois).to_array()
+
+    assert isinstance(roi_array[0], np.ma.MaskedArray)
+    assert np.array_equal(roi_array[0].mask, rois[0].apply(data).mask)
+    assert np.array_equal(roi_array[1], rois[1].apply(data))
+
+
+@pytest.mark.parametrize('name', ['sum', 'mean', 'var', 'std', 'min', 'max'])
+@pytest.mark.parametrize('shape', [(20, 20), (3, 20, 20)])
+@pytest.mark.parametrize('size', [3, 5])
+def test_statistics_ignore_pixels_outside_of_circular_rois(name, shape, size):
+    data = np.random.rand(*shape)
+    rois = [CircularROI((4, 4), 2), SquareROI((12, 12), size)]
+    roi_dataset = ROIDataset(data, rois)
+    frames = data if data.ndim == 3 else data[None]
+
+    expected_result = np.array([
+        [getattr(np, name)(r.apply(frame).compressed()
+                           if isinstance(r, CircularROI) else r.apply(frame))
+         for r in rois] for frame in frames])
+
+    assert np.allclose(getattr(roi_dataset, name)(),
+                       expected_result.reshape(shape[:-2] + (2,)))
+
+
+def _radial_profile(data, roi, bin_width):
+    (y_0, x_0), (y_1, x_1) = roi.boundaries
+    yy, xx = np.mgrid[y_0:y_1, x_0:x_1]
+    radii = np.hypot(yy - roi.center[0], xx - roi.center[1])
+    roi_data = data[y_0:y_1, x_0:x_1]
+
+    if isinstance(roi, CircularROI):
+        radii, roi_data = radii[roi.mask], roi_data[roi.mask]
+
+    edges = np.arange(0, radii.max() + 2 * bin_width, bin_width)
+    sums, _ = np.histogram(radii, edges, weights=roi_data)
+    counts, _ = np.histogram(radii, edges)
+
+    with np.errstate(invalid='ignore'):
+        return sums / counts
+
+
+@pytest.mark.parametrize('rois', [
+    [CircularROI((5.3, 6.6), 3), CircularROI((12, 10.2), 3)],
+    [CircularROI((5.3, 6.6), 3), SquareROI((12, 10.2), 4)]])
+@pytest.mark.parametrize('bin_width', [0.5, 1, 1.5])
+def test_radial_profile_returns_profile_of_each_roi(rois, bin_width):
+    data = np.random.rand(20, 20)
+    profile = ROIDataset(data, rois).radial_profile(bin_width)
+
+    assert profile.shape[0] == 2
+
+    for roi, roi_profile in zip(rois, profile):
+        expected = np.full(len(roi_profile) + 2, np.nan)
+        roi_expected = _radial_profile(data, roi, bin_width)
+        expected[:len(roi_expected)] = roi_expected
+
+        assert np.allclose(roi_profile, expected[:len(roi_profile)],
+                           equal_nan=True)
+        assert np.all(np.isnan(expected[len(roi_profile):]))
+
+
+def test_radial_profile_returns_profile_of_each_frame():
+    data = np.random.rand(3, 20, 20)
+    rois = [CircularROI((5.3, 6.6), 3), CircularROI((12, 10.2), 3)]
+    profile = ROIDataset(data, rois, memory_budget=1000).radial_profile()
+
+    assert profile.shape[:2] == (3, 2)
+
+    for frame, frame_profile in zip(data, profile):
+        assert np.allclose(frame_profile,
+                           ROIDataset(frame, rois).radial_profile(),
+                           equal_nan=True)
+
+
+def test_radial_profile_raises_error_for_invalid_bin_width():
+    with pytest.raises(ValueError):
+        ROIDataset(np.ones((5, 5)), [SquareROI((2, 2), 3)]).radial_profile(0)
+
+
+def test_statistics_of_subpixel_rois_are_weighted():
+    data = np.random.rand(2, 20, 20)
+    rois = [CircularROI((5.3, 6.6), 3), CircularROI((12, 10.2), 3)]
+    stats = ROIDataset(data, rois, subpixel=True).stats(
+        ['sum', 'mean', 'min'])
+
+    for i, roi in enumerate(rois):
+        (y_0, x_0), (y_1, x_1) = roi.boundaries
+        roi_data = data[:, y_0:y_1, x_0:x_1]
+        weighted_sum = (roi_data * roi.weights).sum(axis=(1, 2))
+
+        assert np.allclose(stats['sum'][:, i], weighted_sum)
+        assert np.allclose(stats['mean'][:, i],
+                           weighted_sum / roi.weights.sum())
+        assert np.allclose(stats['min'][:, i],
+                           roi_data[:, roi.weights > 0].min(axis=1))
+
+
+@pytest.mark.parametrize('radius', [2.4, 5.5])
+def test_subpixel_rois_with_fractional_radius_match_circular_roi(radius):
+    data = np.random.rand(2, 30, 30)
+    centers = [(10.3, 9.6), (18, 20.2)]
+    roi_array = ROIArray(centers, radius, ROI_KIND_CIRCULAR)
+    rois = [CircularROI(center, radius) for center in centers]
+
+    assert np.allclose(roi_array.weights(), [roi.weights for roi in rois])
+    assert np.allclose(ROIDataset(data, roi_array, subpixel=True).sum(),
+                       ROIDataset(data, rois, subpixel=True).sum())
+
+
+def test_centroid_of_subpixel_rois_is_unbiased():
+    yy, xx = np.mgrid[:20, :20]
+    centers = [(5.4, 6.5), (12.3, 10.8)]
+    data = sum(np.exp(-((yy - y)**2 + (xx - x)**2) / 2) for y, x in centers)
+    rois = [CircularROI(center, 3) for center in centers]
+
+    centroid = ROIDataset(data, rois, subpixel=True).centroid(absolute=True)
+    centroid_rounded = ROIDataset(data, rois).centroid(absolute=True)
+
+    assert np.allclose(centroid, centers, atol=0.01)
+    assert np.all(np.abs(centroid_rounded - centers) > 0.01)
+
+
+@pytest.mark.parametrize('kwargs', [
+    dict(method='sparse'),
+    dict(rois=[CircularROI((5, 5), 2), CircularROI((12, 12), 3)])])
+def test_initialize_raises_error_for_invalid_subpixel_rois(kwargs):
+    kwargs = dict(dict(rois=[CircularROI((5, 5), 2)]), **kwargs)
+
+    with pytest.raises(ValueError):
+        ROIDataset(np.ones((20, 20)), subpixel=True, **kwargs)
+
+
+@pytest.mark.parametrize('shape', [(20, 20), (3, 20, 20)])
+@pytest.mark.parametrize('roi_class', [SquareROI, CircularROI])
+def test_statistics_of_clipped_rois_ignore_pixels_outside_of_data(
+        shape, roi_class):
+    data = np.random.rand(*shape)
+    rois = [roi_class((0.2, 18.8), 3), roi_class((10, 10), 3),
+            roi_class((19, 0), 3)]
+    dataset = ROIDataset(data, rois, clip=True)
+    stats = dataset.stats(['sum', 'mean', 'max', 'centroid'], absolute=True)
+
+    # the same statistics on data padded with zeros and NaN
+    padded = np.pad(data, [(0, 0)] * (data.ndim - 2) + [(3, 3), (3, 3)])
+    shifted = [roi_class(tuple((roi.center + 3).tolist()), 3) for roi in rois]
+    expected = ROIDataset(padded, shifted).stats(['sum', 'centroid'],
+                                                 absolute=True)
+    nan_padded = np.pad(data, [(0, 0)] * (data.ndim - 2) + [(3, 3), (3, 3)],
+                        constant_values=np.nan)
+    roi_data = ROIDataset(nan_padded, shifted).to_array()
+    roi_data = np.ma.masked_invalid(roi_data)
+
+    assert np.allclose(stats['sum'], expected['sum'])
+    assert np.allclose(stats['centroid'], expected['centroid'] - 3)
+    assert np.allclose(stats['mean'], roi_data.mean(axis=(-2, -1)))
+    assert np.allclose(stats['max'], roi_data.max(axis=(-2, -1)))
+    assert np.allclose(dataset.coverage[1], 1)
+    assert np.all(dataset.coverage[[0, 2]] < 1)
+
+
+def test_coverage_of_clipped_subpixel_rois_is_fraction_of_weights():
+    rois = [CircularROI((1.3, 10), 3), CircularROI((10, 10.4), 3)]
+    dataset = ROIDataset(np.ones((20, 20)), rois, subpixel=True, clip=True)
+
+    weights = rois[0].weights
+    assert np.allclose(dataset.coverage,
+                       [weights[2:].sum() / weights.sum(), 1])
+    assert np.allclose(dataset.stats(['sum'])['sum'],
+                       [weights[2:].sum(), rois[1].weights.sum()])
+
+
+def test_initialize_raises_error_for_rois_outside_of_data_if_not_clipped():
+    with pytest.raises(ValueError):
+        ROIDataset(np.ones((20, 20)), [SquareROI((1, 10), 5)]).stats()
+
+    with pytest.raises(ValueError):
+        ROIDataset(np.ones((20, 20)), [SquareROI((1, 10), 5)], clip=True,
+                   method='label')
+
+
+@pytest.mark.parametrize('name, expected', [
+    ('min', [2, 170, 275]), ('max', [82, 250, 355])])
+def test_min_and_max_of_circular_rois_ignore_nan_outside_of_masks(
+        name, expected):
+    data = np.arange(400, dtype=np.float64).reshape(20, 20)
+    data[0, 0] = np.nan
+    rois = [CircularROI((2, 2), 2), CircularROI((10, 10), 2),
+            CircularROI((15, 15), 2)]
+    dataset = ROIDataset(data, rois)
+
+    assert np.array_equal(getattr(dataset, name)(), expected)
+    assert np.array_equal(dataset.stats([name])[name], expected)
+
+
+def test_min_and_max_of_circular_rois_with_integer_data():
+    data = np.arange(400, dtype=np.uint16).reshape(20, 20)
+    rois = [CircularROI((2, 2), 2), CircularROI((10, 10), 2)]
+    dataset = ROIDataset(data, rois)
+
+    assert np.array_equal(dataset.min(), [2, 170])
+    assert np.array_equal(dataset.max(), [82, 250])
+
+
+@pytest.mark.parametrize('shape', [(20, 20), (3, 20, 20)])
+def test_moments_returns_raw_moments_of_each_roi(shape):
+    data = np.random.rand(*shape)
+    rois = [CircularROI((5, 6), 2), CircularROI((12, 10), 2)]
+    dataset = ROIDataset(data, rois)
+    raw = dataset.moments(extrema=True)
+
+    assert raw['m00'].shape == shape[:-2] + (2,)
+    assert np.allclose(raw['m00'], dataset.sum())
+    assert np.array_equal(raw['count'], np.full(shape[:-2] + (2,), 13))
+    assert np.allclose(raw['max'], dataset.max())
+
+    stats = dataset.derive_statistics(raw, ['mean', 'centroid'])
+    assert np.allclose(stats['mean'], dataset.mean())
+    assert np.allclose(stats['centroid'], dataset.centroid())
+
+
+@pytest.mark.parametrize('centers', [
+    [(5, 5), (5, 10), (10, 5), (10, 10)],
+    [(5, 5), (5, 10), (10, 5), (12, 10)]])
+def test_moments_returns_moments_of_stacked_weights(centers):
+    data = np.random.rand(2, 20, 20)
+    rois = [SquareROI(center, 5) for center in centers]
+    weights = np.random.rand(3, 4, 5, 5)
+    raw = ROIDataset(data, rois).moments(weights)
+
+    roi_data = ROIDataset(data, rois).to_array()
+    assert raw['m00'].shape == (2, 3, 4)
+    assert np.allclose(raw['m00'],
+                       np.einsum('fnij,knij->fkn', roi_data, weights))
+    assert np.allclose(raw['count'], weights.sum(axis=(-2, -1)))
+
+
+@pytest.mark.parametrize('dtype', [np.float64, np.uint16])
+def test_moments_of_shared_weights_equal_moments_of_broadcast_weights(dtype):
+    data = np.random.randint(0, 1000, (2, 20, 20)).astype(dtype)
+    rois = [SquareROI(center, 5) for center in [(5, 5), (5, 10), (12, 10)]]
+    weights = np.random.rand(2, 1, 5, 5)
+    dataset = ROIDataset(data, rois)
+    raw = dataset.moments(weights)
+    expected = dataset.moments(np.broadcast_to(weights, (2, 3, 5, 5)))
+
+    for key, value in expected.items():
+        assert raw[key].shape == (2, 2, 3)
+        assert np.allclose(raw[key], value)
+
+
+def test_moments_raises_error_for_invalid_weights_or_rois():
+    data = np.random.rand(20, 20)
+
+    with pytest.raises(ValueError):
+        ROIDataset(data, [SquareROI((5, 5), 5)]).moments(np.ones((4, 4)))
+
+    with pytest.raises(ValueError):
+        ROIDataset(data, [SquareROI((5, 5), 5),
+                          SquareROI((12, 12), 3)]).moments()
+
+
+def test_to_array_returns_contiguous_data_of_each_frame():
+    data = np.random.rand(3, 20, 20)
+    rois = [SquareROI((5, 5), 3), SquareROI((12, 10), 3)]
+    roi_data = ROIDataset(data, rois).to_array(masked=False)
+
+    assert roi_data.flags['C_CONTIGUOUS']
+    assert np.array_equal(roi_data[1, 0], rois[0].apply(data[1]))
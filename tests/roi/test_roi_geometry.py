@@ -0,0 +1,109 @@
+import pytest
+import numpy as np
+
+from gridfit.roi import CircularROI, ROIArray, ROIGeometry, SquareROI
+
+
+@pytest.fixture
+def rois():
+    return [CircularROI((3, 4), 2), SquareROI((12, 12), 4)]
+
+
+def test_initialize_raises_error_if_roi_outside_data(rois):
+    with pytest.raises(ValueError):
+        ROIGeometry(rois, (10, 10))
+
+
+def test_rois_returns_roi_array(rois):
+    geometry = ROIGeometry(rois, (20, 20))
+
+    assert isinstance(geometry.rois, ROIArray)
+    assert len(geometry.rois) == 2
+
+
+def test_gather_returns_none_for_rois_with_different_shape(rois):
+    assert ROIGeometry(rois, (20, 20)).gather is None
+
+
+def test_gather_returns_index_and_masks_of_rois():
+    rois = [CircularROI((3, 4), 2), SquareROI((12, 12), 5)]
+    data = np.random.rand(20, 20)
+    index, masks = ROIGeometry(rois, data.shape).gather
+
+    assert index.shape == (2, 5, 5)
+    assert np.array_equal(data.reshape(-1)[index[1]], rois[1].apply(data))
+    assert np.array_equal(masks[0], rois[0].mask)
+    assert np.all(masks[1])
+
+
+def test_lattice_returns_lattice_of_rois():
+    rois = [SquareROI((y, x), 3) for y in (4, 9, 14) for x in (3, 7)]
+
+    assert ROIGeometry(rois, (20, 20)).lattice == (3, 2, (3, 2), (5, 4))
+
+
+def test_slices_and_masks_return_data_in_each_roi(rois):
+    data = np.random.rand(20, 20)
+    geometry = ROIGeometry(rois, data.shape)
+
+    for roi, roi_slice, mask in zip(rois, geometry.slices, geometry.masks):
+        expected_data = roi.apply(data)
+
+        assert np.array_equal(data[roi_slice], np.asarray(expected_data))
+        assert np.array_equal(~mask, np.ma.getmask(expected_data)) \
+            if mask is not None else not np.ma.isMaskedArray(expected_data)
+
+
+def test_backends_are_reused(rois):
+    geometry = ROIGeometry(rois, (20, 20))
+
+    assert geometry.label_map is geometry.label_map
+    assert geometry.operator is geometry.operator
+
+
+def test_radial_bins_are_computed_once_per_bin_width(rois):
+    geometry = ROIGeometry(rois, (20, 20))
+    index, bins, counts = geometry.radial_bins(1)
+
+    assert geometry.radial_bins(1.0)[0] is index
+    assert geometry.radial_bins(2)[0] is not index
+    assert counts.sum() == len(index) == len(bins)
+    assert counts[1].sum() == 16
+
+
+def test_gather_returns_nonzero_weights_as_masks_of_subpixel_rois():
+    rois = [CircularROI((3.4, 4), 2), CircularROI((8, 9.5), 2)]
+    geometry = ROIGeometry(rois, (20, 20), subpixel=True)
+    _, masks = geometry.gather
+
+    assert np.allclose(geometry.weights[0], rois[0].weights)
+    assert np.array_equal(masks, geometry.weights > 0)
+    assert ROIGeometry(rois, (20, 20)).weights is None
+
+
+def test_initialize_raises_error_for_subpixel_rois_with_different_shape(rois):
+    with pytest.raises(ValueError):
+        ROIGeometry(rois, (20, 20), subpixel=True)
+
+
+def test_gather_masks_pixels_of_clipped_rois_outside_of_data():
+    rois = [SquareROI((1, 4), 5), CircularROI((8, 5), 2)]
+    geometry = ROIGeometry(rois, (10, 10), clip=True)
+    index, masks = geometry.gather
+
+    assert geometry.clipped
+    assert geometry.lattice is None
+    assert np.all(index >= 0) and np.all(index < 100)
+    assert np.array_equal(masks[0].sum(axis=1), [0, 5, 5, 5, 5])
+    assert np.array_equal(masks[1][:4], rois[1].mask[:4])
+    assert not np.any(masks[1][4])
+    assert np.allclose(geometry.coverage, [0.8, 12 / 13])
+
+
+def test_initialize_raises_error_for_clipped_rois_outside_of_data():
+    with pytest.raises(ValueError):
+        ROIGeometry([SquareROI((12, 4), 3)], (10, 10), clip=True)
+
+    with pytest.raises(ValueError):
+        ROIGeometry([SquareROI((1, 4), 5), SquareROI((5, 5), 3)], (10, 10),
+                    clip=True)
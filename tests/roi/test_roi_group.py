@@ -0,0 +1,104 @@
+import pytest
+import numpy as np
+
+from gridfit.roi import (AnnularROI, CircularROI, ROIArray, ROIDataset,
+                         ROIGroup, SquareROI, ROI_KIND_ANNULAR,
+                         ROI_KIND_CIRCULAR)
+
+
+@pytest.fixture
+def centers():
+    return [(10, 10), (10, 30), (30, 10), (30.4, 29.6)]
+
+
+@pytest.fixture
+def sets(centers):
+    return {
+        'signal': [CircularROI(c, 2) for c in centers],
+        'square': [SquareROI(c, 3) for c in centers],
+        'background': [AnnularROI(c, 4, 7) for c in centers]}
+
+
+def test_initialize_raises_error_for_invalid_sets(centers, sets):
+    data = np.zeros((40, 40))
+
+    with pytest.raises(ValueError):
+        ROIGroup(data, {})
+
+    with pytest.raises(ValueError):
+        ROIGroup(data, dict(sets, a=[SquareROI(c, 3) for c in centers[1:]]))
+
+    with pytest.raises(ValueError):
+        ROIGroup(data, {'a': [SquareROI((10, 10), 3), SquareROI((20, 20), 5)]})
+
+    with pytest.raises(ValueError):
+        ROIGroup(data, sets, background='test')
+
+
+@pytest.mark.parametrize('shape', [(40, 40), (3, 40, 40)])
+def test_stats_returns_statistics_of_each_set(sets, shape):
+    data = np.random.rand(*shape)
+    names = ['sum', 'mean', 'std', 'centroid', 'rms_size']
+    stats = ROIGroup(data, sets).stats(names)
+
+    assert list(stats) == list(sets)
+
+    for set_name, rois in sets.items():
+        for name in names:
+            expected_result = getattr(ROIDataset(data, rois), name)()
+            assert np.allclose(stats[set_name][name], expected_result)
+
+
+def test_stats_returns_absolute_centroid(sets):
+    data = np.random.rand(40, 40)
+    stats = ROIGroup(data, sets).stats(['centroid'], absolute=True)
+
+    for set_name, rois in sets.items():
+        expected_result = ROIDataset(data, rois).centroid(absolute=True)
+        assert np.allclose(stats[set_name]['centroid'], expected_result)
+
+
+def test_stats_returns_background_subtracted_results(centers, sets):
+    data = np.random.rand(40, 40)
+    signal = ROIArray(centers, 2, ROI_KIND_CIRCULAR)
+    background = ROIArray(centers, 7, ROI_KIND_ANNULAR, 4)
+    stats = ROIGroup(data, dict(signal=signal, background=background),
+                     background='background').stats()
+
+    expected_background = ROIDataset(data, background).mean()
+    counts = np.array([roi.mask.sum() for roi in sets['signal']])
+
+    assert 'signal' not in stats['background']
+    assert np.allclose(stats['signal']['background'], expected_background)
+    assert np.allclose(stats['signal']['signal'],
+                       ROIDataset(data, signal).sum()
+                       - counts * expected_background)
+    assert np.allclose(stats['signal']['signal_mean'],
+                       ROIDataset(data, signal).mean() - expected_background)
+
+
+def test_evaluate_returns_statistics_of_new_data(sets):
+    group = ROIGroup(np.zeros((40, 40)), sets, background='background')
+    data = np.random.rand(40, 40)
+    stats = group.evaluate(data, ['sum'])
+
+    assert np.allclose(stats['square']['sum'],
+                       ROIDataset(data, sets['square']).sum())
+
+
+def test_stats_raises_error_for_invalid_statistic(sets):
+    with pytest.raises(ValueError):
+        ROIGroup(np.zeros((40, 40)), sets).stats(['min'])
+
+
+def test_stats_of_clipped_rois_ignore_pixels_outside_of_data():
+    data = np.random.rand(20, 20)
+    sets = dict(signal=[CircularROI((1, 10), 2), CircularROI((10, 10), 2)],
+                background=[AnnularROI((1, 10), 2, 4),
+                            AnnularROI((10, 10), 2, 4)])
+    result = ROIGroup(data, sets, clip=True).stats(['sum'])
+
+    for name, rois in sets.items():
+        expected = ROIDataset(data, rois, clip=True).stats(['sum'])['sum']
+
+        assert np.allclose(result[name]['sum'], expected)
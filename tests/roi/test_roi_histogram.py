@@ -0,0 +1,104 @@
+import pickle
+import pytest
+import numpy as np
+
+from gridfit.roi import ROIDataset, ROIHistogram, SquareROI
+
+
+@pytest.fixture
+def rois():
+    return [SquareROI((4, 4), 3), SquareROI((12, 12), 3)]
+
+
+@pytest.fixture
+def frames():
+    # the first ROI is occupied in every other frame
+    frames = np.random.rand(100, 20, 20)
+    frames[::2, 3:6, 3:6] += 10
+
+    return frames
+
+
+def test_initialize_raises_error_for_invalid_bins(rois):
+    with pytest.raises(ValueError):
+        ROIHistogram(rois, 10)
+
+    with pytest.raises(ValueError):
+        ROIHistogram(rois, [1, 0, 2])
+
+
+def test_initialize_raises_error_for_invalid_statistic(rois):
+    with pytest.raises(ValueError):
+        ROIHistogram(rois, 10, (0, 1), statistic='centroid')
+
+
+def test_update_accumulates_histogram_of_each_roi(rois, frames):
+    histogram = ROIHistogram(rois, 20, (0, 100))
+    histogram.update(frames[0])
+    histogram.update(frames[1:])
+    sums = ROIDataset(frames, rois).sum()
+
+    assert histogram.count == 100
+    assert histogram.counts.shape == (2, 20)
+
+    for counts, roi_sums in zip(histogram.counts, sums.T):
+        assert np.array_equal(
+            counts, np.histogram(roi_sums, histogram.edges)[0])
+
+
+def test_update_ignores_values_outside_of_bins(rois, frames):
+    histogram = ROIHistogram(rois, [0, 5, 9])
+    histogram.update(frames)
+
+    assert np.array_equal(histogram.counts.sum(axis=1), (50, 100))
+
+
+def test_merge_adds_histograms(rois, frames):
+    histogram = ROIHistogram(rois, 20, (0, 100))
+    other = ROIHistogram(rois, 20, (0, 100))
+    histogram.update(frames[:30])
+    other.update(frames[30:])
+    histogram.merge(other)
+    expected_histogram = ROIHistogram(rois, 20, (0, 100))
+    expected_histogram.update(frames)
+
+    assert histogram.count == 100
+    assert np.array_equal(histogram.counts, expected_histogram.counts)
+
+
+def test_pickled_histogram_does_not_keep_the_last_frame(rois, frames):
+    histogram = ROIHistogram(rois, 20, (0, 100))
+    histogram.update(frames[:30])
+    restored = pickle.loads(pickle.dumps(histogram))
+    assert restored._dataset is None
+
+    restored.update(frames[30:])
+    assert restored.count == 100
+    assert np.array_equal(restored.values(frames[0]),
+                          histogram.values(frames[0]))
+
+
+def test_merge_raises_error_for_different_bins(rois):
+    with pytest.raises(ValueError):
+        ROIHistogram(rois, 20, (0, 100)).merge(
+            ROIHistogram(rois, 10, (0, 100)))
+
+
+def test_thresholds_separate_bimodal_histogram(rois, frames):
+    histogram = ROIHistogram(rois, 100, (0, 100))
+    histogram.update(frames)
+    thresholds = histogram.thresholds()
+
+    assert 10 < thresholds[0] < 90
+    assert np.isnan(ROIHistogram(rois, 10, (0, 1)).thresholds()).all()
+
+
+def test_classify_returns_occupancy_of_each_roi(rois, frames):
+    histogram = ROIHistogram(rois, 100, (0, 100))
+    histogram.update(frames)
+    occupancy = histogram.classify(frames)
+
+    assert occupancy.shape == (100, 2)
+    assert occupancy.dtype == bool
+    assert np.all(occupancy[::2, 0]) and not np.any(occupancy[1::2, 0])
+    assert np.array_equal(histogram.classify(frames[0], 50), (True, False))
@@ -0,0 +1,92 @@
+import pytest
+import numpy as np
+
+from gridfit.roi import (AnnularROI, CircularROI, ROIArray, ROIDataset,
+                         ROIIndex, SquareROI)
+
+
+@pytest.fixture
+def rois():
+    return [SquareROI((3, 4), 3), CircularROI((10.4, 10), 3),
+            AnnularROI((20, 5), 1, 3), SquareROI((11, 14), 4)]
+
+
+def _contains(roi, point):
+    (y_0, x_0), (y_1, x_1) = roi.boundaries
+    y, x = np.round(point).astype(int)
+
+    if not (y_0 <= y < y_1 and x_0 <= x < x_1):
+        return False
+
+    return not isinstance(roi, CircularROI) or roi.mask[y - y_0, x - x_0]
+
+
+def test_initialize_accepts_roi_array(rois):
+    index = ROIIndex(ROIArray.from_rois(rois))
+
+    assert len(index.rois) == 4
+    assert index.tree.n == 4
+
+
+def test_query_points_returns_roi_containing_each_point(rois):
+    points = np.random.rand(500, 2) * 25 - 1
+    result = ROIIndex(rois).query_points(points)
+
+    for point, i in zip(points, result):
+        containing = [j for j, roi in enumerate(rois)
+                      if _contains(roi, point)]
+
+        if len(containing) == 0:
+            assert i == -1
+        else:
+            assert i in containing
+
+
+def test_query_points_returns_closest_roi_for_overlapping_rois():
+    rois = [SquareROI((5, 5), 5), SquareROI((7, 7), 5)]
+    index = ROIIndex(rois)
+
+    assert index.query_points((5.4, 5.6)) == 0
+    assert index.query_points((6.6, 6.2)) == 1
+    assert index.query_points((20, 20)) == -1
+
+
+def test_query_points_excludes_inner_circle_of_annular_rois(rois):
+    index = ROIIndex(rois)
+
+    assert index.query_points((20, 5)) == -1
+    assert index.query_points((20, 7)) == 2
+
+
+def test_query_box_returns_rois_overlapping_each_box(rois):
+    index = ROIIndex(rois)
+    boxes = [((0, 0), (4, 4)), ((9, 9), (12, 13)), ((30, 30), (32, 32))]
+    result = index.query_box(boxes)
+
+    assert len(result) == 3
+    assert np.array_equal(result[0], [0])
+    assert np.array_equal(result[1], [1, 3])
+    assert len(result[2]) == 0
+    assert np.array_equal(index.query_box(boxes[1]), [1, 3])
+
+
+def test_query_box_excludes_touching_rois():
+    index = ROIIndex([SquareROI((5, 5), 3)])
+
+    assert len(index.query_box(((7, 4), (9, 6)))) == 0
+    assert np.array_equal(index.query_box(((6, 4), (8, 6))), [0])
+
+
+@pytest.mark.parametrize('method, value', [
+    ('query_points', np.zeros((3, 3))),
+    ('query_box', np.zeros((3, 2)))])
+def test_query_raises_error_for_invalid_shape(rois, method, value):
+    with pytest.raises(ValueError):
+        getattr(ROIIndex(rois), method)(value)
+
+
+def test_roi_dataset_returns_cached_index(rois):
+    dataset = ROIDataset(np.zeros((30, 30)), rois)
+
+    assert isinstance(dataset.index, ROIIndex)
+    assert dataset.index is dataset.index
@@ -0,0 +1,55 @@
+import pytest
+import numpy as np
+
+from gridfit.roi import ROIIntegralImage, CircularROI, SquareROI
+
+
+@pytest.fixture
+def rois():
+    return [SquareROI((3, 4), 3), SquareROI((5.4, 5), 4),
+            SquareROI((12, 12), 7)]
+
+
+def test_initialize_raises_error_for_circular_rois():
+    with pytest.raises(ValueError):
+        ROIIntegralImage([CircularROI((5, 5), 2)], (20, 20))
+
+
+def test_initialize_raises_error_if_roi_outside_data(rois):
+    with pytest.raises(ValueError):
+        ROIIntegralImage(rois, (10, 10))
+
+    with pytest.raises(ValueError):
+        ROIIntegralImage([SquareROI((1, 1), 5)], (10, 10))
+
+
+def test_counts_returns_number_of_pixels_in_each_roi(rois):
+    integral_image = ROIIntegralImage(rois, (20, 20))
+    assert np.all(integral_image.counts == (9, 16, 49))
+
+
+def test_sum_raises_error_for_invalid_data_shape(rois):
+    integral_image = ROIIntegralImage(rois, (20, 20))
+
+    with pytest.raises(ValueError):
+        integral_image.sum(np.zeros((10, 10)))
+
+
+@pytest.mark.parametrize('name', ['sum', 'mean', 'var', 'std'])
+def test_statistics_return_statistic_of_each_roi(rois, name):
+    data = np.random.rand(20, 20)
+    integral_image = ROIIntegralImage(rois, data.shape)
+
+    expected_result = [getattr(r.apply(data), name)() for r in rois]
+
+    assert np.allclose(getattr(integral_image, name)(data), expected_result)
+
+
+def test_statistics_accept_stack_of_data(rois):
+    data = np.random.rand(4, 20, 20)
+    integral_image = ROIIntegralImage(rois, (20, 20))
+
+    expected_result = [integral_image.sum(d) for d in data]
+
+    assert integral_image.sum(data).shape == (4, len(rois))
+    assert np.allclose(integral_image.sum(data), expected_result)
@@ -0,0 +1,60 @@
+import pytest
+import numpy as np
+
+from gridfit.roi import ROILabelMap, CircularROI, SquareROI
+
+
+@pytest.fixture
+def rois():
+    return [CircularROI((3, 4), 2), CircularROI((5, 5), 2),
+            SquareROI((12, 12), 4)]
+
+
+def test_labels_returns_label_image(rois):
+    label_map = ROILabelMap(rois, (20, 20))
+    labels = label_map.labels
+
+    assert labels.shape == (20, 20)
+    assert labels[3, 4] == 1
+    assert labels[6, 6] == 2
+    assert labels[12, 12] == 3
+    assert labels[0, 19] == 0
+
+
+def test_counts_returns_number_of_pixels_in_each_roi(rois):
+    label_map = ROILabelMap(rois, (20, 20))
+    assert np.all(label_map.counts == (13, 13, 16))
+
+
+def test_initialize_raises_error_if_roi_outside_data(rois):
+    with pytest.raises(ValueError):
+        ROILabelMap(rois, (10, 10))
+
+
+def test_sum_raises_error_for_invalid_data_shape(rois):
+    label_map = ROILabelMap(rois, (20, 20))
+
+    with pytest.raises(ValueError):
+        label_map.sum(np.zeros((10, 10)))
+
+
+@pytest.mark.parametrize('name', ['sum', 'mean', 'var', 'std', 'min', 'max'])
+def test_statistics_handle_overlapping_rois(rois, name):
+    data = np.random.rand(20, 20)
+    label_map = ROILabelMap(rois, data.shape)
+
+    expected_result = [getattr(r.apply(data), name)() for r in rois]
+
+    assert np.allclose(getattr(label_map, name)(data), expected_result)
+
+
+@pytest.mark.parametrize('dtype', [np.float64, np.int64])
+@pytest.mark.parametrize('name', ['min', 'max'])
+def test_min_and_max_handle_nested_rois(dtype, name):
+    data = (np.arange(400) + 5).reshape(20, 20).astype(dtype)
+    rois = [SquareROI((10, 10), 7), SquareROI((10, 10), 3),
+            SquareROI((10, 10), 3)]
+    result = getattr(ROILabelMap(rois, data.shape), name)(data)
+
+    expected = [getattr(roi.apply(data), name)() for roi in rois]
+    assert np.array_equal(result, expected)
@@ -0,0 +1,75 @@
+import pytest
+import numpy as np
+from scipy import sparse
+
+from gridfit.roi import ROIOperator, CircularROI, SquareROI
+from gridfit.utils import centroid, rms_size
+
+
+@pytest.fixture
+def rois():
+    return [CircularROI((3, 4), 2), CircularROI((5, 5), 2),
+            SquareROI((12, 12), 4)]
+
+
+def test_matrix_returns_sparse_matrix(rois):
+    operator = ROIOperator(rois, (20, 20))
+
+    assert sparse.isspmatrix_csr(operator.matrix)
+    assert operator.matrix.shape == (5 * len(rois), 400)
+
+
+def test_counts_returns_number_of_pixels_in_each_roi(rois):
+    operator = ROIOperator(rois, (20, 20))
+    assert np.all(operator.counts == (13, 13, 16))
+
+
+def test_initialize_raises_error_if_roi_outside_data(rois):
+    with pytest.raises(ValueError):
+        ROIOperator(rois, (10, 10))
+
+
+def test_sum_raises_error_for_invalid_data_shape(rois):
+    operator = ROIOperator(rois, (20, 20))
+
+    with pytest.raises(ValueError):
+        operator.sum(np.zeros((10, 10)))
+
+
+@pytest.mark.parametrize('name', ['sum', 'mean', 'var', 'std'])
+def test_statistics_return_statistic_of_each_roi(rois, name):
+    data = np.random.rand(20, 20)
+    operator = ROIOperator(rois, data.shape)
+
+    expected_result = [getattr(r.apply(data), name)() for r in rois]
+
+    assert np.allclose(getattr(operator, name)(data), expected_result)
+
+
+def test_centroid_returns_centroid_of_each_roi(rois):
+    data = np.random.rand(20, 20)
+    operator = ROIOperator(rois, data.shape)
+
+    expected_result = [centroid(np.ma.filled(r.apply(data), 0)) for r in rois]
+
+    assert np.allclose(operator.centroid(data), expected_result)
+
+
+def test_rms_size_returns_rms_size_of_each_roi(rois):
+    data = np.random.rand(20, 20)
+    operator = ROIOperator(rois, data.shape)
+
+    expected_result = [rms_size(np.ma.filled(r.apply(data), 0)) for r in rois]
+
+    assert np.allclose(operator.rms_size(data), expected_result)
+
+
+def test_statistics_accept_stack_of_data(rois):
+    data = np.random.rand(4, 20, 20)
+    operator = ROIOperator(rois, (20, 20))
+
+    expected_result = [operator.sum(d) for d in data]
+
+    assert operator.sum(data).shape == (4, len(rois))
+    assert operator.centroid(data).shape == (4, len(rois), 2)
+    assert np.allclose(operator.sum(data), expected_result)
@@ -0,0 +1,37 @@
+import numpy as np
+
+from gridfit.utils import find_bounding_box
+
+
+def test_find_bounding_box_returns_corners_with_margin():
+    data = np.zeros((100, 120))
+    data[20:40, 50:90] = 1
+
+    corners = find_bounding_box(data, margin=5)
+
+    assert np.all(corners == ((15, 45), (45, 95)))
+
+
+def test_find_bounding_box_clips_to_data_boundaries():
+    data = np.zeros((100, 120))
+    data[2:40, 50:118] = 1
+
+    corners = find_bounding_box(data, margin=5)
+
+    assert np.all(corners == ((0, 45), (45, 120)))
+
+
+def test_find_bounding_box_ignores_constant_background():
+    data = np.ones((100, 120))
+    data[20:40, 50:90] = 10
+
+    corners = find_bounding_box(data, margin=0)
+
+    assert np.all(corners == ((20, 50), (40, 90)))
+
+
+def test_find_bounding_box_returns_full_data_without_signal():
+    data = np.zeros((100, 120))
+    corners = find_bounding_box(data)
+
+    assert np.all(corners == ((0, 0), (100, 120)))
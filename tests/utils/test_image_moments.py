@@ -0,0 +1,49 @@
+import pytest
+import numpy as np
+
+from gridfit.utils import centroid, centroids, moments, rms_size, rms_sizes
+
+
+def test_moments_returns_raw_moments():
+    data = np.zeros((10, 12))
+    data[2, 5] = 2
+    data[4, 3] = 1
+
+    m = moments(data)
+
+    assert np.allclose(m, (3, 8, 13, 24, 59))
+
+
+def test_moments_accepts_stack_of_data():
+    data = np.random.rand(3, 4, 10, 12)
+    assert moments(data).shape == (3, 4, 5)
+
+
+def test_moments_accepts_weights():
+    data = np.random.rand(4, 10, 12)
+    weights = np.random.rand(10, 12)
+
+    assert np.allclose(moments(data, weights), moments(data * weights))
+
+
+def test_centroids_returns_centroid_of_each_array():
+    data = np.random.rand(4, 10, 12)
+    expected_result = [centroid(d) for d in data]
+
+    assert centroids(data).shape == (4, 2)
+    assert np.allclose(centroids(data), expected_result)
+
+
+def test_rms_sizes_returns_rms_size_of_each_array():
+    data = np.random.rand(4, 10, 12)
+    expected_result = [rms_size(d) for d in data]
+
+    assert rms_sizes(data).shape == (4, 2)
+    assert np.allclose(rms_sizes(data), expected_result)
+
+
+def test_rms_sizes_returns_width_for_gaussian():
+    xy = np.indices((100, 100))
+    data = 10 * np.exp(-((xy[0] - 40)**2 + (xy[1] - 50)**2) / (2 * 10**2))
+
+    assert rms_sizes(data[None])[0] == pytest.approx((10, 10), abs=1e-2)